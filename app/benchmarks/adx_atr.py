@@ -0,0 +1,94 @@
+"""
+ADX / ATR micro-benchmark
+
+Compares calculate_adx and calculate_atr with the previous pandas implementations on a
+100k-row frame: run time and peak memory allocated per call.
+
+Usage: python app/benchmarks/adx_atr.py [rows]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+import numpy as np
+import pandas as pd
+
+from indicators.general_indicators import calculate_adx, calculate_atr
+
+REPEAT = 5
+
+
+def legacy_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    df["high_low"] = df["high"] - df["low"]
+    df["high_close"] = abs(df["high"] - df["close"].shift())
+    df["low_close"] = abs(df["low"] - df["close"].shift())
+    df["tr"] = df[["high_low", "high_close", "low_close"]].max(axis=1)
+    df["up_move"] = df["high"] - df["high"].shift()
+    df["down_move"] = df["low"].shift() - df["low"]
+    df["plus_dm"] = np.where((df["up_move"] > df["down_move"]) & (df["up_move"] > 0), df["up_move"], 0)
+    df["minus_dm"] = np.where((df["down_move"] > df["up_move"]) & (df["down_move"] > 0), df["down_move"], 0)
+    df["+di"] = 100 * (df["plus_dm"].ewm(span=period).mean() / df["tr"].ewm(span=period).mean())
+    df["-di"] = 100 * (df["minus_dm"].ewm(span=period).mean() / df["tr"].ewm(span=period).mean())
+    df["dx"] = 100 * abs(df["+di"] - df["-di"]) / (df["+di"] + df["-di"])
+    df["adx"] = df["dx"].ewm(span=period).mean()
+    return df[["adx", "+di", "-di"]]
+
+
+def legacy_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+    high_low = df["high"] - df["low"]
+    high_close = abs(df["high"] - df["close"].shift())
+    low_close = abs(df["low"] - df["close"].shift())
+    ranges = pd.concat([high_low, high_close, low_close], axis=1)
+    return ranges.max(axis=1).rolling(period).mean()
+
+
+def make_klines(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(42)
+    close = 30_000 + np.cumsum(rng.normal(0, 50, rows))
+    spread = rng.random(rows) * 80
+    return pd.DataFrame({
+        "open": close + rng.normal(0, 10, rows),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.random(rows) * 1_000,
+    })
+
+
+def measure(func, df: pd.DataFrame) -> tuple:
+    """Best run time (s) and peak allocation (MiB) of func on a fresh copy of df."""
+    times = []
+    for _ in range(REPEAT):
+        frame = df.copy()
+        start = time.perf_counter()
+        func(frame)
+        times.append(time.perf_counter() - start)
+
+    frame = df.copy()
+    tracemalloc.start()
+    func(frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak / 2 ** 20
+
+
+def main(rows: int) -> None:
+    df = make_klines(rows)
+    print(f"{rows} rows, best of {REPEAT}")
+    print(f"{'function':<8} {'legacy ms':>10} {'numpy ms':>10} {'speedup':>8} {'legacy MiB':>11} {'numpy MiB':>10}")
+    for name, legacy, current in (("adx", legacy_adx, calculate_adx), ("atr", legacy_atr, calculate_atr)):
+        legacy_time, legacy_peak = measure(legacy, df)
+        current_time, current_peak = measure(current, df)
+        print(f"{name:<8} {legacy_time * 1e3:>10.2f} {current_time * 1e3:>10.2f} "
+              f"{legacy_time / current_time:>7.1f}x {legacy_peak:>11.1f} {current_peak:>10.1f}")
+
+    frame = df.copy()
+    calculate_adx(frame)
+    calculate_atr(frame)
+    assert list(frame.columns) == list(df.columns), "input frame was modified"
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
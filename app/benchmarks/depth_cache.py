@@ -0,0 +1,79 @@
+"""
+Depth cache benchmark
+
+Replays random diff depth events on a 1000-level book and reads the top of the book after every
+event, as a consumer of the 100ms depth stream does, with the dict-backed DepthCache (sorting the
+whole side on each read) and the tick-sorted TickDepthCache.
+
+Run it from the repository root.
+
+Usage: python app/benchmarks/depth_cache.py [events]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.gateway.binance.ws.depthcache import DepthCache, TickDepthCache
+
+LEVELS = 1_000
+UPDATES_PER_EVENT = 50
+TOP = 10
+
+
+def make_events(events: int) -> list:
+    rng = random.Random(42)
+    mid = 3_000_000  # 30000.00 in cents
+    snapshot = {
+        "bids": [[f"{(mid - i) / 100:.2f}", f"{rng.random() * 5:.3f}"] for i in range(1, LEVELS + 1)],
+        "asks": [[f"{(mid + i) / 100:.2f}", f"{rng.random() * 5:.3f}"] for i in range(1, LEVELS + 1)],
+    }
+    diffs = []
+    for _ in range(events):
+        diff = {"b": [], "a": []}
+        for _ in range(UPDATES_PER_EVENT):
+            distance = int(rng.expovariate(1 / 50)) + 1
+            quantity = "0.000" if rng.random() < 0.3 else f"{rng.random() * 5:.3f}"
+            side, price = ("b", mid - distance) if rng.random() < 0.5 else ("a", mid + distance)
+            diff[side].append([f"{price / 100:.2f}", quantity])
+        diffs.append(diff)
+    return [snapshot] + diffs
+
+
+def replay(cache: DepthCache, events: list, read) -> float:
+    start = time.perf_counter()
+    for event in events:
+        for bid in event.get("bids", event.get("b", [])):
+            cache.add_bid(bid)
+        for ask in event.get("asks", event.get("a", [])):
+            cache.add_ask(ask)
+        read(cache)
+    return time.perf_counter() - start
+
+
+def read_dict(cache: DepthCache):
+    bids, asks = cache.get_bids()[:TOP], cache.get_asks()[:TOP]
+    return (bids[0][0] + asks[0][0]) / 2, asks[0][0] - bids[0][0]
+
+
+def read_tick(cache: TickDepthCache):
+    return cache.get_bids(TOP), cache.get_asks(TOP), cache.mid_price(), cache.spread(), cache.imbalance(TOP)
+
+
+def main(events: int) -> None:
+    stream = make_events(events)
+    dict_cache, tick_cache = DepthCache("BTCUSDT"), TickDepthCache("BTCUSDT")
+    dict_time = replay(dict_cache, stream, read_dict)
+    tick_time = replay(tick_cache, stream, read_tick)
+    assert dict_cache.get_bids() == tick_cache.get_bids() and dict_cache.get_asks() == tick_cache.get_asks()
+
+    print(f"{events} events x {UPDATES_PER_EVENT} updates, top {TOP} read after each event")
+    print(f"{'DepthCache':<16} {dict_time * 1e6 / events:>8.1f} us/event")
+    print(f"{'TickDepthCache':<16} {tick_time * 1e6 / events:>8.1f} us/event  {dict_time / tick_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
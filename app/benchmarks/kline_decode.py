@@ -0,0 +1,75 @@
+"""
+Kline decoding benchmark
+
+Compares the previous kline decoding (json.loads, pd.DataFrame on the lists of strings and
+pd.to_numeric per column) with utils.kline_decoder on a 1000-kline response and a 1M-kline bulk
+load, from the raw response body and from the already parsed lists of the clients.
+
+Run it from the repository root, where the settings are loaded from app/config.yaml.
+
+Usage: python app/benchmarks/kline_decode.py [bulk rows]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+import numpy as np
+import orjson
+import pandas as pd
+
+from src.utils.constants import COLUMNS, NUMERIC_COLUMNS
+from src.utils.kline_decoder import decode_klines
+
+
+def legacy_frame(klines: list) -> pd.DataFrame:
+    df = pd.DataFrame(klines, columns=COLUMNS).drop(columns=["ignore"])
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col])
+    return df
+
+
+def make_klines(rows: int) -> list:
+    rng = np.random.default_rng(42)
+    close = 30_000 + np.cumsum(rng.normal(0, 50, rows))
+    volume = rng.random(rows) * 1_000
+    open_time = 1_600_000_000_000 + np.arange(rows) * 60_000
+    return [
+        [int(t), f"{c - 3:.8f}", f"{c + 40:.8f}", f"{c - 40:.8f}", f"{c:.8f}", f"{v:.8f}", int(t) + 59_999,
+         f"{c * v:.8f}", int(v * 7), f"{v / 2:.8f}", f"{c * v / 2:.8f}", "0"]
+        for t, c, v in zip(open_time, close, volume)
+    ]
+
+
+def best(func, repeat: int) -> float:
+    """Best run time of func in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main(bulk_rows: int) -> None:
+    print(f"{'payload':<22} {'legacy ms':>10} {'decoder ms':>11} {'speedup':>8}")
+    for rows, repeat in ((1_000, 50), (bulk_rows, 1)):
+        klines = make_klines(rows)
+        body = orjson.dumps(klines)
+
+        expected = legacy_frame(json.loads(body))
+        pd.testing.assert_frame_equal(decode_klines(body), expected, check_dtype=False)
+
+        for source, legacy, current in (
+                ("body", lambda: legacy_frame(json.loads(body)), lambda: decode_klines(body)),
+                ("lists", lambda: legacy_frame(klines), lambda: decode_klines(klines)),
+        ):
+            legacy_time, current_time = best(legacy, repeat), best(current, repeat)
+            print(f"{f'{rows} x 12 {source}':<22} {legacy_time * 1e3:>10.2f} {current_time * 1e3:>11.2f} "
+                  f"{legacy_time / current_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,117 @@
+"""
+Local exchange benchmark
+
+Serves synthetic 1m klines of ETHUSDC and BTCUSDC and a margin account holding a long ETH
+position from the LocalExchangeServer, then times, for each injected latency, the REST paths of a
+live run:
+
+- build_portfolio_from_binance_assets: the margin account, trades and ticker prices
+- klines: the klines of the configured intervals fetched one after the other (sync DataNode)
+- async klines: the same klines fetched concurrently over one aiohttp session (Agent.arun)
+
+The requests go through the shared clients of client_registry, routed with BINANCE_BASE_URL.
+
+Run it from the repository root, where the settings are loaded from app/config.yaml.
+
+Usage: python app/benchmarks/local_exchange.py [latency_ms ...]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+os.environ.setdefault("BINANCE_API_KEY", "local")
+os.environ.setdefault("BINANCE_API_SECRET", "local")
+from src.utils import settings
+from src.utils.binance_clients import BASE_URL_ENV, client_registry
+from src.utils.binance_data_provider import BinanceDataProvider
+from src.utils.kline_store import KlineStore, MARKET_SPOT
+from src.utils.local_exchange import LocalExchangeServer, SimulatedMarginAccount
+
+MINUTES = 7 * 24 * 60
+END = datetime(2025, 5, 25, tzinfo=timezone.utc)
+
+
+def write_klines(store: KlineStore, symbol: str, price: float) -> None:
+    rng = np.random.default_rng(42)
+    end_ms = int(END.timestamp() * 1000)
+    open_time = end_ms - np.arange(MINUTES, 0, -1, dtype=np.int64) * 60_000
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.001, MINUTES)))
+    df = pd.DataFrame({
+        "open_time": open_time,
+        "open": np.r_[price, close[:-1]],
+        "high": close * 1.001,
+        "low": close * 0.999,
+        "close": close,
+        "volume": rng.random(MINUTES) * 10,
+        "close_time": open_time + 59_999,
+        "quote_volume": rng.random(MINUTES) * 10 * price,
+        "count": rng.integers(1, 100, MINUTES),
+        "taker_buy_volume": rng.random(MINUTES) * 5,
+        "taker_buy_quote_volume": rng.random(MINUTES) * 5 * price,
+    })
+    store.write(MARKET_SPOT, symbol, "1m", df, int(open_time[0]), int(open_time[-1]))
+
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def main(latencies_ms: list) -> None:
+    from src.utils.binance_order_executor import build_portfolio_from_binance_assets, place_binance_order
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = KlineStore(Path(directory) / "exchange")
+        write_klines(store, "ETHUSDC", 2500.0)
+        write_klines(store, "BTCUSDC", 100_000.0)
+        server = LocalExchangeServer(store, SimulatedMarginAccount({"USDC": 1000}))
+        server.start_in_thread()
+        os.environ[BASE_URL_ENV] = server.url
+        # klines are fetched, not read from the kline store of the provider
+        os.environ["CACHE_DIR"] = directory
+        provider = BinanceDataProvider()
+        intervals = [interval.value for interval in settings.signals.intervals]
+        tickers = settings.signals.tickers
+
+        place_binance_order("ETHUSDC", "open_long", 0.2)
+
+        def klines():
+            for ticker in tickers:
+                for interval in intervals:
+                    provider.get_history_klines_with_end_time(ticker, interval, END, 500)
+
+        async def aklines():
+            try:
+                await asyncio.gather(*[provider.aget_history_klines_with_end_time(ticker, interval, END, 500)
+                                       for ticker in tickers for interval in intervals])
+            finally:
+                await provider.aclose()
+
+        print(f"{'latency':>8} {'portfolio':>12} {'klines':>12} {'async klines':>14}  requests")
+        try:
+            for latency_ms in latencies_ms:
+                server.latency = latency_ms / 1000
+                requests = server.requests
+                portfolio = timed(lambda: build_portfolio_from_binance_assets(settings))
+                sync = timed(klines)
+                concurrent = timed(lambda: asyncio.run(aklines()))
+                print(f"{latency_ms:>6}ms {portfolio * 1000:>10.1f}ms {sync * 1000:>10.1f}ms "
+                      f"{concurrent * 1000:>12.1f}ms  {server.requests - requests}")
+        finally:
+            client_registry.close()
+            server.stop()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [0, 20, 100])
@@ -0,0 +1,49 @@
+"""
+Workflow compilation benchmark
+
+Reports the per-call overhead of getting the agent workflow over a 1,000-bar backtest: building
+and compiling the graph on every call (previous Agent.run) against the cached compiled workflow.
+
+Run it from the repository root, where the settings are loaded from app/config.yaml.
+
+Usage: python app/benchmarks/workflow_compile.py [bars]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+from dotenv import load_dotenv
+
+load_dotenv()
+from src.agent.workflow import Workflow
+from src.utils import Interval
+
+INTERVALS = [Interval.HOUR_4, Interval.HOUR_1, Interval.MIN_15]
+STRATEGIES = ["MacdStrategy", "MyStrategy"]
+
+
+def measure(get_workflow, bars: int) -> float:
+    """Total seconds spent getting the workflow once per bar."""
+    start = time.perf_counter()
+    for _ in range(bars):
+        get_workflow(INTERVALS, STRATEGIES)
+    return time.perf_counter() - start
+
+
+def main(bars: int) -> None:
+    uncached = measure(lambda intervals, strategies:
+                       Workflow.create_workflow(intervals=intervals, strategies=strategies).compile(), bars)
+    cached = measure(lambda intervals, strategies:
+                     Workflow.get_compiled_workflow(intervals=intervals, strategies=strategies), bars)
+
+    print(f"{bars} bars, {len(INTERVALS)} intervals, strategies {STRATEGIES}")
+    print(f"{'':<10} {'total s':>9} {'per call ms':>12}")
+    print(f"{'compile':<10} {uncached:>9.3f} {uncached / bars * 1e3:>12.3f}")
+    print(f"{'cached':<10} {cached:>9.3f} {cached / bars * 1e3:>12.3f}")
+    print(f"saved {uncached - cached:.3f} s ({uncached / cached:.0f}x less overhead)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
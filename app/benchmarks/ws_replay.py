@@ -0,0 +1,107 @@
+"""
+Websocket ingest benchmark
+
+Replays a stream recording at max speed through the local ReplayServer and measures the
+messages/sec of the whole ingest path of a combined stream socket: websocket framing, the read
+loop of ReconnectingWebsocket, message decoding and the queue, read with recv_many.
+
+Without a recording file, a synthetic one of book ticker, aggregate trade and 100ms diff depth
+frames of 10 symbols is written first. Record a live one with:
+
+    recorder = StreamRecorder("live.rec")
+    bm.ws_kwargs["recorder"] = recorder
+
+Run it from the repository root.
+
+Usage: python app/benchmarks/ws_replay.py [recording] [messages]
+"""
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.gateway.binance.ws.decoders import STREAM_DECODERS
+from src.gateway.binance.ws.reconnecting_websocket import ReconnectingWebsocket
+from src.gateway.binance.ws.recording import StreamRecorder, read_recording
+from src.gateway.binance.ws.replay_server import ReplayServer
+from src.gateway.binance.ws.constants import WSQueuePolicy
+
+SYMBOLS = ["btcusdt", "ethusdt", "bnbusdt", "solusdt", "xrpusdt", "adausdt", "dogeusdt", "avaxusdt",
+           "linkusdt", "dotusdt"]
+
+
+def write_synthetic(filename: str, messages: int):
+    rng = random.Random(42)
+    timestamp_ns = time.time_ns()
+    with StreamRecorder(filename) as recorder:
+        for i in range(messages):
+            symbol = rng.choice(SYMBOLS)
+            price = 100 + rng.random()
+            kind = rng.random()
+            if kind < 0.5:
+                path = f"ws/{symbol}@bookTicker"
+                frame = (f'{{"u":{i},"s":"{symbol.upper()}","b":"{price:.4f}","B":"{rng.random():.3f}",'
+                         f'"a":"{price + 0.0001:.4f}","A":"{rng.random():.3f}"}}')
+            elif kind < 0.8:
+                path = f"ws/{symbol}@aggTrade"
+                frame = (f'{{"e":"aggTrade","E":{i},"s":"{symbol.upper()}","a":{i},"p":"{price:.4f}",'
+                         f'"q":"{rng.random():.3f}","f":{i},"l":{i},"T":{i},"m":true}}')
+            else:
+                path = f"ws/{symbol}@depth@100ms"
+                levels = ",".join(f'["{price - j / 100:.4f}","{rng.random():.3f}"]' for j in range(10))
+                frame = (f'{{"e":"depthUpdate","E":{i},"s":"{symbol.upper()}","U":{i},"u":{i},'
+                         f'"b":[{levels}],"a":[{levels}]}}')
+            timestamp_ns += 100_000
+            recorder.record(path, frame, timestamp_ns)
+
+
+async def ingest(server: ReplayServer, streams: list, expected: int, decoders=None) -> float:
+    socket = ReconnectingWebsocket(
+        url=server.url, prefix="stream?", path=f"streams={'/'.join(streams)}", decoders=decoders,
+        queue_policy=WSQueuePolicy.BLOCK, max_queue_size=10_000,
+    )
+    # the read loop notices the close within TIMEOUT of the last frame
+    socket.TIMEOUT = 0.5
+    received = 0
+    start = time.perf_counter()
+    async with socket:
+        while received < expected:
+            received += len(await socket.recv_many())
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+async def run(filename: str):
+    streams = sorted({
+        frame.frame[len('{"stream":"'):].split('"', 1)[0] if frame.path.startswith("stream?") else
+        frame.path.split("?", 1)[0][len("ws/"):]
+        for frame in read_recording(filename)
+    })
+    async with ReplayServer(filename, speed=None) as server:
+        expected = server.frame_count
+        print(f"{expected} frames of {len(streams)} streams")
+        for name, decoders in (("orjson", None), ("decoders", STREAM_DECODERS)):
+            best = min([await ingest(server, streams, expected, decoders) for _ in range(3)])
+            print(f"{name:<10} {expected / best:>12,.0f} m/s")
+
+
+def main(filename: str = None, messages: int = 200_000) -> None:
+    logging.getLogger("src.gateway.binance.ws.reconnecting_websocket").setLevel(logging.INFO)
+    if filename:
+        asyncio.run(run(filename))
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "synthetic.rec")
+        write_synthetic(filename, messages)
+        print(f"synthetic recording: {os.path.getsize(filename) / 1e6:.1f} MB")
+        asyncio.run(run(filename))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None, int(sys.argv[2]) if len(sys.argv) > 2 else 200_000)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import boto3
@@ -6,7 +7,7 @@ from datetime import datetime
 # Include src in the path
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
-from src.utils import settings
+from src.utils import settings, client_registry
 from src.agent import Agent
 from src.backtest.backtester import Backtester
 from src.utils.logger import setup_logger
@@ -16,6 +17,25 @@ logger = setup_logger()
 sns = boto3.client('sns')
 TOPIC_ARN = "arn:aws:sns:eu-north-1:654654340294:alert-bot-trade"
 
+async def run_once(portfolio: dict) -> dict:
+    """
+    Run the workflow once, then close the clients of the event loop.
+    """
+    try:
+        return await Agent.arun(
+            primary_interval=settings.primary_interval,
+            intervals=settings.signals.intervals,
+            tickers=settings.signals.tickers,
+            end_date=datetime.now(),
+            portfolio=portfolio,
+            strategies=settings.signals.strategies,
+            show_reasoning=settings.show_reasoning,
+            show_agent_graph=settings.show_agent_graph
+        )
+    finally:
+        await client_registry.aclose()
+
+
 def lambda_handler(event, context):
     if settings.mode == "backtest":
         backtester = Backtester(
@@ -43,16 +63,7 @@ def lambda_handler(event, context):
     else:
         portfolio = build_portfolio_from_binance_assets(settings)
 
-        result = Agent.run(
-            primary_interval=settings.primary_interval,
-            intervals=settings.signals.intervals,
-            tickers=settings.signals.tickers,
-            end_date=datetime.now(),
-            portfolio=portfolio,
-            strategies=settings.signals.strategies,
-            show_reasoning=settings.show_reasoning,
-            show_agent_graph=settings.show_agent_graph
-        )
+        result = asyncio.run(run_once(portfolio))
         
         
         decisions = result.get("decisions", {})
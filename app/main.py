@@ -1,15 +1,82 @@
+import asyncio
 import os
 import sys
+import time
 sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
-from src.utils import settings
+from src.utils import settings, client_registry, LiveKlineFeed
 from datetime import datetime
 from src.agent import Agent
 from src.backtest.backtester import Backtester
 from src.utils.logger import setup_logger
+from src.utils.kline_resampler import bucket_open_time
+from src.gateway.binance.helpers import interval_to_milliseconds
 from src.utils.binance_order_executor import place_binance_order, build_portfolio_from_binance_assets
 
 logger = setup_logger()
 
+# Seconds to wait for the klines of every ticker after the primary interval candle closed
+CLOSE_TIMEOUT_MARGIN = 60
+
+
+async def run_live_stream():
+    """
+    Run the workflow on every close of a primary interval candle, reading the klines from the
+    websocket-fed LiveKlineFeed instead of fetching them on each run.
+    """
+    interval = settings.primary_interval.value
+    live_klines = LiveKlineFeed(settings.signals.tickers, settings.signals.intervals)
+    await live_klines.start()
+    try:
+        while True:
+            now_ms = int(time.time() * 1000)
+            close_ms = bucket_open_time(now_ms, interval) + interval_to_milliseconds(interval)
+            try:
+                await live_klines.wait_for_close(interval, timeout=(close_ms - now_ms) / 1000 + CLOSE_TIMEOUT_MARGIN)
+            except asyncio.TimeoutError:
+                # e.g. a halted ticker, its stale klines are fetched over REST
+                logger.warning(f"Not every ticker closed a {interval} kline in time, running anyway")
+            portfolio = await asyncio.to_thread(build_portfolio_from_binance_assets, settings)
+
+            result = await Agent.arun(
+                primary_interval=settings.primary_interval,
+                intervals=settings.signals.intervals,
+                tickers=settings.signals.tickers,
+                end_date=datetime.now(),
+                portfolio=portfolio,
+                strategies=settings.signals.strategies,
+                show_reasoning=settings.show_reasoning,
+                show_agent_graph=settings.show_agent_graph,
+                live_klines=live_klines,
+            )
+
+            logger.debug(result.get('decisions'))
+            for symbol, decision in result.get("decisions", {}).items():
+                await asyncio.to_thread(place_binance_order, symbol, decision["operation"], decision["quantity"])
+    finally:
+        await live_klines.stop()
+        # the feed and the runs share the clients of the loop
+        await client_registry.aclose()
+
+
+async def run_once(portfolio: dict) -> dict:
+    """
+    Run the workflow once, then close the clients of the event loop.
+    """
+    try:
+        return await Agent.arun(
+            primary_interval=settings.primary_interval,
+            intervals=settings.signals.intervals,
+            tickers=settings.signals.tickers,
+            end_date=datetime.now(),
+            portfolio=portfolio,
+            strategies=settings.signals.strategies,
+            show_reasoning=settings.show_reasoning,
+            show_agent_graph=settings.show_agent_graph
+        )
+    finally:
+        await client_registry.aclose()
+
+
 if __name__ == "__main__":
 
     if settings.mode == "backtest":
@@ -28,19 +95,13 @@ if __name__ == "__main__":
         performance_metrics = backtester.run_backtest()
         performance_df = backtester.analyze_performance()
 
+    elif settings.mode == "live_stream":
+        asyncio.run(run_live_stream())
+
     else:
         portfolio = build_portfolio_from_binance_assets(settings)
 
-        result = Agent.run(
-            primary_interval=settings.primary_interval,
-            intervals=settings.signals.intervals,
-            tickers=settings.signals.tickers,
-            end_date=datetime.now(),
-            portfolio=portfolio,
-            strategies=settings.signals.strategies,
-            show_reasoning=settings.show_reasoning,
-            show_agent_graph=settings.show_agent_graph
-        )
+        result = asyncio.run(run_once(portfolio))
         
         
         logger.debug(result.get('decisions'))
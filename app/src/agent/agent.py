@@ -1,9 +1,14 @@
-from typing import List, Dict
+from typing import Any, List, Dict, Optional, Tuple
 from langchain_core.messages import HumanMessage
+from langgraph.graph.state import CompiledStateGraph
 from datetime import datetime
-from utils import Interval, save_graph_as_png, parse_str_to_json
+from utils import Interval, HistoricalKlineFeed, LiveKlineFeed, save_graph_as_png, parse_str_to_json
+from src.utils.logger import setup_logger
+from indicators import FeatureCache
 from .workflow import Workflow
 
+logger = setup_logger()
+
 
 class Agent:
 
@@ -18,7 +23,9 @@ class Agent:
             show_reasoning: bool = False,
             show_agent_graph: bool = False,
             model_name: str = "gpt-4.1",
-            model_provider: str = "OpenAI"
+            model_provider: str = "OpenAI",
+            kline_feed: Optional[HistoricalKlineFeed] = None,
+            live_klines: Optional[LiveKlineFeed] = None,
     ):
         """
         Executes the trading workflow using the specified configuration.
@@ -33,13 +40,65 @@ class Agent:
             show_agent_graph (bool, optional): If True, saves and displays the graph of the agent workflow. Defaults to False.
             model_name (str, optional): The name of the LLM model to use. Defaults to "gpt-4o".
             model_provider (str, optional): The provider of the LLM model. Defaults to "OpenAI".
+            kline_feed (HistoricalKlineFeed, optional): Preloaded klines to slice instead of fetching them. Defaults to None.
+            live_klines (LiveKlineFeed, optional): Websocket-fed klines to read instead of fetching them. Defaults to None.
 
         Returns:
         None
         """
-        # Create a new workflow if analysts are customized
-        workflow = Workflow.create_workflow(intervals=intervals, strategies=strategies)
-        agent = workflow.compile()
+        agent, initial_state = Agent._prepare(primary_interval, intervals, tickers, end_date, portfolio, strategies,
+                                              show_reasoning, show_agent_graph, model_name, model_provider,
+                                              kline_feed, live_klines)
+        final_state = agent.invoke(initial_state)
+        return Agent._output(final_state)
+
+    @staticmethod
+    async def arun(
+            primary_interval: Interval,
+            intervals: List[Interval],
+            tickers: List[str],
+            end_date: datetime,
+            portfolio: Dict,
+            strategies: List[str],
+            show_reasoning: bool = False,
+            show_agent_graph: bool = False,
+            model_name: str = "gpt-4.1",
+            model_provider: str = "OpenAI",
+            kline_feed: Optional[HistoricalKlineFeed] = None,
+            live_klines: Optional[LiveKlineFeed] = None,
+    ):
+        """
+        Async version of run, driving the workflow through ainvoke.
+
+        The data nodes of all intervals fetch their klines concurrently over the pooled aiohttp
+        session of the event loop, shared with the live kline feed and kept open across runs: close
+        it once with client_registry.aclose() before the loop ends. Parameters and return value are
+        those of run.
+        """
+        agent, initial_state = Agent._prepare(primary_interval, intervals, tickers, end_date, portfolio, strategies,
+                                              show_reasoning, show_agent_graph, model_name, model_provider,
+                                              kline_feed, live_klines)
+        final_state = await agent.ainvoke(initial_state)
+        return Agent._output(final_state)
+
+    @staticmethod
+    def _prepare(
+            primary_interval: Interval,
+            intervals: List[Interval],
+            tickers: List[str],
+            end_date: datetime,
+            portfolio: Dict,
+            strategies: List[str],
+            show_reasoning: bool,
+            show_agent_graph: bool,
+            model_name: str,
+            model_provider: str,
+            kline_feed: Optional[HistoricalKlineFeed],
+            live_klines: Optional[LiveKlineFeed],
+    ) -> Tuple[CompiledStateGraph, Dict[str, Any]]:
+        """Get the compiled workflow and the initial state of a run."""
+        # Compiled workflows are cached per intervals and strategies
+        agent = Workflow.get_compiled_workflow(intervals=intervals, strategies=strategies)
 
         if show_agent_graph:
             file_path = ""
@@ -48,28 +107,36 @@ class Agent:
                 file_path += "graph.png"
             # save_graph_as_png(agent, file_path)
 
-        final_state = agent.invoke(
-            {
-                "messages": [
-                    HumanMessage(
-                        content="Make trading decisions based on the provided data.",
-                    )
-                ],
-                "data": {
-                    "primary_interval": primary_interval,
-                    "intervals": intervals,
-                    "tickers": tickers,
-                    "portfolio": portfolio,
-                    "end_date": end_date,
-                    "analyst_signals": {},
-                },
-                "metadata": {
-                    "show_reasoning": show_reasoning,
-                    "model_name": model_name,
-                    "model_provider": model_provider,
-                },
+        initial_state = {
+            "messages": [
+                HumanMessage(
+                    content="Make trading decisions based on the provided data.",
+                )
+            ],
+            "data": {
+                "primary_interval": primary_interval,
+                "intervals": intervals,
+                "tickers": tickers,
+                "portfolio": portfolio,
+                "end_date": end_date,
+                "kline_feed": kline_feed,
+                "live_klines": live_klines,
+                # Intermediate indicator series, shared by the strategy nodes of this run
+                "feature_cache": FeatureCache(),
+                "analyst_signals": {},
             },
-        )
+            "metadata": {
+                "show_reasoning": show_reasoning,
+                "model_name": model_name,
+                "model_provider": model_provider,
+            },
+        }
+        return agent, initial_state
+
+    @staticmethod
+    def _output(final_state: Dict[str, Any]) -> Dict[str, Any]:
+        logger.debug(f"Feature cache: {final_state['data']['feature_cache'].stats()}")
+
         return {
             "decisions": parse_str_to_json(final_state["messages"][-1].content),
             "analyst_signals": final_state["data"]["analyst_signals"],
@@ -1,5 +1,8 @@
-from typing import List
+from functools import lru_cache
+from typing import List, Tuple
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
+from langgraph.graph.state import CompiledStateGraph
 from graph import AgentState, StartNode, DataNode, EmptyNode, RiskManagementNode, PortfolioManagementNode
 from utils import import_strategy_class, Interval
 
@@ -19,7 +22,8 @@ class Workflow:
         for interval in intervals:
             node_name = f"{interval.value}_node"
             data_node = DataNode(interval)
-            workflow.add_node(node_name, data_node)
+            # ainvoke runs the async fetches of every interval node concurrently
+            workflow.add_node(node_name, RunnableLambda(data_node, afunc=data_node.acall, name=node_name))
             workflow.add_edge("start_node", node_name)
             workflow.add_edge(node_name, "merge_data_node")
 
@@ -46,3 +50,18 @@ class Workflow:
         workflow.set_entry_point("start_node")
 
         return workflow
+
+    @staticmethod
+    def get_compiled_workflow(intervals: List[Interval], strategies: List[str]) -> CompiledStateGraph:
+        """
+        Get the compiled workflow of the intervals and strategies, built and compiled on first use.
+
+        Compiled graphs and their node instances are kept for the lifetime of the process, so they
+        are reused by every backtest bar, live cycle and warm Lambda invocation.
+        """
+        return _compile_workflow(tuple(intervals), tuple(strategies))
+
+
+@lru_cache(maxsize=None)
+def _compile_workflow(intervals: Tuple[Interval, ...], strategies: Tuple[str, ...]) -> CompiledStateGraph:
+    return Workflow.create_workflow(intervals=list(intervals), strategies=list(strategies)).compile()
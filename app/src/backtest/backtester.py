@@ -8,8 +8,10 @@ import pandas as pd
 from colorama import Fore, Style
 
 from agent import Agent
-from utils import Interval, QUANTITY_DECIMALS, format_backtest_row, print_backtest_results
-from utils.binance_data_provider import BinanceDataProvider
+from utils import (Interval, QUANTITY_DECIMALS, HISTORY_CANDLES, HistoricalKlineFeed, format_backtest_row,
+                   print_backtest_results)
+from utils.binance_data_provider import get_data_provider
+from utils.kline_store import MARKET_FUTURES, MARKET_SPOT
 from src.utils.logger import setup_logger
 import time
 
@@ -67,8 +69,9 @@ class Backtester:
         self.show_agent_graph = show_agent_graph
         self.show_reasoning = show_reasoning
 
-        self.binance_data_provider = BinanceDataProvider()
+        self.binance_data_provider = get_data_provider()
         self.klines: Dict[str, pd.DataFrame] = {}
+        self.kline_feed = HistoricalKlineFeed()
 
         self.portfolio = {
             "available_USDC": initial_capital,
@@ -310,12 +313,31 @@ class Backtester:
     def prefetch_data(self):
         logger.debug("Fetching candles…")
         for sym in self.tickers:
-            self.klines[sym] = self.binance_data_provider.get_historical_klines(
+            for interval in self.intervals:
+                # load enough history before start_date for the first bar's indicators
+                warmup = interval.to_timedelta() * HISTORY_CANDLES
+                # strategies read futures klines, as in a live run
+                df = self.binance_data_provider.get_historical_klines(
+                    symbol=sym,
+                    timeframe=interval.value,
+                    start_date=self.start_date - warmup,
+                    end_date=self.end_date,
+                    market_type=MARKET_FUTURES,
+                )
+                self.kline_feed.add(sym, interval.value, df)
+
+            # orders are filled at spot prices
+            df = self.binance_data_provider.get_historical_klines(
                 symbol=sym,
                 timeframe=self.primary_interval.value,
                 start_date=self.start_date,
                 end_date=self.end_date,
+                market_type=MARKET_SPOT,
             )
+            if not df.empty:
+                start = pd.to_datetime(int(self.start_date.timestamp() * 1000), unit="ms")
+                df = df[df["open_time"] >= start].reset_index(drop=True)
+            self.klines[sym] = df
         logger.debug("Done.")
 
     # ------------------------------------------------------------------
@@ -352,6 +374,7 @@ class Backtester:
                 model_provider=self.model_provider,
                 show_agent_graph=self.show_agent_graph,
                 show_reasoning=self.show_reasoning,
+                kline_feed=self.kline_feed,
             )
             decisions = output.get("decisions", {})
             analyst_signals = output.get("analyst_signals", {})
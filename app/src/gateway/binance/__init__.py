@@ -6,11 +6,13 @@ from .async_client import AsyncClient  # noqa
 from .client import Client  # noqa
 from .ws.depthcache import (
     DepthCacheManager,  # noqa
+    TickDepthCache,  # noqa
     OptionsDepthCacheManager,  # noqa
     ThreadedDepthCacheManager,  # noqa
     FuturesDepthCacheManager,  # noqa
     OptionsDepthCacheManager,  # noqa
 )
+from .ws.depth_snapshot import DepthSnapshotFetcher  # noqa
 from .ws.streams import (
     BinanceSocketManager,  # noqa
     ThreadedWebsocketManager,  # noqa
@@ -21,6 +23,20 @@ from .ws.keepalive_websocket import KeepAliveWebsocket  # noqa
 
 from .ws.reconnecting_websocket import ReconnectingWebsocket  # noqa
 
+from .ws.stream_multiplexer import BinanceStreamMultiplexer, StreamSubscription  # noqa
+
+from .ws.recording import StreamRecorder, RecordedFrame, read_recording  # noqa
+
+from .ws.replay_server import ReplayServer  # noqa
+
+from .ws.decoders import (
+    BookTicker,  # noqa
+    DepthUpdate,  # noqa
+    FieldDecoder,  # noqa
+    Trade,  # noqa
+    STREAM_DECODERS,  # noqa
+)
+
 from .ws.constants import *  # noqa
 
 from .exceptions import *  # noqa
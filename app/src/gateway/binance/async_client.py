@@ -1,4 +1,3 @@
-import asyncio
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 from urllib.parse import urlencode, quote
@@ -17,6 +16,7 @@ from .helpers import (
     convert_ts_str,
     get_loop,
     interval_to_milliseconds,
+    json_loads,
 )
 from .base_client import BaseClient
 from .client import Client
@@ -121,8 +121,10 @@ class AsyncClient(BaseClient):
                     headers.update(kwargs["data"][key])
                     del kwargs["data"][key]
                     break
+        params = dict(kwargs["data"]) if isinstance(kwargs.get("data"), dict) else {}
 
         kwargs = self._get_request_kwargs(method, signed, force_params, **kwargs)
+        base_uri = uri
 
         if method == "get":
             # url encode the query string
@@ -144,15 +146,28 @@ class AsyncClient(BaseClient):
             url_encoded_data = urlencode(dict_data)
             data = f"{url_encoded_data}&signature={signature}"
 
-        async with getattr(self.session, method)(
-            yarl.URL(uri, encoded=True),
-            proxy=self.https_proxy,
-            headers=headers,
-            data=data,
-            **kwargs,
-        ) as response:
-            self.response = response
-            return await self._handle_response(response)
+        async def send():
+            attempt = 0
+            while True:
+                await self.scheduler.acquire_async(method, uri, params)
+                async with getattr(self.session, method)(
+                    yarl.URL(uri, encoded=True),
+                    proxy=self.https_proxy,
+                    headers=headers,
+                    data=data,
+                    **kwargs,
+                ) as response:
+                    self.response = response
+                    retry_after = self.scheduler.update(uri, response.status, response.headers)
+                    # signed requests are not replayed, their signature expires with recvWindow
+                    if signed or not self.scheduler.should_retry(response.status, retry_after, attempt):
+                        return await self._handle_response(response)
+                attempt += 1
+
+        # identical public GETs in flight share one call
+        if self.coalescer is not None and self.coalescer.coalescable(method, signed):
+            return await self.coalescer.call_async(base_uri, params, send)
+        return await send()
 
     async def _handle_response(self, response: aiohttp.ClientResponse):
         """Internal helper for handling API responses from the Binance server.
@@ -162,11 +177,12 @@ class AsyncClient(BaseClient):
         if not str(response.status).startswith("2"):
             raise BinanceAPIException(response, response.status, await response.text())
         
-        if response.text == "":
+        body = await response.read()
+        if not body:
             return {}
 
         try:
-            return await response.json()
+            return json_loads(body)
         except ValueError:
             txt = await response.text()
             raise BinanceRequestException(f"Invalid Response: {txt}")
@@ -515,7 +531,6 @@ class AsyncClient(BaseClient):
         if end_ts and start_ts and end_ts <= start_ts:
             return output_data
 
-        idx = 0
         while True:
             # fetch the klines from start_ts up to max 500 entries or the end_ts if set
             temp_data = await self._klines(
@@ -550,11 +565,6 @@ class AsyncClient(BaseClient):
             if end_ts and start_ts >= end_ts:
                 break
 
-            # sleep after every 3rd call to be kind to the API
-            idx += 1
-            if idx % 3 == 0:
-                await asyncio.sleep(1)
-
         return output_data
 
     _historical_klines.__doc__ = Client._historical_klines.__doc__
@@ -608,7 +618,6 @@ class AsyncClient(BaseClient):
         if end_ts and start_ts and end_ts <= start_ts:
             return
 
-        idx = 0
         while True:
             # fetch the klines from start_ts up to max 500 entries or the end_ts if set
             output_data = await self._klines(
@@ -638,11 +647,6 @@ class AsyncClient(BaseClient):
             if end_ts and start_ts >= end_ts:
                 break
 
-            # sleep after every 3rd call to be kind to the API
-            idx += 1
-            if idx % 3 == 0:
-                await asyncio.sleep(1)
-
     _historical_klines_generator.__doc__ = Client._historical_klines_generator.__doc__
 
     async def get_avg_price(self, **params):
@@ -1734,6 +1738,21 @@ class AsyncClient(BaseClient):
             klines_type=HistoricalKlinesType.FUTURES,
         )
 
+    async def futures_historical_klines_with_end_time(
+        self, symbol, interval, end_str, limit=500
+    ):
+        return await self._historical_klines(
+            symbol,
+            interval,
+            end_str=end_str,
+            limit=limit,
+            klines_type=HistoricalKlinesType.FUTURES,
+        )
+
+    futures_historical_klines_with_end_time.__doc__ = (
+        Client.futures_historical_klines_with_end_time.__doc__
+    )
+
     async def futures_historical_klines_generator(
         self, symbol, interval, start_str, end_str=None
     ):
@@ -15,6 +15,8 @@ from operator import itemgetter
 from urllib.parse import urlencode
 
 from .ws.websocket_api import WebsocketAPI
+from .rate_limiter import default_scheduler
+from .request_coalescer import default_coalescer
 
 from .helpers import get_loop
 
@@ -202,6 +204,10 @@ class BaseClient:
         self.response = None
         self.testnet = testnet
         self.timestamp_offset = 0
+        # shared by every client of the process, the rate limits apply per IP and account
+        self.scheduler = default_scheduler
+        # identical public GETs of the process share one call, None to disable
+        self.coalescer = default_coalescer
         ws_api_url = self.WS_API_TESTNET_URL if testnet else self.WS_API_URL.format(tld)
         if self.TIME_UNIT:
             ws_api_url += f"?timeUnit={self.TIME_UNIT}"
@@ -11,6 +11,7 @@ from .helpers import (
     convert_list_to_json_array,
     interval_to_milliseconds,
     convert_ts_str,
+    json_loads,
 )
 from .exceptions import (
     BinanceAPIException,
@@ -70,6 +71,7 @@ class Client(BaseClient):
                     headers.update(kwargs["data"][key])
                     del kwargs["data"][key]
                     break
+        params = dict(kwargs["data"]) if isinstance(kwargs.get("data"), dict) else {}
 
         kwargs = self._get_request_kwargs(method, signed, force_params, **kwargs)
 
@@ -85,8 +87,22 @@ class Client(BaseClient):
             url_encoded_data = urlencode(dict_data)
             data = f"{url_encoded_data}&signature={signature}"
 
-        self.response = getattr(self.session, method)(uri, headers=headers, data=data, **kwargs)
-        return self._handle_response(self.response)
+        def send():
+            attempt = 0
+            while True:
+                self.scheduler.acquire(method, uri, params)
+                self.response = getattr(self.session, method)(uri, headers=headers, data=data, **kwargs)
+                status = self.response.status_code
+                retry_after = self.scheduler.update(uri, status, self.response.headers)
+                # signed requests are not replayed, their signature expires with recvWindow
+                if signed or not self.scheduler.should_retry(status, retry_after, attempt):
+                    return self._handle_response(self.response)
+                attempt += 1
+
+        # identical public GETs in flight share one call
+        if self.coalescer is not None and self.coalescer.coalescable(method, signed):
+            return self.coalescer.call(uri, params, send)
+        return send()
 
     @staticmethod
     def _handle_response(response: requests.Response):
@@ -97,11 +113,11 @@ class Client(BaseClient):
         if not (200 <= response.status_code < 300):
             raise BinanceAPIException(response, response.status_code, response.text)
         
-        if response.text == "":
+        if not response.content:
             return {}
 
         try:
-            return response.json()
+            return json_loads(response.content)
         except ValueError:
             raise BinanceRequestException("Invalid Response: %s" % response.text)
 
@@ -926,7 +942,6 @@ class Client(BaseClient):
         if end_ts and start_ts and end_ts <= start_ts:
             return output_data
 
-        idx = 0
         while True:
             # fetch the klines from start_ts up to max 500 entries or the end_ts if set
             temp_data = self._klines(
@@ -960,11 +975,6 @@ class Client(BaseClient):
             if end_ts and start_ts >= end_ts:
                 break
 
-            # sleep after every 3rd call to be kind to the API
-            idx += 1
-            if idx % 3 == 0:
-                time.sleep(1)
-
         return output_data
 
     def get_historical_klines_generator(
@@ -1049,7 +1059,6 @@ class Client(BaseClient):
         if end_ts and start_ts and end_ts <= start_ts:
             return
 
-        idx = 0
         while True:
             # fetch the klines from start_ts up to max 500 entries or the end_ts if set
             output_data = self._klines(
@@ -1080,11 +1089,6 @@ class Client(BaseClient):
             if end_ts and start_ts >= end_ts:
                 break
 
-            # sleep after every 3rd call to be kind to the API
-            idx += 1
-            if idx % 3 == 0:
-                time.sleep(1)
-
     def get_avg_price(self, **params):
         """Current average price for a symbol.
 
@@ -81,6 +81,10 @@ class BinanceWebsocketClosed(Exception):
     """Raised when websocket connection is closed."""
     pass
 
+class BinanceWebsocketSubscriptionError(Exception):
+    """Raised when a SUBSCRIBE or UNSUBSCRIBE request is rejected."""
+    pass
+
 class NotImplementedException(Exception):
     def __init__(self, value):
         message = f"Not implemented: {value}"
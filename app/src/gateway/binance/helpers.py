@@ -10,6 +10,12 @@ from datetime import datetime
 
 from .exceptions import UnknownDateFormat
 
+# load orjson if available, otherwise default to json
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 
 def date_to_milliseconds(date_str: str) -> int:
     """Convert UTC date to milliseconds
@@ -0,0 +1,224 @@
+import asyncio
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token bucket holding the remaining budget of one Binance rate limit.
+
+    The bucket refills continuously at capacity / period per second. Reservations may
+    overdraw it: the caller then waits until the debt is refilled, so concurrent callers
+    are spaced out instead of all retrying at the same instant.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, cost: float, now: float) -> float:
+        """Take cost tokens, return the seconds to wait before they are available"""
+        self._refill(now)
+        self.tokens -= cost
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def sync(self, used: int, now: float):
+        """Align the bucket on the usage reported by the exchange"""
+        self._refill(now)
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+# Rate limits per IP and API family: {interval header suffix: (limit, seconds)}
+REQUEST_WEIGHT_LIMITS: Dict[str, Dict[str, Tuple[int, float]]] = {
+    "api": {"1m": (6000, 60)},
+    "sapi": {"1m": (12000, 60)},
+    "fapi": {"1m": (2400, 60)},
+    "dapi": {"1m": (2400, 60)},
+    "eapi": {"1m": (400, 60)},
+    "papi": {"1m": (6000, 60)},
+}
+DEFAULT_REQUEST_WEIGHT_LIMITS = {"1m": (1200, 60)}
+
+# Order rate limits per account: {interval header suffix: (limit, seconds)}
+ORDER_COUNT_LIMITS: Dict[str, Dict[str, Tuple[int, float]]] = {
+    "api": {"10s": (100, 10), "1d": (200000, 86400)},
+    "fapi": {"10s": (300, 10), "1m": (1200, 60)},
+    "dapi": {"1m": (1200, 60)},
+}
+
+ORDER_PATHS = ("order", "order/oco", "orderList/oco", "batchOrders", "order/test")
+
+
+def _klines_weight(family: str, params: Mapping) -> int:
+    if family == "api":
+        return 2
+    limit = int(params.get("limit") or 500)
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def _depth_weight(family: str, params: Mapping) -> int:
+    limit = int(params.get("limit") or (100 if family == "api" else 500))
+    if family == "api":
+        return 5 if limit <= 100 else 25 if limit <= 500 else 50 if limit <= 1000 else 250
+    return 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+
+
+# Known request weights per (API family, endpoint), functions of the request params
+ENDPOINT_WEIGHTS = {
+    ("api", "klines"): _klines_weight,
+    ("api", "uiKlines"): _klines_weight,
+    ("fapi", "klines"): _klines_weight,
+    ("fapi", "continuousKlines"): _klines_weight,
+    ("fapi", "markPriceKlines"): _klines_weight,
+    ("fapi", "indexPriceKlines"): _klines_weight,
+    ("dapi", "klines"): _klines_weight,
+    ("api", "depth"): _depth_weight,
+    ("fapi", "depth"): _depth_weight,
+    ("api", "exchangeInfo"): lambda family, params: 20,
+    ("api", "account"): lambda family, params: 20,
+    ("api", "myTrades"): lambda family, params: 20,
+    ("api", "openOrders"): lambda family, params: 6 if params.get("symbol") else 80,
+    ("api", "ticker/24hr"): lambda family, params: 2 if params.get("symbol") else 80,
+    ("api", "ticker/price"): lambda family, params: 2 if params.get("symbol") else 4,
+    ("fapi", "account"): lambda family, params: 5,
+    ("fapi", "balance"): lambda family, params: 5,
+    ("fapi", "ticker/24hr"): lambda family, params: 1 if params.get("symbol") else 40,
+    ("fapi", "openOrders"): lambda family, params: 1 if params.get("symbol") else 40,
+}
+
+
+class WeightScheduler:
+    """Request scheduler keeping the clients within the Binance rate limits.
+
+    Every request reserves its known weight from the token bucket of its API family
+    before it is sent, and waits only when the budget is exhausted. The buckets are
+    aligned on the X-MBX-USED-WEIGHT-* and X-MBX-ORDER-COUNT-* response headers, and a
+    429/418 response blocks the family for its Retry-After delay.
+
+    One scheduler is shared by the sync and async clients of the process (see
+    default_scheduler), since the limits apply per IP and account.
+    """
+
+    # 429 responses are retried when the exchange asks to wait at most this long
+    MAX_RETRY_AFTER = 60
+    MAX_RETRIES = 3
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._weights: Dict[Tuple[str, str], TokenBucket] = {}
+        self._orders: Dict[Tuple[str, str], TokenBucket] = {}
+        self._blocked_until: Dict[str, float] = {}
+
+    @staticmethod
+    def family(uri: str) -> str:
+        """API family of a request uri, e.g. 'api', 'fapi', 'sapi'"""
+        parts = urlparse(uri).path.strip("/").split("/")
+        return parts[0] if parts and parts[0] else urlparse(uri).netloc
+
+    @staticmethod
+    def endpoint(uri: str) -> str:
+        """Endpoint of a request uri without family and version, e.g. 'klines', 'ticker/24hr'"""
+        parts = urlparse(uri).path.strip("/").split("/")
+        return "/".join(parts[2:])
+
+    def request_weight(self, uri: str, params: Optional[Mapping] = None) -> int:
+        family = self.family(uri)
+        weight = ENDPOINT_WEIGHTS.get((family, self.endpoint(uri)))
+        return weight(family, params or {}) if weight else 1
+
+    def _bucket(self, buckets: Dict, family: str, interval: str, limits: Dict[str, Tuple[int, float]]):
+        key = (family, interval)
+        if key not in buckets:
+            if interval not in limits:
+                return None
+            buckets[key] = TokenBucket(*limits[interval])
+        return buckets[key]
+
+    def reserve(self, method: str, uri: str, params: Optional[Mapping] = None) -> float:
+        """Reserve the budget of a request
+
+        :return: seconds to wait before sending it
+        """
+        family = self.family(uri)
+        weight = self.request_weight(uri, params)
+        is_order = method.lower() in ("post", "put") and self.endpoint(uri) in ORDER_PATHS
+        now = time.monotonic()
+        with self._lock:
+            delay = self._blocked_until.get(family, 0.0) - now
+            limits = REQUEST_WEIGHT_LIMITS.get(family, DEFAULT_REQUEST_WEIGHT_LIMITS)
+            for interval in limits:
+                delay = max(delay, self._bucket(self._weights, family, interval, limits).reserve(weight, now))
+            if is_order:
+                limits = ORDER_COUNT_LIMITS.get(family, {})
+                for interval in limits:
+                    delay = max(delay, self._bucket(self._orders, family, interval, limits).reserve(1, now))
+        return max(delay, 0.0)
+
+    def update(self, uri: str, status: int, headers: Mapping) -> Optional[float]:
+        """Record the rate limit headers of a response
+
+        :return: the Retry-After delay of a 429/418 response, None otherwise
+        """
+        family = self.family(uri)
+        now = time.monotonic()
+        retry_after = None
+        with self._lock:
+            for name, value in headers.items():
+                name = name.lower()
+                if name.startswith("x-mbx-used-weight-"):
+                    limits, buckets = REQUEST_WEIGHT_LIMITS.get(family, DEFAULT_REQUEST_WEIGHT_LIMITS), self._weights
+                    interval = name[len("x-mbx-used-weight-"):]
+                elif name.startswith("x-mbx-order-count-"):
+                    limits, buckets = ORDER_COUNT_LIMITS.get(family, {}), self._orders
+                    interval = name[len("x-mbx-order-count-"):]
+                else:
+                    continue
+                bucket = self._bucket(buckets, family, interval, limits)
+                if bucket is not None:
+                    bucket.sync(int(value), now)
+
+            if status in (418, 429):
+                try:
+                    retry_after = float(headers.get("Retry-After") or headers.get("retry-after") or 1)
+                except ValueError:
+                    retry_after = 1.0
+                self._blocked_until[family] = max(self._blocked_until.get(family, 0.0), now + retry_after)
+        return retry_after
+
+    def should_retry(self, status: int, retry_after: Optional[float], attempt: int) -> bool:
+        """Whether a rate limited request is worth retrying, 418 (IP ban) never is"""
+        return (
+            status == 429
+            and retry_after is not None
+            and retry_after <= self.MAX_RETRY_AFTER
+            and attempt < self.MAX_RETRIES
+        )
+
+    def acquire(self, method: str, uri: str, params: Optional[Mapping] = None):
+        """Reserve the budget of a request and sleep until it can be sent"""
+        delay = self.reserve(method, uri, params)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self, method: str, uri: str, params: Optional[Mapping] = None):
+        """Reserve the budget of a request and wait without blocking the loop until it can be sent"""
+        delay = self.reserve(method, uri, params)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+default_scheduler = WeightScheduler()
@@ -0,0 +1,159 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+from .rate_limiter import WeightScheduler
+
+
+# Seconds a successful response may be served again, per (API family, endpoint)
+RESPONSE_TTLS: Dict[Tuple[str, str], float] = {
+    ("api", "exchangeInfo"): 60.0,
+    ("fapi", "exchangeInfo"): 60.0,
+    ("dapi", "exchangeInfo"): 60.0,
+    ("api", "ticker/price"): 1.0,
+    ("fapi", "ticker/price"): 1.0,
+    ("api", "ticker/bookTicker"): 1.0,
+    ("fapi", "ticker/bookTicker"): 1.0,
+    ("fapi", "premiumIndex"): 1.0,
+}
+
+
+class RequestCoalescer:
+    """Single-flight layer for the idempotent public GET requests of the clients.
+
+    Concurrent identical requests (same uri and params) share one network call and
+    one parsed result, whichever thread or task sent them first. Successful responses
+    of the endpoints listed in RESPONSE_TTLS are also served from a short-lived cache.
+
+    Shared results are returned as is, callers must not mutate them.
+
+    One coalescer is shared by the clients of the process (see default_coalescer).
+    """
+
+    MAX_CACHED = 1024
+
+    def __init__(self, ttls: Optional[Mapping[Tuple[str, str], float]] = None):
+        self.ttls = dict(RESPONSE_TTLS if ttls is None else ttls)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_async: Dict[Hashable, asyncio.Future] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    @staticmethod
+    def coalescable(method: str, signed: bool) -> bool:
+        return method.lower() == "get" and not signed
+
+    @staticmethod
+    def key(uri: str, params: Optional[Mapping] = None) -> Hashable:
+        return uri, tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+    def ttl(self, uri: str) -> float:
+        return self.ttls.get((WeightScheduler.family(uri), WeightScheduler.endpoint(uri)), 0.0)
+
+    def _cached(self, key: Hashable, now: float) -> Tuple[bool, Any]:
+        entry = self._cache.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= now:
+            del self._cache[key]
+            return False, None
+        self.cache_hits += 1
+        return True, entry[1]
+
+    def _store(self, key: Hashable, uri: str, result: Any):
+        ttl = self.ttl(uri)
+        if ttl <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._cache) >= self.MAX_CACHED:
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            if len(self._cache) < self.MAX_CACHED:
+                self._cache[key] = (now + ttl, result)
+
+    def call(self, uri: str, params: Optional[Mapping], send: Callable[[], Any]) -> Any:
+        """Send a request with send() unless an identical one is cached or in flight"""
+        key = self.key(uri, params)
+        with self._lock:
+            self.requests += 1
+            hit, result = self._cached(key, time.monotonic())
+            if hit:
+                return result
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = send()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._store(key, uri, result)
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def call_async(self, uri: str, params: Optional[Mapping], send: Callable[[], Awaitable[Any]]) -> Any:
+        """Send a request with await send() unless an identical one is cached or in flight"""
+        # futures are bound to the loop that awaits them
+        key = (id(asyncio.get_running_loop()), self.key(uri, params))
+        with self._lock:
+            self.requests += 1
+            hit, result = self._cached(key[1], time.monotonic())
+            if hit:
+                return result
+            future = self._inflight_async.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight_async[key] = asyncio.get_running_loop().create_future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            # a cancelled follower must not cancel the shared request
+            return await asyncio.shield(future)
+
+        try:
+            result = await send()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # retrieved by the followers, if any
+                future.exception()
+            raise
+        else:
+            self._store(key[1], uri, result)
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight_async[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "coalesced": self.coalesced,
+            "cache_hits": self.cache_hits,
+            "cached": len(self._cache),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+default_coalescer = RequestCoalescer()
@@ -8,3 +8,20 @@ class WSListenerState(Enum):
     STREAMING = "Streaming"
     RECONNECTING = "Reconnecting"
     EXITING = "Exiting"
+
+
+class WSQueuePolicy(Enum):
+    """What a websocket does with a message when its queue is full"""
+
+    ERROR = "error"  # stop the read loop with BinanceWebsocketQueueOverflow
+    BLOCK = "block"  # stop reading the socket until the consumer catches up
+    DROP_OLDEST = "drop_oldest"  # discard the oldest queued message
+    CONFLATE = "conflate"  # replace the queued message of the same key, e.g. the ticker of a symbol
+
+
+class DispatchMode(Enum):
+    """How ThreadedApiManager hands messages to the callbacks"""
+
+    INLINE = "inline"  # on the event loop thread, a slow callback delays every socket
+    THREAD_POOL = "thread_pool"  # on a thread pool, in order per stream
+    BATCH = "batch"  # lists of up to batch_size messages, on a thread pool, in order per stream
@@ -0,0 +1,144 @@
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+_new_tuple = tuple.__new__
+
+
+class BookTicker(NamedTuple):
+    symbol: str
+    update_id: int
+    bid_price: float
+    bid_qty: float
+    ask_price: float
+    ask_qty: float
+
+    # a newer book ticker of the symbol supersedes this one, see conflation_key
+    conflatable = True
+
+
+class Trade(NamedTuple):
+    symbol: str
+    trade_id: int
+    price: float
+    qty: float
+    trade_time: int
+    is_buyer_maker: bool
+
+    conflatable = False
+
+
+class DepthUpdate(NamedTuple):
+    symbol: str
+    event_time: int
+    first_update_id: int
+    final_update_id: int
+    # final update id of the previous event, futures streams only
+    prev_final_update_id: Optional[int]
+    bids: Union[List[List[str]], np.ndarray]
+    asks: Union[List[List[str]], np.ndarray]
+
+    conflatable = False
+
+
+class FieldDecoder:
+    """Decode the chosen fields of an event into a compact tuple
+
+    Only the listed fields are read and converted, e.g. the decimal strings of prices and
+    quantities into floats; the event dict is dropped right after.
+
+    Usage:
+        decoder = FieldDecoder([("s", str), ("c", float)])  # symbol and close of a ticker
+        symbol, close = decoder(event)
+    """
+
+    def __init__(self, fields: Sequence[Tuple[str, Callable]], result: type = tuple):
+        """
+        :param fields: (key, conversion) of the fields to decode, in result order, str and
+            int fields are taken as parsed
+        :param result: tuple type built from the fields, e.g. a NamedTuple class
+        """
+        self._keys = [key for key, _ in fields]
+        self._converts = [None if convert in (str, int, bool) else convert for _, convert in fields]
+        self._result = result
+
+    def __call__(self, event: dict):
+        """Decode an event, None if a field is missing (e.g. a subscription reply)"""
+        try:
+            values = [
+                event[key] if convert is None else convert(event[key])
+                for key, convert in zip(self._keys, self._converts)
+            ]
+        except (KeyError, TypeError):
+            return None
+        return _new_tuple(self._result, values)
+
+
+def decode_book_ticker(event: dict) -> Optional[BookTicker]:
+    """Decode a spot or futures book ticker event"""
+    try:
+        return _new_tuple(BookTicker, (
+            event["s"], event["u"],
+            float(event["b"]), float(event["B"]), float(event["a"]), float(event["A"]),
+        ))
+    except (KeyError, TypeError):
+        return None
+
+
+def decode_agg_trade(event: dict) -> Optional[Trade]:
+    """Decode a spot or futures aggregate trade event"""
+    try:
+        return _new_tuple(Trade, (event["s"], event["a"], float(event["p"]), float(event["q"]), event["T"], event["m"]))
+    except (KeyError, TypeError):
+        return None
+
+
+def decode_trade(event: dict) -> Optional[Trade]:
+    """Decode a spot trade event"""
+    try:
+        return _new_tuple(Trade, (event["s"], event["t"], float(event["p"]), float(event["q"]), event["T"], event["m"]))
+    except (KeyError, TypeError):
+        return None
+
+
+class DepthUpdateDecoder:
+    """Decode diff depth and partial depth events into DepthUpdate tuples
+
+    Price levels stay [price, quantity] strings, as the depth caches expect, unless as_arrays
+    is set, then each side is a (levels, 2) float64 array.
+    """
+
+    def __init__(self, as_arrays: bool = False):
+        self._as_arrays = as_arrays
+
+    def __call__(self, event: dict) -> Optional[DepthUpdate]:
+        bids = event.get("b", event.get("bids"))
+        asks = event.get("a", event.get("asks"))
+        if bids is None or asks is None:
+            return None
+        if self._as_arrays:
+            bids = np.array(bids, dtype=np.float64).reshape(-1, 2)
+            asks = np.array(asks, dtype=np.float64).reshape(-1, 2)
+        final_update_id = event.get("u", event.get("lastUpdateId"))
+        return _new_tuple(DepthUpdate, (
+            event.get("s"),
+            event.get("E"),
+            event.get("U", final_update_id),
+            final_update_id,
+            event.get("pu"),
+            bids,
+            asks,
+        ))
+
+
+depth_update_decoder = DepthUpdateDecoder()
+
+# decoders of the stream types, keyed as in the stream names. Decoding runs on top of the JSON
+# parsing, so it lowers the messages/sec of a socket (see benchmarks/ws_decode.py): it trades
+# throughput for typed fields, converted once on the event loop instead of in each callback
+STREAM_DECODERS = {
+    "bookTicker": decode_book_ticker,
+    "aggTrade": decode_agg_trade,
+    "trade": decode_trade,
+    "depth": depth_update_decoder,
+}
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import time
+import weakref
+from typing import Dict, Tuple
+
+from ..rate_limiter import ENDPOINT_WEIGHTS, TokenBucket
+
+# Request weight per minute the order book snapshots of one client may use, a fifth of the
+# spot IP limit, so resyncing many symbols at once never starves the other requests
+DEFAULT_SNAPSHOT_WEIGHT_BUDGET = 1200
+
+
+class DepthSnapshotFetcher:
+    """Order book snapshots of the depth cache managers of one client
+
+    Snapshots are requested one at a time through a dedicated weight budget, and a snapshot of
+    a symbol already being fetched is shared, so a reconnect or a refresh of 50 symbols is spread
+    over time instead of bursting 50 snapshot requests. Every manager of a client shares the
+    fetcher returned by for_client, e.g. all the depth caches of a ThreadedDepthCacheManager.
+    """
+
+    _fetchers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+    def __init__(self, client, weight_budget: int = DEFAULT_SNAPSHOT_WEIGHT_BUDGET, max_concurrency: int = 1):
+        """Initialise the DepthSnapshotFetcher
+
+        :param client: Binance AsyncClient
+        :param weight_budget: request weight the snapshots may use per minute
+        :param max_concurrency: snapshot requests in flight at once
+        """
+        self._client = client
+        self._budget = TokenBucket(weight_budget, 60)
+        self._budget_lock = asyncio.Lock()
+        self._concurrency = asyncio.Semaphore(max_concurrency)
+        self._in_flight: Dict[Tuple[str, int], asyncio.Future] = {}
+        self._log = logging.getLogger(__name__)
+        self.requests = 0
+        self.weight_used = 0
+
+    @classmethod
+    def for_client(cls, client) -> "DepthSnapshotFetcher":
+        """Get the fetcher shared by the depth cache managers of a client"""
+        fetcher = cls._fetchers.get(client)
+        if fetcher is None:
+            fetcher = cls._fetchers[client] = cls(client)
+        return fetcher
+
+    async def fetch(self, symbol: str, limit: int) -> Dict:
+        """Get an order book snapshot
+
+        :param symbol: Symbol of the order book
+        :param limit: Number of price levels
+        :returns: order book with lastUpdateId, bids and asks, as get_order_book
+        """
+        key = (symbol, limit)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._in_flight[key] = asyncio.ensure_future(self._fetch(symbol, limit))
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _fetch(self, symbol: str, limit: int) -> Dict:
+        weight = ENDPOINT_WEIGHTS[("api", "depth")]("api", {"limit": limit})
+        async with self._concurrency:
+            async with self._budget_lock:
+                delay = self._budget.reserve(weight, time.monotonic())
+                if delay > 0:
+                    self._log.debug(f"Waiting {delay:.1f}s of snapshot budget for {symbol}")
+                    await asyncio.sleep(delay)
+            self.requests += 1
+            self.weight_used += weight
+            return await self._client.get_order_book(symbol=symbol, limit=limit)
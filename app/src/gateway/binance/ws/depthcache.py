@@ -1,10 +1,16 @@
 import logging
+from bisect import bisect_left, insort
 from operator import itemgetter
 import asyncio
+import random
 import time
-from typing import Optional, Dict, Callable
+from typing import Optional, Dict, Callable, List, Union
+
+import numpy as np
 
 from ..helpers import get_loop
+from .decoders import DepthUpdate
+from .depth_snapshot import DepthSnapshotFetcher
 from .streams import BinanceSocketManager
 from .threaded_stream import ThreadedApiManager
 
@@ -33,9 +39,11 @@ class DepthCache(object):
         :return:
 
         """
-        self._bids[bid[0]] = self.conv_type(bid[1])
-        if bid[1] == "0.00000000":
-            del self._bids[bid[0]]
+        quantity = self.conv_type(bid[1])
+        if quantity == 0:
+            self._bids.pop(bid[0], None)
+        else:
+            self._bids[bid[0]] = quantity
 
     def add_ask(self, ask):
         """Add an ask to the cache
@@ -44,9 +52,11 @@ class DepthCache(object):
         :return:
 
         """
-        self._asks[ask[0]] = self.conv_type(ask[1])
-        if ask[1] == "0.00000000":
-            del self._asks[ask[0]]
+        quantity = self.conv_type(ask[1])
+        if quantity == 0:
+            self._asks.pop(ask[0], None)
+        else:
+            self._asks[ask[0]] = quantity
 
     def get_bids(self):
         """Get the current bids
@@ -116,6 +126,29 @@ class DepthCache(object):
             self._asks, reverse=False, conv_type=self.conv_type
         )
 
+    def set_depth(self, bids, asks):
+        """Replace the whole book, e.g. with a partial depth snapshot
+
+        :param bids: list of [price, quantity], or a (levels, 2) array
+        :param asks: list of [price, quantity], or a (levels, 2) array
+
+        """
+        # arrays of DepthUpdateDecoder(as_arrays=True)
+        self._bids = bids.tolist() if isinstance(bids, np.ndarray) else bids
+        self._asks = asks.tolist() if isinstance(asks, np.ndarray) else asks
+
+    def copy(self):
+        """Get a copy of the cache, to read the book on another thread while this one is updated
+
+        :return: DepthCache of the same class, with its own price levels
+
+        """
+        depth_cache = self.__class__.__new__(self.__class__)
+        depth_cache.__dict__.update(
+            (name, value.copy() if isinstance(value, (dict, list)) else value) for name, value in self.__dict__.items()
+        )
+        return depth_cache
+
     @staticmethod
     def sort_depth(vals, reverse=False, conv_type: Callable = float):
         """Sort bids or asks by price"""
@@ -132,7 +165,158 @@ class DepthCache(object):
         return lst
 
 
+class TickDepthCache(DepthCache):
+    """DepthCache keeping each side sorted by integer tick price
+
+    Price levels are keyed by their price in ticks, kept in ascending lists searched with bisect,
+    so an update is a dictionary write plus an O(log n) search (and a short list shift when a level
+    appears or disappears), the best bid/ask is O(1) and the top k levels are O(k). Prices and
+    quantities are converted once, when the update arrives, never again on reads.
+    """
+
+    def __init__(self, symbol, conv_type: Callable = float, tick_size: Optional[Union[str, float]] = None):
+        """Initialise the TickDepthCache
+
+        :param symbol: Symbol to create depth cache for
+        :type symbol: string
+        :param conv_type: Optional type to represent price, and amount, default is float.
+        :type conv_type: function.
+        :param tick_size: Optional price tick size of the symbol, see the PRICE_FILTER of the
+            exchange info, by default the precision of the first price received, which Binance
+            sends as a decimal string with the full precision of the symbol
+        :type tick_size: str or float
+
+        """
+        super().__init__(symbol, conv_type)
+        self._tick_size: Optional[float] = float(tick_size) if tick_size else None
+        # tick price -> (price, quantity), with ascending tick prices alongside
+        self._bids: Dict[int, tuple] = {}
+        self._asks: Dict[int, tuple] = {}
+        self._bid_ticks: List[int] = []
+        self._ask_ticks: List[int] = []
+
+    def add_bid(self, bid):
+        """Add a bid to the cache
+
+        :param bid: [price, quantity], a zero quantity removes the price level
+
+        """
+        self._update(self._bids, self._bid_ticks, bid)
+
+    def add_ask(self, ask):
+        """Add an ask to the cache
+
+        :param ask: [price, quantity], a zero quantity removes the price level
+
+        """
+        self._update(self._asks, self._ask_ticks, ask)
+
+    def set_depth(self, bids, asks):
+        """Replace the whole book, e.g. with a partial depth snapshot
+
+        :param bids: list of [price, quantity]
+        :param asks: list of [price, quantity]
+
+        """
+        for levels, ticks, orders in ((self._bids, self._bid_ticks, bids), (self._asks, self._ask_ticks, asks)):
+            levels.clear()
+            for price, quantity in orders:
+                quantity = self.conv_type(quantity)
+                if quantity != 0:
+                    levels[self._to_tick(price)] = (self.conv_type(price), quantity)
+            ticks[:] = sorted(levels)
+
+    def get_bids(self, limit: Optional[int] = None):
+        """Get the current bids, best first
+
+        :param limit: Optional number of price levels, all by default
+        :return: list of bids with price and quantity as conv_type
+
+        """
+        ticks = self._bid_ticks if limit is None else self._bid_ticks[-limit:] if limit > 0 else []
+        return [list(self._bids[tick]) for tick in reversed(ticks)]
+
+    def get_asks(self, limit: Optional[int] = None):
+        """Get the current asks, best first
+
+        :param limit: Optional number of price levels, all by default
+        :return: list of asks with price and quantity as conv_type
+
+        """
+        ticks = self._ask_ticks if limit is None else self._ask_ticks[:limit]
+        return [list(self._asks[tick]) for tick in ticks]
+
+    def best_bid(self):
+        """Get the highest bid as [price, quantity], None if there is no bid"""
+        return list(self._bids[self._bid_ticks[-1]]) if self._bid_ticks else None
+
+    def best_ask(self):
+        """Get the lowest ask as [price, quantity], None if there is no ask"""
+        return list(self._asks[self._ask_ticks[0]]) if self._ask_ticks else None
+
+    def mid_price(self):
+        """Get the mean of the best bid and ask prices, None if a side is empty"""
+        if not self._bid_ticks or not self._ask_ticks:
+            return None
+        return (self._bids[self._bid_ticks[-1]][0] + self._asks[self._ask_ticks[0]][0]) / 2
+
+    def spread(self):
+        """Get the best ask price minus the best bid price, None if a side is empty"""
+        if not self._bid_ticks or not self._ask_ticks:
+            return None
+        return self._asks[self._ask_ticks[0]][0] - self._bids[self._bid_ticks[-1]][0]
+
+    def spread_ticks(self) -> Optional[int]:
+        """Get the spread as a number of ticks, None if a side is empty"""
+        if not self._bid_ticks or not self._ask_ticks:
+            return None
+        return self._ask_ticks[0] - self._bid_ticks[-1]
+
+    def imbalance(self, depth: int = 1):
+        """Get the order book imbalance over the best price levels
+
+        :param depth: number of price levels of each side
+        :return: (bid quantity - ask quantity) / (bid quantity + ask quantity), in [-1, 1],
+            None if the book is empty
+
+        """
+        bid_quantity = sum(self._bids[tick][1] for tick in self._bid_ticks[-depth:]) if depth > 0 else 0
+        ask_quantity = sum(self._asks[tick][1] for tick in self._ask_ticks[:depth])
+        total = bid_quantity + ask_quantity
+        if not total:
+            return None
+        return (bid_quantity - ask_quantity) / total
+
+    def _update(self, levels: Dict[int, tuple], ticks: List[int], order):
+        quantity = self.conv_type(order[1])
+        tick = self._to_tick(order[0])
+        level = levels.get(tick)
+        if quantity == 0:
+            if level is not None:
+                del levels[tick]
+                del ticks[bisect_left(ticks, tick)]
+        elif level is None:
+            levels[tick] = (self.conv_type(order[0]), quantity)
+            insort(ticks, tick)
+        else:
+            levels[tick] = (level[0], quantity)
+
+    def _to_tick(self, price) -> int:
+        if self._tick_size is None:
+            if not isinstance(price, str):
+                # the repr of a float drops the trailing zeros, finer levels would be merged
+                raise ValueError(
+                    f"{self.symbol} tick size can only be inferred from decimal string prices, got {price!r}"
+                )
+            decimals = len(price) - price.index(".") - 1 if "." in price else 0
+            self._tick_size = 10.0 ** -decimals
+        return round(float(price) / self._tick_size)
+
+
 DEFAULT_REFRESH = 60 * 30  # 30 minutes
+# refreshes happen up to this fraction of the refresh interval early, so caches started
+# together do not refresh together
+REFRESH_JITTER = 0.25
 
 
 class BaseDepthCacheManager:
@@ -147,6 +331,8 @@ class BaseDepthCacheManager:
         bm=None,
         limit=10,
         conv_type=float,
+        depth_cache_class=DepthCache,
+        tick_size: Optional[Union[str, float]] = None,
     ):
         """Create a DepthCacheManager instance
 
@@ -164,6 +350,11 @@ class BaseDepthCacheManager:
         :type limit: int
         :param conv_type: Optional type to represent price, and amount, default is float.
         :type conv_type: function.
+        :param depth_cache_class: Optional DepthCache class, e.g. TickDepthCache, default DepthCache.
+        :type depth_cache_class: type
+        :param tick_size: Optional price tick size of the symbol for a TickDepthCache, by default
+            read from the PRICE_FILTER of the exchange info
+        :type tick_size: str or float
 
         """
 
@@ -177,9 +368,12 @@ class BaseDepthCacheManager:
         self._refresh_interval = refresh_interval
         self._conn_key = None
         self._conv_type = conv_type
+        self._depth_cache_class = depth_cache_class
+        self._tick_size = tick_size
         self._log = logging.getLogger(__name__)
 
     async def __aenter__(self):
+        await self._load_tick_size()
         await asyncio.gather(self._init_cache(), self._start_socket())
         await self._socket.__aenter__()
         return self
@@ -205,11 +399,33 @@ class BaseDepthCacheManager:
         """
 
         # initialise or clear depth cache
-        self._depth_cache = DepthCache(self._symbol, conv_type=self._conv_type)
+        self._depth_cache = self._new_depth_cache()
 
         # set a time to refresh the depth cache
+        self._schedule_refresh()
+
+    def _new_depth_cache(self):
+        if issubclass(self._depth_cache_class, TickDepthCache):
+            return self._depth_cache_class(self._symbol, conv_type=self._conv_type, tick_size=self._tick_size)
+        return self._depth_cache_class(self._symbol, conv_type=self._conv_type)
+
+    async def _load_tick_size(self):
+        """Read the tick size of the symbol from the exchange info, if a TickDepthCache needs it"""
+        if self._tick_size is not None or not issubclass(self._depth_cache_class, TickDepthCache):
+            return
+        symbol_info = await self._get_symbol_info()
+        for symbol_filter in (symbol_info or {}).get("filters", []):
+            if symbol_filter.get("filterType") == "PRICE_FILTER":
+                self._tick_size = symbol_filter["tickSize"]
+                return
+        raise ValueError(f"No PRICE_FILTER in the exchange info of {self._symbol}")
+
+    async def _get_symbol_info(self) -> Optional[Dict]:
+        return await self._client.get_symbol_info(self._symbol)
+
+    def _schedule_refresh(self):
         if self._refresh_interval:
-            self._refresh_time = int(time.time()) + self._refresh_interval
+            self._refresh_time = int(time.time() + self._refresh_interval * (1 - REFRESH_JITTER * random.random()))
 
     async def _start_socket(self):
         """Start the depth cache socket
@@ -232,7 +448,7 @@ class BaseDepthCacheManager:
         if not msg:
             return None
 
-        if "e" in msg and msg["e"] == "error":
+        if isinstance(msg, dict) and msg.get("e") == "error":
             # close the socket
             await self.close()
 
@@ -263,13 +479,20 @@ class BaseDepthCacheManager:
 
     def _apply_orders(self, msg):
         assert self._depth_cache
-        for bid in msg.get("b", []) + msg.get("bids", []):
+        if isinstance(msg, DepthUpdate):
+            # decoded by the socket, see ws.decoders.STREAM_DECODERS
+            bids, asks, update_time = msg.bids, msg.asks, msg.event_time or msg.final_update_id
+        else:
+            bids = msg.get("b", []) + msg.get("bids", [])
+            asks = msg.get("a", []) + msg.get("asks", [])
+            update_time = msg.get("E") or msg.get("lastUpdateId")
+        for bid in bids:
             self._depth_cache.add_bid(bid)
-        for ask in msg.get("a", []) + msg.get("asks", []):
+        for ask in asks:
             self._depth_cache.add_ask(ask)
 
         # keeping update time
-        self._depth_cache.update_time = msg.get("E") or msg.get("lastUpdateId")
+        self._depth_cache.update_time = update_time
 
     def get_depth_cache(self):
         """Get the current depth cache
@@ -305,6 +528,9 @@ class DepthCacheManager(BaseDepthCacheManager):
         limit=500,
         conv_type=float,
         ws_interval=None,
+        depth_cache_class=DepthCache,
+        snapshot_fetcher: Optional[DepthSnapshotFetcher] = None,
+        tick_size: Optional[Union[str, float]] = None,
     ):
         """Initialise the DepthCacheManager
 
@@ -321,51 +547,112 @@ class DepthCacheManager(BaseDepthCacheManager):
         :type conv_type: function.
         :param ws_interval: Optional interval for updates on websocket, default None. If not set, updates happen every second. Must be 0, None (1s) or 100 (100ms).
         :type ws_interval: int
+        :param depth_cache_class: Optional DepthCache class, e.g. TickDepthCache, default DepthCache.
+        :type depth_cache_class: type
+        :param snapshot_fetcher: Optional fetcher of the order book snapshots, by default the one
+            shared by every manager of the client
+        :type snapshot_fetcher: DepthSnapshotFetcher
+        :param tick_size: Optional price tick size of the symbol for a TickDepthCache, by default
+            read from the PRICE_FILTER of the exchange info
+        :type tick_size: str or float
 
         """
-        super().__init__(client, symbol, loop, refresh_interval, bm, limit, conv_type)
+        super().__init__(client, symbol, loop, refresh_interval, bm, limit, conv_type, depth_cache_class, tick_size)
         self._ws_interval = ws_interval
+        self._snapshot_fetcher = snapshot_fetcher or DepthSnapshotFetcher.for_client(client)
+        self._depth_message_buffer = []
+        self._resync_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        # listen before fetching the snapshot, so the buffered events cover everything after it
+        await self._load_tick_size()
+        self._depth_cache = self._new_depth_cache()
+        self._last_update_id = None
+        await self._start_socket()
+        await self._socket.__aenter__()
+        self._request_resync()
+        return self
+
+    async def __aexit__(self, *args, **kwargs):
+        self._cancel_resync()
+        await super().__aexit__(*args, **kwargs)
 
     async def _init_cache(self):
-        """Initialise the depth cache calling REST endpoint
+        """Initialise the depth cache from a REST snapshot and the buffered websocket events
 
         :return:
         """
         self._last_update_id = None
-        self._depth_message_buffer = []
+        self._request_resync()
+        await asyncio.shield(self._resync_task)
 
-        res = await self._client.get_order_book(symbol=self._symbol, limit=self._limit)
-
-        # initialise or clear depth cache
-        await super()._init_cache()
-
-        # process bid and asks from the order book
-        self._apply_orders(res)
-        assert self._depth_cache
-        for bid in res["bids"]:
-            self._depth_cache.add_bid(bid)
-        for ask in res["asks"]:
-            self._depth_cache.add_ask(ask)
-
-        # set first update id
-        self._last_update_id = res["lastUpdateId"]
-
-        # Apply any updates from the websocket
-        for msg in self._depth_message_buffer:
-            await self._process_depth_message(msg)
+    def _request_resync(self):
+        """Fetch a new snapshot in the background, unless one is already being fetched"""
+        if self._resync_task is None or self._resync_task.done():
+            # events from now on are replayed on the snapshot
+            self._depth_message_buffer = []
+            self._resync_task = asyncio.ensure_future(self._resync())
 
-        # clear the depth buffer
-        self._depth_message_buffer = []
+    def _cancel_resync(self):
+        if self._resync_task is not None and not self._resync_task.done():
+            self._resync_task.cancel()
+        self._resync_task = None
 
-    async def _start_socket(self):
-        """Start the depth cache socket
+    async def _resync(self):
+        """Rebuild the depth cache from a snapshot and the events received since it was requested
 
-        :return:
+        The events keep being applied to the current cache, if it is in sync, until the new one
+        replaces it. The snapshot goes through the shared DepthSnapshotFetcher, which spaces the
+        snapshots of all symbols within its weight budget.
         """
-        if not getattr(self, "_depth_message_buffer", None):
-            self._depth_message_buffer = []
-
-        await super()._start_socket()
+        attempts = 0
+        while True:
+            try:
+                res = await self._snapshot_fetcher.fetch(self._symbol, self._limit)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                wait = min(60, 2 ** attempts)
+                attempts += 1
+                self._log.warning(f"Failed to fetch the {self._symbol} order book ({e}), retrying in {wait}s")
+                await asyncio.sleep(wait)
+                continue
+
+            depth_cache = self._new_depth_cache()
+            for bid in res["bids"]:
+                depth_cache.add_bid(bid)
+            for ask in res["asks"]:
+                depth_cache.add_ask(ask)
+            depth_cache.update_time = res["lastUpdateId"]
+
+            # swap and replay without awaiting, so no event falls between the two
+            buffered, self._depth_message_buffer = self._depth_message_buffer, []
+            previous_cache, self._depth_cache = self._depth_cache, depth_cache
+            self._last_update_id = res["lastUpdateId"]
+            self._schedule_refresh()
+            if all(self._apply_diff(msg) is not False for msg in buffered):
+                return
+            # events were missed since the snapshot, e.g. a reconnection: fetch another one
+            self._depth_cache = previous_cache
+            self._last_update_id = None
+
+    def _apply_diff(self, msg) -> Optional[bool]:
+        """Apply a diff depth event
+
+        :return: True if applied, None if older than the cache, False if events are missing
+        """
+        if isinstance(msg, DepthUpdate):
+            first_update_id, final_update_id = msg.first_update_id, msg.final_update_id
+        else:
+            first_update_id, final_update_id = msg["U"], msg["u"]
+        if final_update_id <= self._last_update_id:
+            # older than the snapshot
+            return None
+        if first_update_id > self._last_update_id + 1:
+            return False
+        self._apply_orders(msg)
+        self._last_update_id = final_update_id
+        return True
 
     def _get_socket(self):
         return self._bm.depth_socket(self._symbol, interval=self._ws_interval)
@@ -378,32 +665,37 @@ class DepthCacheManager(BaseDepthCacheManager):
 
         """
 
-        if self._last_update_id is None:
-            # Initial depth snapshot fetch not yet performed, buffer messages
+        applied = None
+        if self._last_update_id is not None:
+            applied = self._apply_diff(msg)
+            if applied is False:
+                # events were missed: resync in the background instead of blocking on a snapshot
+                self._log.warning(f"{self._symbol} depth events missed after {self._last_update_id}, resyncing")
+                self._last_update_id = None
+                self._request_resync()
+
+        if self._resync_task is not None and not self._resync_task.done():
+            # a snapshot is being fetched, keep the event to replay it on the snapshot
             self._depth_message_buffer.append(msg)
-            return
 
-        if msg["u"] <= self._last_update_id:
-            # ignore any updates before the initial update id
+        if not applied:
+            # no snapshot applied yet, or an update before the cache
             return
-        elif msg["U"] != self._last_update_id + 1:
-            # if not buffered check we get sequential updates
-            # otherwise init cache again
-            await self._init_cache()
-
-        # add any bid or ask values
-        self._apply_orders(msg)
-
-        # call the callback with the updated depth cache
-        res = self._depth_cache
-
-        self._last_update_id = msg["u"]
 
         # after processing event see if we need to refresh the depth cache
         if self._refresh_interval and int(time.time()) > self._refresh_time:
-            await self._init_cache()
+            self._schedule_refresh()
+            self._request_resync()
 
-        return res
+        return self._depth_cache
+
+    async def close(self):
+        """Close the open socket for this manager
+
+        :return:
+        """
+        self._cancel_resync()
+        await super().close()
 
 
 class FuturesDepthCacheManager(BaseDepthCacheManager):
@@ -419,8 +711,11 @@ class FuturesDepthCacheManager(BaseDepthCacheManager):
 
     def _apply_orders(self, msg):
         assert self._depth_cache
-        self._depth_cache._bids = msg.get("b", [])
-        self._depth_cache._asks = msg.get("a", [])
+        if isinstance(msg, DepthUpdate):
+            self._depth_cache.set_depth(msg.bids, msg.asks)
+            self._depth_cache.update_time = msg.event_time or msg.final_update_id
+            return
+        self._depth_cache.set_depth(msg.get("b", []), msg.get("a", []))
 
         # keeping update time
         self._depth_cache.update_time = msg.get("E") or msg.get("lastUpdateId")
@@ -429,11 +724,19 @@ class FuturesDepthCacheManager(BaseDepthCacheManager):
         sock = self._bm.futures_depth_socket(self._symbol)
         return sock
 
+    async def _get_symbol_info(self) -> Optional[Dict]:
+        res = await self._client.futures_exchange_info()
+        return next((s for s in res["symbols"] if s["symbol"] == self._symbol.upper()), None)
+
 
 class OptionsDepthCacheManager(BaseDepthCacheManager):
     def _get_socket(self):
         return self._bm.options_depth_socket(self._symbol)
 
+    async def _get_symbol_info(self) -> Optional[Dict]:
+        res = await self._client.options_exchange_info()
+        return next((s for s in res["optionSymbols"] if s["symbol"] == self._symbol.upper()), None)
+
 
 class ThreadedDepthCacheManager(ThreadedApiManager):
     def __init__(
@@ -443,8 +746,18 @@ class ThreadedDepthCacheManager(ThreadedApiManager):
         requests_params: Optional[Dict[str, str]] = None,
         tld: str = "com",
         testnet: bool = False,
+        **dispatch_params,
     ):
-        super().__init__(api_key, api_secret, requests_params, tld, testnet)
+        """Initialise the ThreadedDepthCacheManager
+
+        :param dispatch_params: dispatch_mode, dispatch_workers, batch_size and max_pending, see
+            ThreadedApiManager; callbacks run on a pool thread get a copy of the depth cache
+        """
+        super().__init__(api_key, api_secret, requests_params, tld, testnet, **dispatch_params)
+
+    def _dispatch_message(self, msg):
+        # the event loop keeps updating the cache while the pool thread reads it
+        return msg.copy() if isinstance(msg, DepthCache) else msg
 
     def _start_depth_cache(
         self,
@@ -486,6 +799,8 @@ class ThreadedDepthCacheManager(ThreadedApiManager):
         limit=10,
         conv_type=float,
         ws_interval=0,
+        depth_cache_class=DepthCache,
+        tick_size=None,
     ) -> str:
         return self._start_depth_cache(
             dcm_class=DepthCacheManager,
@@ -496,6 +811,8 @@ class ThreadedDepthCacheManager(ThreadedApiManager):
             limit=limit,
             conv_type=conv_type,
             ws_interval=ws_interval,
+            depth_cache_class=depth_cache_class,
+            tick_size=tick_size,
         )
 
     def start_futures_depth_socket(
@@ -506,6 +823,8 @@ class ThreadedDepthCacheManager(ThreadedApiManager):
         bm=None,
         limit=10,
         conv_type=float,
+        depth_cache_class=DepthCache,
+        tick_size=None,
     ) -> str:
         return self._start_depth_cache(
             dcm_class=FuturesDepthCacheManager,
@@ -515,6 +834,8 @@ class ThreadedDepthCacheManager(ThreadedApiManager):
             bm=bm,
             limit=limit,
             conv_type=conv_type,
+            depth_cache_class=depth_cache_class,
+            tick_size=tick_size,
         )
 
     def start_options_depth_socket(
@@ -525,6 +846,8 @@ class ThreadedDepthCacheManager(ThreadedApiManager):
         bm=None,
         limit=10,
         conv_type=float,
+        depth_cache_class=DepthCache,
+        tick_size=None,
     ) -> str:
         return self._start_depth_cache(
             dcm_class=OptionsDepthCacheManager,
@@ -534,4 +857,6 @@ class ThreadedDepthCacheManager(ThreadedApiManager):
             bm=bm,
             limit=limit,
             conv_type=conv_type,
+            depth_cache_class=depth_cache_class,
+            tick_size=tick_size,
         )
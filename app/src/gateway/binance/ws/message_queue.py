@@ -0,0 +1,88 @@
+import asyncio
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def conflation_key(msg) -> Optional[Hashable]:
+    """Default key of the messages a newer message replaces
+
+    Messages of the same stream, event type and symbol replace each other, and kline events only
+    within the same kline, so a closed kline is never replaced by the next one. Errors and diff
+    depth events, which must all be applied in order, are never conflated; events decoded by
+    ws.decoders only if their type is conflatable.
+
+    :param msg: parsed websocket message, combined stream messages included
+    :returns: key of the message, None if it must not be conflated
+    """
+    if isinstance(msg, list):
+        # all market arrays are full snapshots
+        return ("arr",)
+    if isinstance(msg, tuple):
+        return _decoded_key(None, msg)
+    if not isinstance(msg, dict) or msg.get("e") == "error":
+        return None
+    data = msg.get("data", msg)
+    if isinstance(data, list):
+        return (msg.get("stream"),)
+    if isinstance(data, tuple):
+        return _decoded_key(msg.get("stream"), data)
+    if not isinstance(data, dict) or data.get("e") == "depthUpdate":
+        return None
+    kline = data.get("k")
+    return msg.get("stream"), data.get("e"), data.get("s"), kline.get("t") if isinstance(kline, dict) else None
+
+
+def _decoded_key(stream: Optional[str], data: tuple) -> Optional[Hashable]:
+    # events of ws.decoders, whose first field is the symbol
+    if not getattr(data, "conflatable", False):
+        return None
+    return stream, type(data), data[0]
+
+
+class ConflatingQueue:
+    """Queue keeping only the newest message of each key
+
+    A message whose key is already queued replaces the queued one in place, so the consumer gets
+    the latest state of every key in arrival order of the keys. Messages with a None key are
+    always queued. Implements the asyncio.Queue methods used by ReconnectingWebsocket.
+    """
+
+    def __init__(self, key: Callable[[Any], Optional[Hashable]] = conflation_key):
+        self._key = key
+        # dicts keep insertion order: the first key is the oldest message
+        self._messages: Dict[Hashable, Any] = {}
+        self._sequence = 0
+        self._not_empty = asyncio.Event()
+        self.conflated = 0
+
+    def qsize(self) -> int:
+        return len(self._messages)
+
+    def empty(self) -> bool:
+        return not self._messages
+
+    def put_nowait(self, msg):
+        key = self._key(msg)
+        if key is None:
+            # unique key, never replaced
+            self._sequence += 1
+            key = (ConflatingQueue, self._sequence)
+        elif key in self._messages:
+            self.conflated += 1
+        self._messages[key] = msg
+        self._not_empty.set()
+
+    async def put(self, msg):
+        self.put_nowait(msg)
+
+    def get_nowait(self):
+        if not self._messages:
+            raise asyncio.QueueEmpty
+        msg = self._messages.pop(next(iter(self._messages)))
+        if not self._messages:
+            self._not_empty.clear()
+        return msg
+
+    async def get(self):
+        while not self._messages:
+            await self._not_empty.wait()
+        return self.get_nowait()
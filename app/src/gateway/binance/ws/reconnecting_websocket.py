@@ -3,7 +3,7 @@ import gzip
 import json
 import logging
 from socket import gaierror
-from typing import Optional
+from typing import Any, Callable, Dict, Hashable, Optional
 from asyncio import sleep
 from random import random
 import websockets as ws
@@ -39,7 +39,9 @@ from ..exceptions import (
 )
 
 from ..helpers import get_loop
-from ..ws.constants import WSListenerState
+from ..ws.constants import WSListenerState, WSQueuePolicy
+from ..ws.message_queue import ConflatingQueue, conflation_key
+from ..ws.recording import StreamRecorder
 
 
 class ReconnectingWebsocket:
@@ -58,8 +60,29 @@ class ReconnectingWebsocket:
             is_binary: bool = False,
             exit_coro=None,
             https_proxy: Optional[str] = None,
+            queue_policy: WSQueuePolicy = WSQueuePolicy.ERROR,
+            max_queue_size: Optional[int] = None,
+            conflate_key: Callable[[Any], Optional[Hashable]] = conflation_key,
+            decoders: Optional[Dict[str, Callable]] = None,
+            recorder: Optional[StreamRecorder] = None,
             **kwargs,
     ):
+        """Initialise the ReconnectingWebsocket
+
+        :param queue_policy: what to do with a message when max_queue_size messages are queued:
+            ERROR stops the read loop with BinanceWebsocketQueueOverflow, BLOCK stops reading
+            the socket until the consumer catches up, DROP_OLDEST discards the oldest message,
+            CONFLATE keeps only the newest message of each conflate_key
+        :param max_queue_size: Optional queue size, default MAX_QUEUE_SIZE
+        :param conflate_key: key of the messages replacing each other with the CONFLATE policy,
+            None for messages never to replace
+        :param decoders: Optional event decoders by stream name or stream type, e.g. "bookTicker"
+            or "depth" (see ws.decoders.STREAM_DECODERS), replacing the event dict with a compact
+            tuple; events a decoder returns None for are kept as dicts. Decoding adds to the
+            parsing cost, for typed fields rather than throughput
+        :param recorder: Optional StreamRecorder the raw frames are appended to, for replay
+            by ws.replay_server.ReplayServer
+        """
         self._loop = get_loop()
         self._log = logging.getLogger(__name__)
         self._path = path
@@ -72,7 +95,18 @@ class ReconnectingWebsocket:
         self._socket = None
         self.ws: Optional[ws.WebSocketClientProtocol] = None  # type: ignore
         self.ws_state = WSListenerState.INITIALISING
-        self._queue = asyncio.Queue()
+        self._queue_policy = WSQueuePolicy(queue_policy)
+        self.max_queue_size = max_queue_size or self.MAX_QUEUE_SIZE
+        if self._queue_policy == WSQueuePolicy.BLOCK:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        elif self._queue_policy == WSQueuePolicy.CONFLATE:
+            self._queue = ConflatingQueue(conflate_key)
+        else:
+            self._queue = asyncio.Queue()
+        self.dropped_messages = 0
+        self._decoders = decoders or {}
+        self._stream_decoders: Dict[Optional[str], Optional[Callable]] = {}
+        self._recorder = recorder
         self._handle_read_loop = None
         self._https_proxy = https_proxy
         self._ws_kwargs = kwargs
@@ -165,7 +199,7 @@ class ReconnectingWebsocket:
                 self._log.error(f"Unexpected decompression error: {(e)}")
                 raise
         try:
-            return self.json_loads(evt)
+            msg = self.json_loads(evt)
         except ValueError as e:
             self._log.error(f"JSON Value Error parsing message: Error: {(e)}")
             raise
@@ -175,6 +209,38 @@ class ReconnectingWebsocket:
         except Exception as e:
             self._log.error(f"Unexpected error parsing message. Error: {(e)}")
             raise
+        if self._decoders:
+            return self._decode(msg)
+        return msg
+
+    def _decode(self, msg):
+        stream = msg.get("stream") if isinstance(msg, dict) else None
+        name = stream if stream is not None else self._path
+        decoder = self._stream_decoders.get(name, False)
+        if decoder is False:
+            decoder = self._stream_decoders[name] = self._get_stream_decoder(name)
+        if decoder is None:
+            return msg
+        event = msg["data"] if stream is not None else msg
+        decoded = decoder(event) if isinstance(event, dict) else None
+        if decoded is None:
+            # e.g. a subscription reply
+            return msg
+        if stream is None:
+            return decoded
+        msg["data"] = decoded
+        return msg
+
+    def _get_stream_decoder(self, name: Optional[str]) -> Optional[Callable]:
+        if not name:
+            return None
+        # e.g. btcusdt@depth20@100ms?timeUnit=MICROSECOND: depth20@100ms, then depth20, then depth
+        stream_type = name.split("?")[0].split("@", 1)[-1]
+        base_type = stream_type.split("@")[0]
+        for key in (name, stream_type, base_type, base_type.rstrip("0123456789")):
+            if key in self._decoders:
+                return self._decoders[key]
+        return None
 
     async def _read_loop(self):
         try:
@@ -201,15 +267,14 @@ class ReconnectingWebsocket:
                         res = await asyncio.wait_for(
                             self.ws.recv(), timeout=self.TIMEOUT
                         )
+                        if self._recorder is not None:
+                            self._recorder.record(f"{self._prefix}{self._path}", res)
                         res = self._handle_message(res)
-                        self._log.debug(f"Received message: {res}")
+                        if self._log.isEnabledFor(logging.DEBUG):
+                            # formatting a whole message costs more than decoding it
+                            self._log.debug(f"Received message: {res}")
                         if res:
-                            if self._queue.qsize() < self.MAX_QUEUE_SIZE:
-                                await self._queue.put(res)
-                            else:
-                                raise BinanceWebsocketQueueOverflow(
-                                    f"Message queue size {self._queue.qsize()} exceeded maximum {self.MAX_QUEUE_SIZE}"
-                                )
+                            await self._enqueue(res)
                 except asyncio.TimeoutError:
                     self._log.debug(f"no message in {self.TIMEOUT} seconds")
                     # _no_message_received_reconnect
@@ -246,6 +311,29 @@ class ReconnectingWebsocket:
             self._handle_read_loop = None  # Signal the coro is stopped
             self._reconnects = 0
 
+    async def _enqueue(self, msg):
+        if self._queue_policy == WSQueuePolicy.BLOCK:
+            # the socket is not read while the queue is full
+            await self._queue.put(msg)
+            return
+        if self._queue_policy == WSQueuePolicy.CONFLATE:
+            self._queue.put_nowait(msg)
+        elif self._queue.qsize() < self.max_queue_size:
+            await self._queue.put(msg)
+            return
+        elif self._queue_policy == WSQueuePolicy.ERROR:
+            raise BinanceWebsocketQueueOverflow(
+                f"Message queue size {self._queue.qsize()} exceeded maximum {self.max_queue_size}"
+            )
+        else:
+            self._queue.put_nowait(msg)
+        # DROP_OLDEST, or CONFLATE with more distinct keys queued than max_queue_size
+        while self._queue.qsize() > self.max_queue_size:
+            self._queue.get_nowait()
+            self.dropped_messages += 1
+            if self.dropped_messages % self.max_queue_size == 1:
+                self._log.warning(f"Websocket consumer is behind, {self.dropped_messages} messages dropped")
+
     async def _run_reconnect(self):
         await self.before_reconnect()
         if self._reconnects < self.MAX_RECONNECTS:
@@ -273,6 +361,17 @@ class ReconnectingWebsocket:
                 self._log.debug(f"no message in {self.TIMEOUT} seconds")
         return res
 
+    async def recv_many(self, max_messages: Optional[int] = None) -> list:
+        """Wait for a message, then return it with every other message already queued
+
+        :param max_messages: Optional maximum number of messages to return
+        :returns: list of messages, oldest first
+        """
+        messages = [await self.recv()]
+        while not self._queue.empty() and (max_messages is None or len(messages) < max_messages):
+            messages.append(self._queue.get_nowait())
+        return messages
+
     async def _wait_for_reconnect(self):
         while (
                 self.ws_state != WSListenerState.STREAMING
@@ -0,0 +1,150 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import BinaryIO, Iterator, NamedTuple, Optional, Union
+
+# Block header: first and last frame timestamps (ns), frame count, compressed and raw sizes
+_BLOCK_HEADER = struct.Struct("<qqIII")
+# Frame header: timestamp (ns), binary flag, path length, frame length
+_FRAME_HEADER = struct.Struct("<q?HI")
+MAGIC = b"BNCREC1\n"
+
+
+class RecordedFrame(NamedTuple):
+    timestamp_ns: int
+    # prefix and path of the socket url, e.g. ws/btcusdt@depth or stream?streams=btcusdt@trade
+    path: str
+    frame: Union[str, bytes]
+
+
+class StreamRecorder:
+    """Append-only recorder of raw websocket frames
+
+    Frames are appended to blocks compressed with zlib; each block starts with the timestamps
+    of its first and last frames, so a reader seeks to a time range by skipping whole blocks
+    without decompressing them. A block is written once it holds block_size bytes or is
+    flush_interval seconds old, so a crash loses at most the frames of the last block.
+
+    Record every socket of a BinanceSocketManager with:
+        recorder = StreamRecorder("btcusdt.rec")
+        bm.ws_kwargs["recorder"] = recorder
+    """
+
+    def __init__(self, filename: str, block_size: int = 256 * 1024, flush_interval: float = 1.0, level: int = 6):
+        """Initialise the StreamRecorder
+
+        :param filename: file to append the frames to, created if needed
+        :param block_size: uncompressed bytes per block
+        :param flush_interval: seconds after which a partial block is written
+        :param level: zlib compression level
+        """
+        self.filename = filename
+        self._block_size = block_size
+        self._flush_interval = flush_interval
+        self._level = level
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        self._count = 0
+        self._first_ns = 0
+        self._last_ns = 0
+        self._block_started = 0.0
+        new = not os.path.exists(filename) or os.path.getsize(filename) == 0
+        self._file: Optional[BinaryIO] = open(filename, "ab")
+        if new:
+            self._file.write(MAGIC)
+        self.frames = 0
+
+    def record(self, path: str, frame: Union[str, bytes], timestamp_ns: Optional[int] = None):
+        """Append a frame
+
+        :param path: prefix and path of the socket url
+        :param frame: raw text or binary frame
+        :param timestamp_ns: receipt time, now by default
+        """
+        timestamp_ns = timestamp_ns or time.time_ns()
+        binary = isinstance(frame, (bytes, bytearray))
+        data = bytes(frame) if binary else frame.encode()
+        path_bytes = path.encode()
+        with self._lock:
+            if self._file is None:
+                return
+            if not self._count:
+                self._first_ns = timestamp_ns
+                self._block_started = time.monotonic()
+            self._buffer += _FRAME_HEADER.pack(timestamp_ns, binary, len(path_bytes), len(data))
+            self._buffer += path_bytes
+            self._buffer += data
+            self._count += 1
+            self._last_ns = timestamp_ns
+            self.frames += 1
+            if len(self._buffer) >= self._block_size or time.monotonic() - self._block_started >= self._flush_interval:
+                self._write_block()
+
+    def flush(self):
+        """Write the frames of the current block"""
+        with self._lock:
+            if self._count:
+                self._write_block()
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        """Write the current block and close the file"""
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _write_block(self):
+        compressed = zlib.compress(bytes(self._buffer), self._level)
+        self._file.write(_BLOCK_HEADER.pack(self._first_ns, self._last_ns, self._count, len(compressed),
+                                            len(self._buffer)))
+        self._file.write(compressed)
+        self._buffer.clear()
+        self._count = 0
+
+
+def read_recording(
+    filename: str, start_ns: Optional[int] = None, end_ns: Optional[int] = None
+) -> Iterator[RecordedFrame]:
+    """Read the frames of a recording in recorded order
+
+    :param filename: file written by StreamRecorder
+    :param start_ns: Optional first timestamp to read
+    :param end_ns: Optional last timestamp to read
+    """
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{filename} is not a stream recording")
+        while True:
+            header = f.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size:
+                return
+            first_ns, last_ns, count, compressed_size, _ = _BLOCK_HEADER.unpack(header)
+            if (start_ns is not None and last_ns < start_ns) or (end_ns is not None and first_ns > end_ns):
+                f.seek(compressed_size, os.SEEK_CUR)
+                continue
+            compressed = f.read(compressed_size)
+            if len(compressed) < compressed_size:
+                # block cut short by a crash
+                return
+            block = zlib.decompress(compressed)
+            offset = 0
+            for _ in range(count):
+                timestamp_ns, binary, path_size, frame_size = _FRAME_HEADER.unpack_from(block, offset)
+                offset += _FRAME_HEADER.size
+                path = block[offset:offset + path_size].decode()
+                offset += path_size
+                frame = block[offset:offset + frame_size]
+                offset += frame_size
+                if (start_ns is None or timestamp_ns >= start_ns) and (end_ns is None or timestamp_ns <= end_ns):
+                    yield RecordedFrame(timestamp_ns, path, frame if binary else frame.decode())
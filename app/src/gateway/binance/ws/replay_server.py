@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Union
+from urllib.parse import parse_qs, urlsplit
+
+import websockets as ws
+
+try:
+    from websockets.exceptions import ConnectionClosed  # type: ignore
+except ImportError:
+    from websockets import ConnectionClosed  # type: ignore
+
+from .recording import read_recording
+
+_COMBINED_PREFIX = '{"stream":"'
+_COMBINED_DATA = '","data":'
+
+
+class _ReplayFrame(NamedTuple):
+    timestamp_ns: int
+    # stream name of a text frame, socket path of a binary one
+    key: str
+    data: Union[str, bytes]
+
+
+def _stream_key(path: str) -> str:
+    # ws/btcusdt@depth?timeUnit=MICROSECOND -> btcusdt@depth
+    return path.split("?", 1)[0].rsplit("/", 1)[-1]
+
+
+class ReplayServer:
+    """Local websocket server replaying StreamRecorder recordings
+
+    Each connection gets the frames of its streams from the start of the recordings, paced as
+    recorded and sped up by speed, or as fast as the client reads them with speed None. The
+    streams are taken from the url path as on Binance: one raw stream on ws/<stream>, combined
+    streams on stream?streams=<a>/<b>, plus the streams of SUBSCRIBE requests, so frames recorded
+    on a raw socket are replayed on a combined one and the other way round. A stream subscribed
+    during the replay gets its frames from the current position on.
+
+    Usage:
+        async with ReplayServer("btcusdt.rec", speed=10) as server:
+            bm = BinanceSocketManager(client)
+            server.route(bm)
+            async with bm.depth_socket("BTCUSDT") as socket:
+                msg = await socket.recv()
+    """
+
+    def __init__(
+        self,
+        recordings: Union[str, Sequence[str]],
+        speed: Optional[float] = 1.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        start_ns: Optional[int] = None,
+        end_ns: Optional[int] = None,
+        close_at_end: bool = False,
+    ):
+        """Initialise the ReplayServer
+
+        :param recordings: file or files written by StreamRecorder
+        :param speed: replay speed, 1 as recorded, None or 0 as fast as possible
+        :param host: host to listen on
+        :param port: port to listen on, 0 for a free port
+        :param start_ns: Optional timestamp of the first frame to replay
+        :param end_ns: Optional timestamp of the last frame to replay
+        :param close_at_end: close the connections once their frames are replayed, by default
+            they stay open and idle, as a quiet stream
+        """
+        if isinstance(recordings, str):
+            recordings = [recordings]
+        self._frames = self._load(recordings, start_ns, end_ns)
+        self._speed = speed or None
+        self._host = host
+        self._port = port
+        self._close_at_end = close_at_end
+        self._server = None
+        self._log = logging.getLogger(__name__)
+        self.connections = 0
+        self.frames_sent = 0
+
+    @property
+    def url(self) -> str:
+        """Url of the server, in place of the STREAM_URL of the socket managers"""
+        return f"ws://{self._host}:{self._port}/"
+
+    @property
+    def frame_count(self) -> int:
+        return len(self._frames)
+
+    def route(self, socket_manager):
+        """Point the spot, futures and options streams of a BinanceSocketManager at the server"""
+        for attr in ("STREAM_URL", "STREAM_TESTNET_URL", "FSTREAM_URL", "FSTREAM_TESTNET_URL",
+                     "DSTREAM_URL", "DSTREAM_TESTNET_URL", "OPTIONS_URL"):
+            setattr(socket_manager, attr, self.url)
+
+    async def start(self):
+        self._server = await ws.serve(self._handle_connection, self._host, self._port)
+        self._port = self._server.sockets[0].getsockname()[1]
+        self._log.debug(f"Replaying {len(self._frames)} frames on {self.url}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @staticmethod
+    def _load(recordings: Sequence[str], start_ns: Optional[int], end_ns: Optional[int]) -> List[_ReplayFrame]:
+        frames = []
+        for filename in recordings:
+            for timestamp_ns, path, frame in read_recording(filename, start_ns, end_ns):
+                if not isinstance(frame, str):
+                    frames.append(_ReplayFrame(timestamp_ns, path, frame))
+                elif frame.startswith(_COMBINED_PREFIX):
+                    # unwrap {"stream":"<stream>","data":<event>}
+                    end = frame.find(_COMBINED_DATA, len(_COMBINED_PREFIX))
+                    if end < 0:
+                        continue
+                    stream = frame[len(_COMBINED_PREFIX):end]
+                    frames.append(_ReplayFrame(timestamp_ns, stream, frame[end + len(_COMBINED_DATA):-1]))
+                elif path.startswith("ws/"):
+                    frames.append(_ReplayFrame(timestamp_ns, _stream_key(path), frame))
+                # other text frames are replies to requests, answered by the server itself
+        frames.sort(key=lambda frame: frame.timestamp_ns)
+        return frames
+
+    async def _handle_connection(self, websocket):
+        self.connections += 1
+        url = urlsplit(websocket.request.path)
+        combined = url.path.rstrip("/").endswith("/stream")
+        streams: Set[str] = set()
+        if combined:
+            for names in parse_qs(url.query).get("streams", []):
+                streams.update(name for name in names.split("/") if name)
+        else:
+            streams.add(_stream_key(url.path))
+        # binary frames are replayed on the path they were recorded on
+        streams.add(websocket.request.path.lstrip("/"))
+
+        requests = asyncio.create_task(self._handle_requests(websocket, streams))
+        try:
+            await self._replay(websocket, streams, combined)
+            if self._close_at_end:
+                await websocket.close()
+            else:
+                await websocket.wait_closed()
+        except ConnectionClosed:
+            pass
+        finally:
+            requests.cancel()
+
+    async def _handle_requests(self, websocket, streams: Set[str]):
+        try:
+            async for message in websocket:
+                try:
+                    request = json.loads(message)
+                    method, params = request["method"], request.get("params", [])
+                except (ValueError, TypeError, KeyError):
+                    await websocket.send('{"error":{"code":2,"msg":"Invalid request"}}')
+                    continue
+                result = None
+                if method == "SUBSCRIBE":
+                    streams.update(params)
+                elif method == "UNSUBSCRIBE":
+                    streams.difference_update(params)
+                elif method == "LIST_SUBSCRIPTIONS":
+                    result = sorted(stream for stream in streams if "/" not in stream)
+                reply: Dict = {"result": result, "id": request.get("id")}
+                await websocket.send(json.dumps(reply))
+        except ConnectionClosed:
+            pass
+
+    async def _replay(self, websocket, streams: Set[str], combined: bool):
+        if not self._frames:
+            return
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first_ns = self._frames[0].timestamp_ns
+        for sent, (timestamp_ns, key, data) in enumerate(self._frames):
+            if key not in streams:
+                continue
+            if self._speed:
+                delay = (timestamp_ns - first_ns) / 1e9 / self._speed - (loop.time() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif sent % 100 == 0:
+                # let the subscription requests through at full speed
+                await asyncio.sleep(0)
+            if combined and isinstance(data, str):
+                data = f"{_COMBINED_PREFIX}{key}{_COMBINED_DATA}{data}}}"
+            await websocket.send(data)
+            self.frames_sent += 1
@@ -0,0 +1,385 @@
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from ..exceptions import BinanceWebsocketSubscriptionError
+from ..ws.reconnecting_websocket import ReconnectingWebsocket
+
+# errors after which the read loop of a ReconnectingWebsocket keeps running
+RECOVERABLE_ERRORS = (
+    "IncompleteReadError",
+    "gaierror",
+    "ConnectionClosedError",
+    "BinanceWebsocketClosed",
+)
+
+
+class CombinedStreamWebsocket(ReconnectingWebsocket):
+    """Combined stream connection whose streams can be changed while it is open.
+
+    The streams are part of the url, rebuilt on every (re)connection so a reconnected socket
+    resumes every stream subscribed so far, and are changed at runtime with SUBSCRIBE and
+    UNSUBSCRIBE requests. The replies to these requests are consumed here and never queued.
+    """
+
+    # one connection carries the messages of many streams
+    MAX_QUEUE_SIZE = 1000
+
+    def __init__(
+        self,
+        url: str,
+        streams: Iterable[str] = (),
+        max_requests_per_second: float = 5,
+        time_unit: Optional[str] = None,
+        **kwargs,
+    ):
+        super().__init__(url=url, path=None, prefix="stream?", **kwargs)
+        # dict keys keep the subscription order in the url
+        self.streams: Dict[str, None] = dict.fromkeys(streams)
+        self._time_unit = time_unit
+        self._request_interval = 1 / max_requests_per_second
+        self._request_lock = asyncio.Lock()
+        self._last_request = 0.0
+        self._request_id = 0
+        self._pending: Dict[int, asyncio.Future] = {}
+
+    async def _before_connect(self):
+        self._path = f"streams={'/'.join(self.streams)}"
+        if self._time_unit:
+            self._path = f"{self._path}&timeUnit={self._time_unit}"
+
+    def _handle_message(self, evt):
+        msg = super()._handle_message(evt)
+        if isinstance(msg, dict) and "id" in msg and ("result" in msg or "error" in msg):
+            future = self._pending.pop(msg["id"], None)
+            if future is not None and not future.done():
+                if msg.get("error"):
+                    future.set_exception(BinanceWebsocketSubscriptionError(msg["error"]))
+                else:
+                    future.set_result(msg.get("result"))
+            return None
+        return msg
+
+    async def subscribe(self, streams: List[str]):
+        """Add streams to the connection
+
+        :param streams: stream names, e.g. btcusdt@kline_1m
+        """
+        self.streams.update(dict.fromkeys(streams))
+        await self._request("SUBSCRIBE", streams)
+
+    async def unsubscribe(self, streams: List[str]):
+        """Remove streams from the connection
+
+        :param streams: stream names, e.g. btcusdt@kline_1m
+        """
+        for stream in streams:
+            self.streams.pop(stream, None)
+        await self._request("UNSUBSCRIBE", streams)
+
+    async def _request(self, method: str, params: List[str]):
+        if not self.ws:
+            # reconnecting: the new url already holds the current streams
+            return
+        async with self._request_lock:
+            # stay within the incoming message limit of a connection
+            wait = self._last_request + self._request_interval - self._loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._request_id += 1
+            request_id = self._request_id
+            future = self._pending[request_id] = self._loop.create_future()
+            try:
+                await self.ws.send(self.json_dumps({"method": method, "params": params, "id": request_id}))
+            except Exception as e:
+                # the connection is dropping, the reconnection url holds the current streams
+                self._pending.pop(request_id, None)
+                self._log.debug(f"{method} {params} not sent: {e}")
+                return
+            finally:
+                self._last_request = self._loop.time()
+        try:
+            await asyncio.wait_for(future, timeout=self.TIMEOUT)
+        except asyncio.TimeoutError:
+            self._log.warning(f"No reply to {method} {params} in {self.TIMEOUT} seconds")
+        finally:
+            self._pending.pop(request_id, None)
+
+
+class StreamSubscription:
+    """Streams of a BinanceStreamMultiplexer consumer
+
+    Messages are passed to the callback if one was given, otherwise queued for recv().
+    Combined stream events are wrapped as follows: {"stream":"<streamName>","data":<rawPayload>}
+    Connection errors are delivered as {"e": "error", "type": ..., "m": ...} like ReconnectingWebsocket.
+    """
+
+    def __init__(self, multiplexer: "BinanceStreamMultiplexer", callback: Optional[Callable] = None):
+        self.streams: Set[str] = set()
+        self._multiplexer = multiplexer
+        self._callback = callback
+        self._queue: Optional[asyncio.Queue] = asyncio.Queue() if callback is None else None
+
+    async def recv(self):
+        """Wait for the next message of the subscribed streams"""
+        if self._queue is None:
+            raise RuntimeError("Messages of a subscription with a callback are not queued")
+        return await self._queue.get()
+
+    async def recv_many(self, max_messages: Optional[int] = None) -> list:
+        """Wait for a message, then return it with every other message already queued"""
+        messages = [await self.recv()]
+        while not self._queue.empty() and (max_messages is None or len(messages) < max_messages):
+            messages.append(self._queue.get_nowait())
+        return messages
+
+    async def subscribe(self, streams: List[str]):
+        """Add streams to the subscription"""
+        await self._multiplexer.subscribe(streams, subscription=self)
+
+    async def unsubscribe(self, streams: Optional[List[str]] = None):
+        """Remove streams from the subscription, all of them by default"""
+        await self._multiplexer.unsubscribe(self, streams)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.unsubscribe()
+
+    async def _deliver(self, msg):
+        if self._callback is None:
+            self._queue.put_nowait(msg)
+        elif asyncio.iscoroutinefunction(self._callback):
+            await self._callback(msg)
+        else:
+            self._callback(msg)
+
+
+class BinanceStreamMultiplexer:
+    """Packs many streams onto few combined stream connections
+
+    Streams are added and removed at runtime with the SUBSCRIBE and UNSUBSCRIBE methods of the
+    combined stream endpoint: a new connection is only opened once every open connection carries
+    MAX_STREAMS_PER_CONNECTION streams, and a connection left without streams is closed. A stream
+    wanted by several subscriptions is subscribed once and routed to each of them.
+
+    Usage:
+        async with bm.futures_stream_multiplexer() as mux:
+            sub = await mux.subscribe(["btcusdt@kline_1m", "ethusdt@kline_1m"])
+            msg = await sub.recv()
+            await mux.subscribe(["solusdt@kline_1m"], callback=process_message)
+    """
+
+    # Binance accepts 1024 streams per spot connection and 200 per futures connection
+    MAX_STREAMS_PER_CONNECTION = 200
+    # Binance accepts 5 incoming messages per second on a spot connection and 10 on a futures one
+    MAX_REQUESTS_PER_SECOND = 5
+
+    def __init__(
+        self,
+        url: str,
+        max_streams_per_connection: Optional[int] = None,
+        max_requests_per_second: Optional[float] = None,
+        time_unit: Optional[str] = None,
+        **ws_kwargs,
+    ):
+        """Initialise the BinanceStreamMultiplexer
+
+        :param url: base url of the combined stream endpoint, e.g. wss://fstream.binance.com/
+        :param max_streams_per_connection: streams per connection, default MAX_STREAMS_PER_CONNECTION
+        :param max_requests_per_second: SUBSCRIBE/UNSUBSCRIBE requests per second and connection
+        :param time_unit: optional timeUnit of the spot streams
+        :param ws_kwargs: arguments of ReconnectingWebsocket, e.g. https_proxy
+        """
+        self._log = logging.getLogger(__name__)
+        self._url = url
+        self._max_streams = max_streams_per_connection or self.MAX_STREAMS_PER_CONNECTION
+        self._max_requests = max_requests_per_second or self.MAX_REQUESTS_PER_SECOND
+        self._time_unit = time_unit
+        self._ws_kwargs = ws_kwargs
+        self._lock = asyncio.Lock()
+        self._connections: List[CombinedStreamWebsocket] = []
+        self._routers: Dict[CombinedStreamWebsocket, asyncio.Task] = {}
+        self._subscribers: Dict[str, List[StreamSubscription]] = {}
+        self._retries: Set[asyncio.Task] = set()
+        self._closed = False
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    @property
+    def streams(self) -> List[str]:
+        return list(self._subscribers)
+
+    async def subscribe(
+        self,
+        streams: List[str],
+        callback: Optional[Callable] = None,
+        subscription: Optional[StreamSubscription] = None,
+    ) -> StreamSubscription:
+        """Subscribe to streams
+
+        :param streams: stream names, e.g. btcusdt@kline_1m, btcusdt@depth@100ms
+        :param callback: sync or async function called with every message, otherwise messages
+            are queued for StreamSubscription.recv()
+        :param subscription: existing subscription to add the streams to
+
+        :returns: the StreamSubscription receiving the messages of the streams
+        """
+        if self._closed:
+            raise RuntimeError("Stream multiplexer is closed")
+        if subscription is None:
+            subscription = StreamSubscription(self, callback)
+        async with self._lock:
+            new_streams = []
+            for stream in dict.fromkeys(streams):
+                if stream in subscription.streams:
+                    continue
+                subscription.streams.add(stream)
+                subscribers = self._subscribers.setdefault(stream, [])
+                if not subscribers:
+                    new_streams.append(stream)
+                subscribers.append(subscription)
+            await self._add_streams(new_streams)
+        return subscription
+
+    async def unsubscribe(self, subscription: StreamSubscription, streams: Optional[List[str]] = None):
+        """Remove streams from a subscription
+
+        Streams no other subscription wants are unsubscribed from their connection.
+
+        :param subscription: subscription returned by subscribe()
+        :param streams: streams to remove, all the streams of the subscription by default
+        """
+        async with self._lock:
+            removed = []
+            for stream in list(subscription.streams if streams is None else dict.fromkeys(streams)):
+                if stream not in subscription.streams:
+                    continue
+                subscription.streams.discard(stream)
+                subscribers = self._subscribers[stream]
+                subscribers.remove(subscription)
+                if not subscribers:
+                    del self._subscribers[stream]
+                    removed.append(stream)
+            await self._remove_streams(removed)
+
+    async def close(self):
+        """Close every connection"""
+        self._closed = True
+        for task in list(self._retries):
+            task.cancel()
+        async with self._lock:
+            for connection in list(self._connections):
+                await self._close_connection(connection)
+            self._subscribers.clear()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _add_streams(self, streams: List[str]):
+        # fill the open connections first
+        for connection in self._connections:
+            if not streams:
+                return
+            free = self._max_streams - len(connection.streams)
+            if free > 0:
+                await connection.subscribe(streams[:free])
+                streams = streams[free:]
+        for start in range(0, len(streams), self._max_streams):
+            await self._open_connection(streams[start:start + self._max_streams])
+
+    async def _remove_streams(self, streams: List[str]):
+        removed = set(streams)
+        for connection in list(self._connections):
+            owned = [stream for stream in connection.streams if stream in removed]
+            if not owned:
+                continue
+            if len(owned) == len(connection.streams):
+                await self._close_connection(connection)
+            else:
+                await connection.unsubscribe(owned)
+
+    def _create_connection(self, streams: List[str]) -> CombinedStreamWebsocket:
+        return CombinedStreamWebsocket(
+            url=self._url,
+            streams=streams,
+            max_requests_per_second=self._max_requests,
+            time_unit=self._time_unit,
+            **self._ws_kwargs,
+        )
+
+    async def _open_connection(self, streams: List[str], attempts: int = 0):
+        connection = self._create_connection(streams)
+        try:
+            await connection.connect()
+        except Exception as e:
+            # keep the streams subscribed and retry in the background, like a reconnecting socket
+            wait = connection._get_reconnect_wait(attempts)
+            self._log.error(f"Failed to open combined stream connection ({e}), retrying in {wait}s")
+            self._retries.add(asyncio.create_task(self._reopen(streams, wait, attempts + 1)))
+            return
+        self._connections.append(connection)
+        router = self._routers[connection] = asyncio.create_task(self._route(connection))
+        router.add_done_callback(lambda task: self._on_router_done(connection, task))
+        self._log.debug(f"Opened combined stream connection {len(self._connections)} with {len(streams)} streams")
+
+    async def _reopen(self, streams: List[str], wait: float, attempts: int):
+        try:
+            await asyncio.sleep(wait)
+            async with self._lock:
+                # streams unsubscribed meanwhile are dropped
+                streams = [stream for stream in streams if stream in self._subscribers]
+                if streams and not self._closed:
+                    await self._open_connection(streams, attempts)
+        finally:
+            self._retries.discard(asyncio.current_task())
+
+    async def _close_connection(self, connection: CombinedStreamWebsocket):
+        self._connections.remove(connection)
+        router = self._routers.pop(connection, None)
+        if router is not None and router is not asyncio.current_task():
+            router.cancel()
+        await connection.close()
+
+    async def _route(self, connection: CombinedStreamWebsocket):
+        while True:
+            msg = await connection.recv()
+            stream = msg.get("stream")
+            if stream is not None:
+                for subscription in list(self._subscribers.get(stream, ())):
+                    await self._deliver(subscription, msg)
+                continue
+            if msg.get("e") == "error":
+                subscriptions = {id(s): s for stream in connection.streams for s in self._subscribers.get(stream, ())}
+                for subscription in subscriptions.values():
+                    await self._deliver(subscription, msg)
+                if msg.get("type") not in RECOVERABLE_ERRORS:
+                    # the read loop of the connection stopped, move its streams to a new connection
+                    self._retries.add(asyncio.create_task(self._replace_connection(connection)))
+                    return
+
+    async def _deliver(self, subscription: StreamSubscription, msg):
+        # a failing callback must not stop the delivery of the other messages of the connection
+        try:
+            await subscription._deliver(msg)
+        except Exception as e:
+            self._log.error(f"Error in stream callback of {msg.get('stream')}: {e}")
+
+    def _on_router_done(self, connection: CombinedStreamWebsocket, router: asyncio.Task):
+        if router.cancelled() or router.exception() is None:
+            return
+        self._log.error(f"Combined stream connection router failed ({router.exception()}), replacing the connection")
+        if not self._closed and self._routers.get(connection) is router:
+            self._retries.add(asyncio.create_task(self._replace_connection(connection)))
+
+    async def _replace_connection(self, connection: CombinedStreamWebsocket):
+        async with self._lock:
+            if connection in self._connections:
+                await self._close_connection(connection)
+        await self._reopen(list(connection.streams), connection._get_reconnect_wait(0), 1)
@@ -6,6 +6,7 @@ from typing import Optional, List, Dict, Callable, Any
 from ..ws.constants import KEEPALIVE_TIMEOUT
 from ..ws.keepalive_websocket import KeepAliveWebsocket
 from ..ws.reconnecting_websocket import ReconnectingWebsocket
+from ..ws.stream_multiplexer import BinanceStreamMultiplexer
 from ..ws.threaded_stream import ThreadedApiManager
 
 
@@ -886,6 +887,52 @@ class BinanceSocketManager:
             path, prefix="stream?", futures_type=futures_type
         )
 
+    def stream_multiplexer(self, max_streams_per_connection: int = 1024):
+        """Start a multiplexer packing spot streams onto few combined stream connections.
+
+        Streams are added and removed at runtime with SUBSCRIBE/UNSUBSCRIBE, see BinanceStreamMultiplexer.
+
+        https://developers.binance.com/docs/binance-spot-api-docs/web-socket-streams
+
+        :param max_streams_per_connection: streams per connection, at most 1024
+
+        :returns: BinanceStreamMultiplexer
+        """
+        return BinanceStreamMultiplexer(
+            url=self._get_stream_url(),
+            max_streams_per_connection=max_streams_per_connection,
+            max_requests_per_second=5,
+            time_unit=getattr(self._client, "TIME_UNIT", None),
+            https_proxy=self._client.https_proxy,
+            **self.ws_kwargs,
+        )
+
+    def futures_stream_multiplexer(
+        self, futures_type: FuturesType = FuturesType.USD_M, max_streams_per_connection: int = 200
+    ):
+        """Start a multiplexer packing futures streams onto few combined stream connections.
+
+        Streams are added and removed at runtime with SUBSCRIBE/UNSUBSCRIBE, see BinanceStreamMultiplexer.
+
+        https://developers.binance.com/docs/derivatives/usds-margined-futures/websocket-market-streams
+
+        :param futures_type: use USD-M or COIN-M futures default USD-M
+        :param max_streams_per_connection: streams per connection, at most 200
+
+        :returns: BinanceStreamMultiplexer
+        """
+        if futures_type == FuturesType.USD_M:
+            stream_url = self.FSTREAM_TESTNET_URL if self.testnet else self.FSTREAM_URL
+        else:
+            stream_url = self.DSTREAM_TESTNET_URL if self.testnet else self.DSTREAM_URL
+        return BinanceStreamMultiplexer(
+            url=stream_url,
+            max_streams_per_connection=max_streams_per_connection,
+            max_requests_per_second=10,
+            https_proxy=self._client.https_proxy,
+            **self.ws_kwargs,
+        )
+
     def user_socket(self):
         """Start a websocket for user data
 
@@ -1202,7 +1249,13 @@ class ThreadedWebsocketManager(ThreadedApiManager):
         session_params: Optional[Dict[str, Any]] = None,
         https_proxy: Optional[str] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
+        **dispatch_params,
     ):
+        """Initialise the ThreadedWebsocketManager
+
+        :param dispatch_params: dispatch_mode, dispatch_workers, batch_size and max_pending, see
+            ThreadedApiManager
+        """
         super().__init__(
             api_key,
             api_secret,
@@ -1212,6 +1265,7 @@ class ThreadedWebsocketManager(ThreadedApiManager):
             session_params,
             https_proxy,
             loop,
+            **dispatch_params,
         )
         self._bsm: Optional[BinanceSocketManager] = None
 
@@ -1,12 +1,93 @@
 import asyncio
 import threading
-from typing import Optional, Dict, Any
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable, Union
 
 from ..async_client import AsyncClient
 from src.utils.logger import setup_logger
 from ..helpers import get_loop
+from ..ws.constants import DispatchMode
 
 logger = setup_logger()
+
+
+class StreamMetrics:
+    """Delivery counters of one stream of a ThreadedApiManager"""
+
+    __slots__ = ("received", "delivered", "dropped", "callbacks", "last_lag", "max_lag")
+
+    def __init__(self):
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.callbacks = 0
+        # seconds between the receipt of a message and the start of its callback
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @property
+    def pending(self) -> int:
+        return self.received - self.delivered - self.dropped
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__ + ("pending",)}
+
+
+class _StreamDispatcher:
+    """Runs the callback of one stream on a thread pool, one call at a time so messages stay in order"""
+
+    def __init__(self, callback: Callable, executor: ThreadPoolExecutor, loop: asyncio.AbstractEventLoop,
+                 metrics: StreamMetrics, batch_size: Optional[int], max_pending: int):
+        self._callback = callback
+        self._executor = executor
+        self._loop = loop
+        self._metrics = metrics
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+        self._pending: deque = deque()
+        self._lock = threading.Lock()
+        self._running = False
+
+    def submit(self, msg, received: float):
+        with self._lock:
+            if len(self._pending) >= self._max_pending:
+                # the callback is behind: drop the oldest message rather than stall the socket
+                self._pending.popleft()
+                self._metrics.dropped += 1
+            self._pending.append((received, msg))
+            if self._running:
+                return
+            self._running = True
+        self._executor.submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                count = 1 if self._batch_size is None else min(self._batch_size, len(self._pending))
+                items = [self._pending.popleft() for _ in range(count)]
+            lag = time.monotonic() - items[0][0]
+            self._metrics.last_lag = lag
+            self._metrics.max_lag = max(self._metrics.max_lag, lag)
+            msgs = [msg for _, msg in items]
+            try:
+                self._call(msgs if self._batch_size is not None else msgs[0])
+            except Exception as e:
+                logger.error(f"Error in stream callback: {e}")
+            self._metrics.delivered += count
+            self._metrics.callbacks += 1
+
+    def _call(self, arg):
+        if asyncio.iscoroutinefunction(self._callback):
+            asyncio.run_coroutine_threadsafe(self._callback(arg), self._loop).result()
+        else:
+            self._callback(arg)
+
+
 class ThreadedApiManager(threading.Thread):
     def __init__(
         self,
@@ -18,13 +99,33 @@ class ThreadedApiManager(threading.Thread):
         session_params: Optional[Dict[str, Any]] = None,
         https_proxy: Optional[str] = None,
         _loop: Optional[asyncio.AbstractEventLoop] = None,
+        dispatch_mode: Union[str, DispatchMode] = DispatchMode.INLINE,
+        dispatch_workers: int = 4,
+        batch_size: int = 100,
+        max_pending: int = 1000,
     ):
-        """Initialise the BinanceSocketManager"""
+        """Initialise the BinanceSocketManager
+
+        :param dispatch_mode: how messages are handed to the callbacks: INLINE on the event loop
+            thread, THREAD_POOL or BATCH (lists of messages) on a thread pool, in order per stream
+        :param dispatch_workers: threads of the pool of the THREAD_POOL and BATCH modes
+        :param batch_size: maximum number of messages per callback in BATCH mode
+        :param max_pending: messages waiting for the callback of a stream before the oldest
+            are dropped, in THREAD_POOL and BATCH modes
+        """
         super().__init__()
         self._loop: asyncio.AbstractEventLoop = get_loop() if _loop is None else _loop
         self._client: Optional[AsyncClient] = None
         self._running: bool = True
         self._socket_running: Dict[str, bool] = {}
+        self._listeners: Dict[str, asyncio.Task] = {}
+        self._stream_metrics: Dict[str, StreamMetrics] = {}
+        self._dispatch_mode = DispatchMode(dispatch_mode)
+        self._batch_size = batch_size
+        self._max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if self._dispatch_mode != DispatchMode.INLINE:
+            self._executor = ThreadPoolExecutor(max_workers=dispatch_workers, thread_name_prefix="binance-dispatch")
         self._client_params = {
             "api_key": api_key,
             "api_secret": api_secret,
@@ -46,21 +147,52 @@ class ThreadedApiManager(threading.Thread):
             await asyncio.sleep(0.2)
 
     async def start_listener(self, socket, path: str, callback):
-        async with socket as s:
-            while self._socket_running[path]:
-                try:
-                    msg = await asyncio.wait_for(s.recv(), 3)
-                except asyncio.TimeoutError:
-                    ...
-                    continue
-                else:
+        metrics = self._stream_metrics[path] = StreamMetrics()
+        if self._dispatch_mode == DispatchMode.INLINE:
+            dispatcher = None
+        else:
+            dispatcher = _StreamDispatcher(
+                callback, self._executor, self._loop, metrics,
+                self._batch_size if self._dispatch_mode == DispatchMode.BATCH else None, self._max_pending,
+            )
+        # stop_socket cancels the listener, no need to poll the running flag
+        self._listeners[path] = asyncio.current_task()
+        try:
+            if not self._socket_running.get(path):
+                return
+            async with socket as s:
+                while self._socket_running[path]:
+                    msg = await s.recv()
                     if not msg:
-                        continue  # Handle both async and sync callbacks
+                        continue
+                    metrics.received += 1
+                    if dispatcher is not None:
+                        dispatcher.submit(self._dispatch_message(msg), time.monotonic())
+                        continue
+                    # Handle both async and sync callbacks
+                    metrics.callbacks += 1
                     if asyncio.iscoroutinefunction(callback):
                         await callback(msg)
                     else:
                         callback(msg)
-        del self._socket_running[path]
+                    metrics.delivered += 1
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._listeners.pop(path, None)
+            self._socket_running.pop(path, None)
+
+    def _dispatch_message(self, msg):
+        """Get the message handed to a pool thread, e.g. a copy of a mutable one"""
+        return msg
+
+    def get_stream_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Get the delivery counters of every stream
+
+        :returns: stream path -> received, delivered, dropped and pending messages, callbacks run,
+            and the last and maximum seconds between the receipt of a message and its callback
+        """
+        return {path: metrics.as_dict() for path, metrics in list(self._stream_metrics.items())}
 
     def run(self):
         self._loop.run_until_complete(self.socket_listener())
@@ -68,6 +200,9 @@ class ThreadedApiManager(threading.Thread):
     def stop_socket(self, socket_name):
         if socket_name in self._socket_running:
             self._socket_running[socket_name] = False
+            listener = self._listeners.get(socket_name)
+            if listener is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(listener.cancel)
 
     async def stop_client(self):
         if not self._client:
@@ -87,5 +222,7 @@ class ThreadedApiManager(threading.Thread):
             except Exception as e:
                 # Log the error but don't raise it
                 logger.debug(f"Error stopping client: {e}")
-        for socket_name in self._socket_running.keys():
-            self._socket_running[socket_name] = False
+        for socket_name in list(self._socket_running.keys()):
+            self.stop_socket(socket_name)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -4,15 +4,14 @@ Data Fetching Module
 This module handles the first step in the workflow: fetching data from the data provider.
 """
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any
 from src.utils.logger import setup_logger
 
-from src.utils import BinanceDataProvider, Interval
+from src.utils import get_data_provider, Interval
 from .base_node import BaseNode, AgentState
 
-# Initialize data provider
-data_provider = BinanceDataProvider()
 logger = setup_logger()
 
 
@@ -22,7 +21,8 @@ class DataNode(BaseNode):
 
     def __call__(self, state: AgentState) -> Dict[str, Any]:
         """
-        Fetch data for all required timeframes using the BinanceDataProvider.
+        Fetch data for all required timeframes using the BinanceDataProvider, or slice it from
+        the preloaded kline feed (backtests) or the websocket-fed live klines when one is provided.
 
         Args:
             state: The current state with symbol information
@@ -35,12 +35,74 @@ class DataNode(BaseNode):
         timeframe: str = self.interval.value
         tickers = data.get('tickers', [])
         end_time = data.get('end_date', datetime.now()) + timedelta(milliseconds=500)
+        kline_feed = data.get('kline_feed')
+        live_klines = data.get('live_klines')
 
         for ticker in tickers:
-            df = data_provider.get_history_klines_with_end_time(symbol=ticker, timeframe=timeframe, end_time=end_time)
-            if df is not None and not df.empty:
-                data[f"{ticker}_{timeframe}"] = df
+            if kline_feed is not None:
+                df = kline_feed.as_of(ticker, timeframe, end_time)
             else:
-                logger.warning(f"No data returned for {ticker} at interval {timeframe}")
+                df = None
+                if live_klines is not None:
+                    df = live_klines.as_of(ticker, timeframe, end_time)
+                    self._store_indicators(data, ticker, live_klines)
+                if df is None:
+                    # not fed or stale live klines are fetched over REST
+                    df = get_data_provider().get_history_klines_with_end_time(symbol=ticker, timeframe=timeframe,
+                                                                              end_time=end_time)
+            self._store(data, ticker, df)
 
         return state
+
+    async def acall(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Async version of __call__, the klines of all tickers are fetched concurrently.
+
+        Args:
+            state: The current state with symbol information
+
+        Returns:
+            Updated state with timeframes data
+        """
+        data = state.get('data', {})
+        data['name'] = "DataNode"
+        timeframe: str = self.interval.value
+        tickers = data.get('tickers', [])
+        end_time = data.get('end_date', datetime.now()) + timedelta(milliseconds=500)
+        kline_feed = data.get('kline_feed')
+        live_klines = data.get('live_klines')
+
+        if kline_feed is not None:
+            frames = [kline_feed.as_of(ticker, timeframe, end_time) for ticker in tickers]
+        else:
+            frames = [None] * len(tickers)
+            if live_klines is not None:
+                frames = [live_klines.as_of(ticker, timeframe, end_time) for ticker in tickers]
+                for ticker in tickers:
+                    self._store_indicators(data, ticker, live_klines)
+            # not fed or stale live klines are fetched over REST
+            missing = [i for i, df in enumerate(frames) if df is None]
+            fetched = await asyncio.gather(*(
+                get_data_provider().aget_history_klines_with_end_time(symbol=tickers[i], timeframe=timeframe,
+                                                                      end_time=end_time)
+                for i in missing
+            ))
+            for i, df in zip(missing, fetched):
+                frames[i] = df
+        for ticker, df in zip(tickers, frames):
+            self._store(data, ticker, df)
+
+        return state
+
+    def _store(self, data: Dict[str, Any], ticker: str, df) -> None:
+        timeframe = self.interval.value
+        if df is not None and not df.empty:
+            data[f"{ticker}_{timeframe}"] = df
+        else:
+            logger.warning(f"No data returned for {ticker} at interval {timeframe}")
+
+    def _store_indicators(self, data: Dict[str, Any], ticker: str, live_klines) -> None:
+        # streaming indicators of the last closed kline, kept up to date by the live feed
+        indicators = live_klines.indicators(ticker, self.interval.value)
+        if indicators is not None:
+            data[f"{ticker}_{self.interval.value}_indicators"] = indicators
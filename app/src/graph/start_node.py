@@ -5,10 +5,6 @@ start node
 from typing import Dict, Any
 
 from .base_node import BaseNode, AgentState
-from src.utils import BinanceDataProvider
-
-# Initialize data provider
-data_provider = BinanceDataProvider()
 
 
 class StartNode(BaseNode):
@@ -1 +1,3 @@
+from .feature_cache import *
 from .general_indicators import *
+from .streaming import *
@@ -0,0 +1,138 @@
+"""
+Feature cache
+
+Memoizes the intermediate series the strategies derive from a kline frame (returns, rolling
+statistics, true range, indicators) so every strategy node of a workflow run computes them once.
+"""
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+__all__ = [
+    "FeatureCache",
+    "FrameFeatures",
+]
+
+
+class FeatureCache:
+    """
+    Features shared by the strategy nodes of one workflow run.
+
+    Entries are keyed by (ticker, interval, last close_time, feature spec): two frames of the
+    same ticker and interval ending on the same candle are the same data, whichever strategy
+    asks for it.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def frame(self, ticker: str, interval: str, prices_df: pd.DataFrame) -> "FrameFeatures":
+        """
+        Get the features of the klines of a ticker and interval.
+
+        Args:
+            ticker: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            prices_df: Klines sorted by open_time
+
+        Returns:
+            FrameFeatures backed by this cache
+        """
+        last_close_time = prices_df["close_time"].iloc[-1] if len(prices_df) else None
+        return FrameFeatures(prices_df, cache=self, key=(ticker, interval, last_close_time))
+
+    def get(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached entry, computing and storing it on a miss.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self._entries[key] = compute()
+            return value
+        self.hits += 1
+        return value
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lookup counters of the cache, to measure how much recomputation it saves.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "entries": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class FrameFeatures:
+    """
+    Lazily computed features of one kline frame.
+
+    Without a FeatureCache the features are only memoized for the lifetime of the instance.
+    All series are indexed like the frame.
+    """
+
+    def __init__(self, prices_df: pd.DataFrame, cache: Optional[FeatureCache] = None, key: Tuple = ()):
+        self.prices_df = prices_df
+        self._cache = cache if cache is not None else FeatureCache()
+        self._key = key
+
+    def get(self, spec: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get the feature described by spec, computing it with compute() on first use.
+
+        Args:
+            spec: Hashable description of the feature, including every parameter it depends on
+            compute: Function computing the feature from the frame
+
+        Returns:
+            The cached feature
+        """
+        return self._cache.get(self._key + (spec,), compute)
+
+    def series(self, name: str) -> pd.Series:
+        """
+        Get a column of the frame or a derived series ("returns", "true_range").
+        """
+        if name == "returns":
+            return self.returns()
+        if name == "true_range":
+            return self.true_range()
+        return self.prices_df[name]
+
+    def returns(self) -> pd.Series:
+        return self.get(("returns",), lambda: self.prices_df["close"].pct_change())
+
+    def true_range(self) -> pd.Series:
+        # general_indicators builds on this module
+        from .general_indicators import calculate_true_range
+        return self.get(("true_range",), lambda: calculate_true_range(self.prices_df))
+
+    def rolling(self, name: str, window: int, stat: str) -> pd.Series:
+        """
+        Rolling statistic of a series.
+
+        Args:
+            name: Column of the frame or derived series, see series()
+            window: Rolling window length
+            stat: Name of the pandas rolling aggregation (e.g., 'mean', 'std', 'sum', 'skew')
+
+        Returns:
+            pd.Series: Statistic per bar
+        """
+        return self.get(("rolling", name, window, stat),
+                        lambda: getattr(self.series(name).rolling(window), stat)())
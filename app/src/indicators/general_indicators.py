@@ -1,143 +1,137 @@
 import numpy as np
 import pandas as pd
 import math
+from typing import Optional
 
+from .feature_cache import FrameFeatures
 
-def calculate_trend_signals(prices_df):
+
+def calculate_trend_signal_history(prices_df: pd.DataFrame, features: Optional[FrameFeatures] = None) -> pd.DataFrame:
     """
-    Advanced trend following strategy using multiple timeframes and indicators
+    Advanced trend following strategy using multiple timeframes and indicators, for every bar
     """
+    features = features or FrameFeatures(prices_df)
+
     # Calculate EMAs for multiple timeframes
-    ema_8 = calculate_ema(prices_df, 8)
-    ema_21 = calculate_ema(prices_df, 21)
-    ema_55 = calculate_ema(prices_df, 55)
+    ema_8 = features.get(("ema", 8), lambda: calculate_ema(prices_df, 8))
+    ema_21 = features.get(("ema", 21), lambda: calculate_ema(prices_df, 21))
+    ema_55 = features.get(("ema", 55), lambda: calculate_ema(prices_df, 55))
 
     # Calculate ADX for trend strength
-    adx = calculate_adx(prices_df, 14)
+    adx = features.get(("adx", 14), lambda: calculate_adx(prices_df, 14))
 
     # Determine trend direction and strength
     short_trend = ema_8 > ema_21
     medium_trend = ema_21 > ema_55
 
     # Combine signals with confidence weighting
-    trend_strength = adx["adx"].iloc[-1] / 100.0
-
-    if short_trend.iloc[-1] and medium_trend.iloc[-1]:
-        signal = "bullish"
-        confidence = trend_strength
-    elif not short_trend.iloc[-1] and not medium_trend.iloc[-1]:
-        signal = "bearish"
-        confidence = trend_strength
-    else:
-        signal = "neutral"
-        confidence = 0.5
-
-    return {
-        "signal": signal,
-        "confidence": confidence,
-        "metrics": {
-            "adx": float(adx["adx"].iloc[-1]),
-            "trend_strength": float(trend_strength),
+    trend_strength = adx["adx"] / 100.0
+
+    bullish = short_trend & medium_trend
+    bearish = ~short_trend & ~medium_trend
+
+    return _signal_frame(
+        prices_df,
+        bullish,
+        bearish,
+        confidence=trend_strength,
+        metrics={
+            "adx": adx["adx"],
+            "trend_strength": trend_strength,
         },
-    }
+    )
 
 
-def calculate_mean_reversion_signals(prices_df):
+def calculate_mean_reversion_signal_history(prices_df: pd.DataFrame,
+                                            features: Optional[FrameFeatures] = None) -> pd.DataFrame:
     """
-    Mean reversion strategy using statistical measures and Bollinger Bands
+    Mean reversion strategy using statistical measures and Bollinger Bands, for every bar
     """
+    features = features or FrameFeatures(prices_df)
+
     # Calculate z-score of price relative to moving average
-    ma_50 = prices_df["close"].rolling(window=50).mean()
-    std_50 = prices_df["close"].rolling(window=50).std()
+    ma_50 = features.rolling("close", 50, "mean")
+    std_50 = features.rolling("close", 50, "std")
     z_score = (prices_df["close"] - ma_50) / std_50
 
     # Calculate Bollinger Bands
-    bb_upper, bb_lower = calculate_bollinger_bands(prices_df)
+    bb_upper, bb_lower = features.get(("bollinger_bands", 20), lambda: calculate_bollinger_bands(prices_df))
 
     # Calculate RSI with multiple timeframes
-    rsi_14 = calculate_rsi(prices_df, 14)
-    rsi_28 = calculate_rsi(prices_df, 28)
+    rsi_14 = features.get(("rsi", 14), lambda: calculate_rsi(prices_df, 14))
+    rsi_28 = features.get(("rsi", 28), lambda: calculate_rsi(prices_df, 28))
 
     # Mean reversion signals
-    price_vs_bb = (prices_df["close"].iloc[-1] - bb_lower.iloc[-1]) / (bb_upper.iloc[-1] - bb_lower.iloc[-1])
+    price_vs_bb = (prices_df["close"] - bb_lower) / (bb_upper - bb_lower)
 
     # Combine signals
-    if z_score.iloc[-1] < -2 and price_vs_bb < 0.2:
-        signal = "bullish"
-        confidence = min(abs(z_score.iloc[-1]) / 4, 1.0)
-    elif z_score.iloc[-1] > 2 and price_vs_bb > 0.8:
-        signal = "bearish"
-        confidence = min(abs(z_score.iloc[-1]) / 4, 1.0)
-    else:
-        signal = "neutral"
-        confidence = 0.5
-
-    return {
-        "signal": signal,
-        "confidence": confidence,
-        "metrics": {
-            "z_score": float(z_score.iloc[-1]),
-            "price_vs_bb": float(price_vs_bb),
-            "rsi_14": float(rsi_14.iloc[-1]),
-            "rsi_28": float(rsi_28.iloc[-1]),
+    bullish = (z_score < -2) & (price_vs_bb < 0.2)
+    bearish = (z_score > 2) & (price_vs_bb > 0.8)
+
+    return _signal_frame(
+        prices_df,
+        bullish,
+        bearish,
+        confidence=np.minimum(z_score.abs() / 4, 1.0),
+        metrics={
+            "z_score": z_score,
+            "price_vs_bb": price_vs_bb,
+            "rsi_14": rsi_14,
+            "rsi_28": rsi_28,
         },
-    }
+    )
 
 
-def calculate_momentum_signals(prices_df):
+def calculate_momentum_signal_history(prices_df: pd.DataFrame, features: Optional[FrameFeatures] = None) -> pd.DataFrame:
     """
-    Multi-factor momentum strategy
+    Multi-factor momentum strategy, for every bar
     """
+    features = features or FrameFeatures(prices_df)
+
     # Price momentum
-    returns = prices_df["close"].pct_change()
-    mom_1m = returns.rolling(21).sum()
-    mom_3m = returns.rolling(63).sum()
-    mom_6m = returns.rolling(126).sum()
+    mom_1m = features.rolling("returns", 21, "sum")
+    mom_3m = features.rolling("returns", 63, "sum")
+    mom_6m = features.rolling("returns", 126, "sum")
 
     # Volume momentum
-    volume_ma = prices_df["volume"].rolling(21).mean()
+    volume_ma = features.rolling("volume", 21, "mean")
     volume_momentum = prices_df["volume"] / volume_ma
 
     # Relative strength
     # (would compare to market/sector in real implementation)
 
     # Calculate momentum score
-    momentum_score = (0.4 * mom_1m + 0.3 * mom_3m + 0.3 * mom_6m).iloc[-1]
+    momentum_score = 0.4 * mom_1m + 0.3 * mom_3m + 0.3 * mom_6m
 
     # Volume confirmation
-    volume_confirmation = volume_momentum.iloc[-1] > 1.0
-
-    if momentum_score > 0.05 and volume_confirmation:
-        signal = "bullish"
-        confidence = min(abs(momentum_score) * 5, 1.0)
-    elif momentum_score < -0.05 and volume_confirmation:
-        signal = "bearish"
-        confidence = min(abs(momentum_score) * 5, 1.0)
-    else:
-        signal = "neutral"
-        confidence = 0.5
-
-    return {
-        "signal": signal,
-        "confidence": confidence,
-        "metrics": {
-            "momentum_1m": float(mom_1m.iloc[-1]),
-            "momentum_3m": float(mom_3m.iloc[-1]),
-            "momentum_6m": float(mom_6m.iloc[-1]),
-            "volume_momentum": float(volume_momentum.iloc[-1]),
+    volume_confirmation = volume_momentum > 1.0
+
+    bullish = (momentum_score > 0.05) & volume_confirmation
+    bearish = (momentum_score < -0.05) & volume_confirmation
+
+    return _signal_frame(
+        prices_df,
+        bullish,
+        bearish,
+        confidence=np.minimum(momentum_score.abs() * 5, 1.0),
+        metrics={
+            "momentum_1m": mom_1m,
+            "momentum_3m": mom_3m,
+            "momentum_6m": mom_6m,
+            "volume_momentum": volume_momentum,
         },
-    }
+    )
 
 
-def calculate_volatility_signals(prices_df):
+def calculate_volatility_signal_history(prices_df: pd.DataFrame,
+                                        features: Optional[FrameFeatures] = None) -> pd.DataFrame:
     """
-    Volatility-based trading strategy
+    Volatility-based trading strategy, for every bar
     """
-    # Calculate various volatility metrics
-    returns = prices_df["close"].pct_change()
+    features = features or FrameFeatures(prices_df)
 
     # Historical volatility
-    hist_vol = returns.rolling(21).std() * math.sqrt(365)
+    hist_vol = features.rolling("returns", 21, "std") * math.sqrt(365)
 
     # Volatility regime detection
     vol_ma = hist_vol.rolling(63).mean()
@@ -147,71 +141,166 @@ def calculate_volatility_signals(prices_df):
     vol_z_score = (hist_vol - vol_ma) / hist_vol.rolling(63).std()
 
     # ATR ratio
-    atr = calculate_atr(prices_df)
+    atr = features.get(("atr", 14), lambda: calculate_atr(prices_df, 14))
     atr_ratio = atr / prices_df["close"]
 
     # Generate signal based on volatility regime
-    current_vol_regime = vol_regime.iloc[-1]
-    vol_z = vol_z_score.iloc[-1]
-
-    if current_vol_regime < 0.8 and vol_z < -1:
-        signal = "bullish"  # Low vol regime, potential for expansion
-        confidence = min(abs(vol_z) / 3, 1.0)
-    elif current_vol_regime > 1.2 and vol_z > 1:
-        signal = "bearish"  # High vol regime, potential for contraction
-        confidence = min(abs(vol_z) / 3, 1.0)
-    else:
-        signal = "neutral"
-        confidence = 0.5
-
-    return {
-        "signal": signal,
-        "confidence": confidence,
-        "metrics": {
-            "historical_volatility": float(hist_vol.iloc[-1]),
-            "volatility_regime": float(current_vol_regime),
-            "volatility_z_score": float(vol_z),
-            "atr_ratio": float(atr_ratio.iloc[-1]),
+    bullish = (vol_regime < 0.8) & (vol_z_score < -1)  # Low vol regime, potential for expansion
+    bearish = (vol_regime > 1.2) & (vol_z_score > 1)  # High vol regime, potential for contraction
+
+    return _signal_frame(
+        prices_df,
+        bullish,
+        bearish,
+        confidence=np.minimum(vol_z_score.abs() / 3, 1.0),
+        metrics={
+            "historical_volatility": hist_vol,
+            "volatility_regime": vol_regime,
+            "volatility_z_score": vol_z_score,
+            "atr_ratio": atr_ratio,
         },
-    }
+    )
 
 
-def calculate_stat_arb_signals(prices_df):
+def calculate_stat_arb_signal_history(prices_df: pd.DataFrame, hurst_window: int = 500,
+                                      features: Optional[FrameFeatures] = None) -> pd.DataFrame:
     """
-    Statistical arbitrage signals based on price action analysis
+    Statistical arbitrage signals based on price action analysis, for every bar
+
+    Args:
+        prices_df: DataFrame with price data
+        hurst_window: Number of prices the Hurst exponent of each bar is computed over
+        features: Shared intermediate series of prices_df, computed on the fly if None
     """
-    # Calculate price distribution statistics
-    returns = prices_df["close"].pct_change()
+    features = features or FrameFeatures(prices_df)
 
     # Skewness and kurtosis
-    skew = returns.rolling(63).skew()
-    kurt = returns.rolling(63).kurt()
+    skew = features.rolling("returns", 63, "skew")
+    kurt = features.rolling("returns", 63, "kurt")
 
     # Test for mean reversion using Hurst exponent
-    hurst = calculate_hurst_exponent(prices_df["close"])
+    hurst = features.get(("hurst", hurst_window),
+                         lambda: calculate_rolling_hurst_exponent(prices_df["close"], hurst_window))
 
     # Correlation analysis
     # (would include correlation with related securities in real implementation)
 
     # Generate signal based on statistical properties
-    if hurst < 0.4 and skew.iloc[-1] > 1:
-        signal = "bullish"
-        confidence = (0.5 - hurst) * 2
-    elif hurst < 0.4 and skew.iloc[-1] < -1:
-        signal = "bearish"
-        confidence = (0.5 - hurst) * 2
-    else:
-        signal = "neutral"
-        confidence = 0.5
+    bullish = (hurst < 0.4) & (skew > 1)
+    bearish = (hurst < 0.4) & (skew < -1)
+
+    return _signal_frame(
+        prices_df,
+        bullish,
+        bearish,
+        confidence=(0.5 - hurst) * 2,
+        metrics={
+            "hurst_exponent": hurst,
+            "skewness": skew,
+            "kurtosis": kurt,
+        },
+    )
+
 
+def calculate_signal_history(prices_df: pd.DataFrame, hurst_window: int = 500,
+                             features: Optional[FrameFeatures] = None) -> dict[str, pd.DataFrame]:
+    """
+    Compute the signal, confidence and metrics of every strategy for every bar in one pass.
+
+    Args:
+        prices_df: DataFrame with OHLCV data
+        hurst_window: Number of prices the Hurst exponent of each bar is computed over
+        features: Shared intermediate series of prices_df, computed on the fly if None
+
+    Returns:
+        Dict of strategy name to DataFrame with "signal", "confidence" and metric columns,
+        indexed like prices_df
+    """
+    # One set of features, so the returns and true range are computed once for all strategies
+    features = features or FrameFeatures(prices_df)
     return {
-        "signal": signal,
-        "confidence": confidence,
-        "metrics": {
-            "hurst_exponent": float(hurst),
-            "skewness": float(skew.iloc[-1]),
-            "kurtosis": float(kurt.iloc[-1]),
+        "trend": calculate_trend_signal_history(prices_df, features),
+        "mean_reversion": calculate_mean_reversion_signal_history(prices_df, features),
+        "momentum": calculate_momentum_signal_history(prices_df, features),
+        "volatility": calculate_volatility_signal_history(prices_df, features),
+        "stat_arb": calculate_stat_arb_signal_history(prices_df, hurst_window, features),
+    }
+
+
+def signals_at(history: dict[str, pd.DataFrame], position: int = -1) -> dict[str, dict]:
+    """
+    Extract the signals of one bar from the output of calculate_signal_history
+
+    Args:
+        history: Signal history per strategy
+        position: Position of the bar, the last one by default
+
+    Returns:
+        Dict of strategy name to {"signal", "confidence", "metrics"}
+    """
+    return {strategy: _signal_at(frame, position) for strategy, frame in history.items()}
+
+
+def calculate_trend_signals(prices_df):
+    """
+    Advanced trend following strategy using multiple timeframes and indicators
+    """
+    return _signal_at(calculate_trend_signal_history(prices_df))
+
+
+def calculate_mean_reversion_signals(prices_df):
+    """
+    Mean reversion strategy using statistical measures and Bollinger Bands
+    """
+    return _signal_at(calculate_mean_reversion_signal_history(prices_df))
+
+
+def calculate_momentum_signals(prices_df):
+    """
+    Multi-factor momentum strategy
+    """
+    return _signal_at(calculate_momentum_signal_history(prices_df))
+
+
+def calculate_volatility_signals(prices_df):
+    """
+    Volatility-based trading strategy
+    """
+    return _signal_at(calculate_volatility_signal_history(prices_df))
+
+
+def calculate_stat_arb_signals(prices_df):
+    """
+    Statistical arbitrage signals based on price action analysis
+    """
+    return _signal_at(calculate_stat_arb_signal_history(prices_df, hurst_window=len(prices_df)))
+
+
+def _signal_frame(prices_df: pd.DataFrame, bullish: pd.Series, bearish: pd.Series,
+                  confidence: pd.Series, metrics: dict[str, pd.Series]) -> pd.DataFrame:
+    """
+    Assemble the per-bar signal frame of a strategy, neutral bars get a 0.5 confidence
+    """
+    signal = np.select([bullish.to_numpy(), bearish.to_numpy()], ["bullish", "bearish"], "neutral")
+    return pd.DataFrame(
+        {
+            "signal": signal,
+            "confidence": np.where(signal == "neutral", 0.5, confidence),
+            **metrics,
         },
+        index=prices_df.index,
+    )
+
+
+def _signal_at(frame: pd.DataFrame, position: int = -1) -> dict:
+    """
+    Convert one bar of a per-bar signal frame to a signal dict
+    """
+    row = frame.iloc[position]
+    return {
+        "signal": row["signal"],
+        "confidence": float(row["confidence"]),
+        "metrics": {name: float(row[name]) for name in frame.columns[2:]},
     }
 
 
@@ -300,6 +389,8 @@ def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     """
     Calculate Average Directional Index (ADX)
 
+    Works on NumPy arrays and never modifies df.
+
     Args:
         df: DataFrame with OHLC data
         period: Period for calculations
@@ -307,32 +398,60 @@ def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
     Returns:
         DataFrame with ADX values
     """
-    # Calculate True Range
-    df["high_low"] = df["high"] - df["low"]
-    df["high_close"] = abs(df["high"] - df["close"].shift())
-    df["low_close"] = abs(df["low"] - df["close"].shift())
-    df["tr"] = df[["high_low", "high_close", "low_close"]].max(axis=1)
-
-    # Calculate Directional Movement
-    df["up_move"] = df["high"] - df["high"].shift()
-    df["down_move"] = df["low"].shift() - df["low"]
-
-    df["plus_dm"] = np.where((df["up_move"] > df["down_move"]) & (df["up_move"] > 0), df["up_move"], 0)
-    df["minus_dm"] = np.where((df["down_move"] > df["up_move"]) & (df["down_move"] > 0), df["down_move"], 0)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+    close = df["close"].to_numpy(dtype=float)
+    true_range = _true_range(high, low, close)
+
+    # Calculate Directional Movement, the first candle has none
+    up_move = np.empty_like(high)
+    down_move = np.empty_like(low)
+    up_move[0] = down_move[0] = 0.0
+    np.subtract(high[1:], high[:-1], out=up_move[1:])
+    np.subtract(low[:-1], low[1:], out=down_move[1:])
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    # Calculate ADX, the smoothed true range is shared by both indicators
+    atr = _ewm_mean(true_range, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = _ewm_mean(plus_dm, period, out=plus_dm)
+        plus_di *= 100
+        plus_di /= atr
+        minus_di = _ewm_mean(minus_dm, period, out=minus_dm)
+        minus_di *= 100
+        minus_di /= atr
+        dx = np.subtract(plus_di, minus_di, out=up_move)
+        np.abs(dx, out=dx)
+        dx *= 100
+        dx /= np.add(plus_di, minus_di, out=down_move)
+    adx = _ewm_mean(dx, period, out=atr)
+
+    return pd.DataFrame({"adx": adx, "+di": plus_di, "-di": minus_di}, index=df.index, copy=False)
+
+
+def calculate_true_range(df: pd.DataFrame) -> pd.Series:
+    """
+    Calculate the True Range of every candle, the high-low range for the first one
 
-    # Calculate ADX
-    df["+di"] = 100 * (df["plus_dm"].ewm(span=period).mean() / df["tr"].ewm(span=period).mean())
-    df["-di"] = 100 * (df["minus_dm"].ewm(span=period).mean() / df["tr"].ewm(span=period).mean())
-    df["dx"] = 100 * abs(df["+di"] - df["-di"]) / (df["+di"] + df["-di"])
-    df["adx"] = df["dx"].ewm(span=period).mean()
+    Args:
+        df: DataFrame with OHLC data
 
-    return df[["adx", "+di", "-di"]]
+    Returns:
+        pd.Series: True Range values
+    """
+    true_range = _true_range(df["high"].to_numpy(dtype=float),
+                             df["low"].to_numpy(dtype=float),
+                             df["close"].to_numpy(dtype=float))
+    return pd.Series(true_range, index=df.index)
 
 
 def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """
     Calculate Average True Range
 
+    Works on NumPy arrays and never modifies df.
+
     Args:
         df: DataFrame with OHLC data
         period: Period for ATR calculation
@@ -340,14 +459,77 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     Returns:
         pd.Series: ATR values
     """
-    high_low = df["high"] - df["low"]
-    high_close = abs(df["high"] - df["close"].shift())
-    low_close = abs(df["low"] - df["close"].shift())
+    true_range = _true_range(df["high"].to_numpy(dtype=float),
+                             df["low"].to_numpy(dtype=float),
+                             df["close"].to_numpy(dtype=float))
 
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = ranges.max(axis=1)
+    atr = np.full_like(true_range, np.nan)
+    if len(true_range) >= period:
+        # Mean of each window read through a strided view, no window is copied
+        np.mean(np.lib.stride_tricks.sliding_window_view(true_range, period), axis=1, out=atr[period - 1:])
+    return pd.Series(atr, index=df.index)
 
-    return true_range.rolling(period).mean()
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """
+    True Range of every candle, computed in a single output buffer
+    """
+    true_range = np.subtract(high, low)
+    if len(true_range) > 1:
+        prev_close = close[:-1]
+        tail = true_range[1:]
+        np.maximum(tail, np.abs(high[1:] - prev_close), out=tail)
+        np.maximum(tail, np.abs(low[1:] - prev_close), out=tail)
+    return true_range
+
+
+# Chunk length of _ewm_mean, bounds the growth of the inverse decay factors
+_EWM_CHUNK = 1024
+
+
+def _ewm_mean(values: np.ndarray, span: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    pandas ewm(span=span).mean() (adjust=True, ignore_na=False) without a Python loop per value.
+
+    Within a chunk, the weighted sums are cumulative sums of values scaled by inverse powers of the
+    decay, carried from one chunk to the next. NaN values are zero-weight observations that keep
+    decaying the earlier weights, as in pandas.
+
+    Args:
+        values: Observations
+        span: EWM span
+        out: Optional output buffer, may be values itself
+
+    Returns:
+        np.ndarray: EWM mean per value, NaN before the first observation
+    """
+    decay = 1 - 2 / (span + 1)
+    chunk = max(1, min(_EWM_CHUNK, int(300 / -np.log(decay)))) if decay > 0 else 1
+    # decay ** 0 .. decay ** (chunk - 1) and their inverses, shared by every chunk
+    powers = decay ** np.arange(chunk, dtype=float)
+    inverse_powers = 1 / powers
+
+    out = np.empty(len(values)) if out is None else out
+    valid = ~np.isnan(values)
+    weighted_sum = weight = 0.0
+    for start in range(0, len(values), chunk):
+        stop = min(start + chunk, len(values))
+        n = stop - start
+        chunk_valid = valid[start:stop]
+        chunk_values = np.where(chunk_valid, values[start:stop], 0.0)
+
+        sums = np.cumsum(chunk_values * inverse_powers[:n])
+        sums += weighted_sum * decay
+        sums *= powers[:n]
+        weights = np.cumsum(chunk_valid * inverse_powers[:n])
+        weights += weight * decay
+        weights *= powers[:n]
+
+        weighted_sum, weight = sums[-1], weights[-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(sums, weights, out=out[start:stop])
+        out[start:stop][weights == 0] = np.nan
+    return out
 
 
 def calculate_hurst_exponent(price_series: pd.Series, max_lag: int = 20) -> float:
@@ -364,14 +546,93 @@ def calculate_hurst_exponent(price_series: pd.Series, max_lag: int = 20) -> floa
     Returns:
         float: Hurst exponent
     """
-    lags = range(2, max_lag)
-    # Add small epsilon to avoid log(0)
-    tau = [max(1e-8, np.sqrt(np.std(np.subtract(price_series[lag:], price_series[:-lag])))) for lag in lags]
-
-    # Return the Hurst exponent from linear fit
-    try:
-        reg = np.polyfit(np.log(lags), np.log(tau), 1)
-        return reg[0]  # Hurst exponent is the slope
-    except (ValueError, RuntimeWarning):
+    prices = np.asarray(price_series, dtype=float)
+    hurst = calculate_rolling_hurst_exponent(prices, len(prices), max_lag)
+    if not len(hurst) or not np.isfinite(hurst.iloc[-1]):
         # Return 0.5 (random walk) if calculation fails
         return 0.5
+    return float(hurst.iloc[-1])
+
+
+def calculate_rolling_hurst_exponent(price_series: pd.Series, window: int, max_lag: int = 20) -> pd.Series:
+    """
+    Calculate the Hurst Exponent of calculate_hurst_exponent over the last window prices of every bar
+
+    The variances of the lagged differences are computed for all lags and bars at once from
+    cumulative sums, no window is processed on its own.
+
+    Args:
+        price_series: Price data
+        window: Number of prices per estimate
+        max_lag: Maximum lag for R/S calculation
+
+    Returns:
+        pd.Series: Hurst exponent per bar, NaN until window prices are available
+    """
+    prices = np.asarray(price_series, dtype=float)
+    lags = np.arange(2, max_lag)
+    log_tau = _lagged_difference_variances(prices, window, lags)
+    # log(tau) = log(max(1e-8, sqrt(std))), the epsilon avoids log(0)
+    with np.errstate(divide="ignore"):
+        np.log(log_tau, out=log_tau)
+    log_tau *= 0.25
+    np.maximum(log_tau, np.log(1e-8), out=log_tau)
+    return pd.Series(_hurst_slope(log_tau.T, lags), index=getattr(price_series, "index", None))
+
+
+def _hurst_slope(log_tau: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    """
+    Least-squares slope of log(tau) against log(lags), as np.polyfit would compute it
+
+    Args:
+        log_tau: log(tau) per lag (last axis), for one or many bars
+        lags: Lags of the log_tau columns
+
+    Returns:
+        np.ndarray: Hurst exponent per bar
+    """
+    log_lags = np.log(lags)
+    x = log_lags - log_lags.mean()
+    # x sums to zero, so centering log_tau would not change the slope
+    return log_tau @ x / (x @ x)
+
+
+def _lagged_difference_variances(prices: np.ndarray, window: int, lags: np.ndarray) -> np.ndarray:
+    """
+    Population variance of prices[t] - prices[t - lag] over the window - lag differences inside
+    the last window prices of every bar t, for every lag.
+
+    Returns:
+        np.ndarray: (lags, bars) variances, NaN for bars with fewer than window prices and for lags
+        leaving no difference in the window
+    """
+    n = len(prices)
+    variances = np.full((len(lags), n), np.nan)
+    counts = window - lags
+    usable = counts >= 1
+    if n < window or not usable.any():
+        return variances
+    lags, counts = lags[usable], counts[usable]
+
+    # Differences of every lag in one row each, centered on their mean to keep the cumulative
+    # sums small; rows before the first difference of a lag stay zero
+    diffs = np.zeros((len(lags), n))
+    for i, lag in enumerate(lags):
+        np.subtract(prices[lag:], prices[:-lag], out=diffs[i, lag:])
+        diffs[i, lag:] -= diffs[i, lag:].mean()
+
+    sums = np.zeros((len(lags), n + 1))
+    np.cumsum(diffs, axis=1, out=sums[:, 1:])
+    np.square(diffs, out=diffs)
+    squares = np.zeros((len(lags), n + 1))
+    np.cumsum(diffs, axis=1, out=squares[:, 1:])
+
+    # Window sums of the bars having window prices: cumulative sums at t + 1 minus at t + 1 - count
+    for i, (column, count) in enumerate(zip(np.flatnonzero(usable), counts)):
+        mean = sums[i, window:] - sums[i, window - count:n + 1 - count]
+        mean /= count
+        variance = squares[i, window:] - squares[i, window - count:n + 1 - count]
+        variance /= count
+        variance -= mean * mean
+        np.maximum(variance, 0.0, out=variances[column, window - 1:])
+    return variances
@@ -0,0 +1,413 @@
+"""
+Streaming indicators
+
+Incremental versions of the indicators of general_indicators, for live trading. Each indicator
+is updated with one closed candle at a time in constant time and matches the value the batch
+function returns for the last bar of the same history. States serialize to plain dicts
+(to_dict / load_indicator) so they survive restarts; update them with finite values only.
+"""
+import math
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+__all__ = [
+    "EmaState",
+    "RsiState",
+    "AtrState",
+    "AdxState",
+    "BollingerState",
+    "RollingZScoreState",
+    "RollingMomentsState",
+    "HurstState",
+    "load_indicator",
+]
+
+
+class StreamingIndicator:
+    """
+    Base class of the streaming indicators, handles (de)serialization of the instance state.
+    """
+
+    def to_dict(self) -> Dict[str, Any]:
+        state = {}
+        for key, value in self.__dict__.items():
+            if isinstance(value, deque):
+                value = list(value)
+            elif isinstance(value, StreamingIndicator):
+                value = value.to_dict()
+            elif isinstance(value, list) and value and isinstance(value[0], StreamingIndicator):
+                value = [item.to_dict() for item in value]
+            state[key] = value
+        return {"type": type(self).__name__, "state": state}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamingIndicator":
+        indicator = cls.__new__(cls)
+        for key, value in data["state"].items():
+            if isinstance(value, dict) and "type" in value:
+                value = load_indicator(value)
+            elif isinstance(value, list) and value and isinstance(value[0], dict) and "type" in value[0]:
+                value = [load_indicator(item) for item in value]
+            indicator.__dict__[key] = value
+        indicator._restore()
+        return indicator
+
+    def _restore(self) -> None:
+        """Rebuild the fields that do not survive serialization as-is."""
+
+
+class _RollingSums(StreamingIndicator):
+    """
+    Power sums of the last window values, shifted by the first value seen to limit cancellation.
+    The sums are recomputed from the window once per window length so rounding errors of the
+    add/remove updates never accumulate.
+    """
+
+    def __init__(self, window: int, powers: int = 2):
+        self.window = window
+        self.powers = powers
+        self.values: Deque[float] = deque(maxlen=window)
+        self.shift: Optional[float] = None
+        self.sums = [0.0] * powers
+        self.updates = 0
+
+    def _restore(self) -> None:
+        self.values = deque(self.values, maxlen=self.window)
+
+    def update(self, value: float) -> None:
+        if self.shift is None:
+            self.shift = value
+        if len(self.values) == self.window:
+            removed = self.values[0] - self.shift
+            for p in range(self.powers):
+                self.sums[p] -= removed ** (p + 1)
+        self.values.append(value)
+        added = value - self.shift
+        for p in range(self.powers):
+            self.sums[p] += added ** (p + 1)
+
+        self.updates += 1
+        if self.updates % self.window == 0:
+            self.sums = [math.fsum((v - self.shift) ** (p + 1) for v in self.values) for p in range(self.powers)]
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def mean(self) -> float:
+        return self.sums[0] / len(self.values) + self.shift
+
+    def central_moments(self) -> tuple:
+        """
+        Mean and biased central moments (2nd up to the number of powers) of the window.
+        """
+        n = len(self.values)
+        raw = [s / n for s in self.sums]
+        a = raw[0]
+        mean = a + self.shift
+        moments = [mean]
+        if self.powers >= 2:
+            b = max(raw[1] - a * a, 0.0)
+            moments.append(b)
+        if self.powers >= 3:
+            c = raw[2] - a ** 3 - 3 * a * b
+            moments.append(c)
+        if self.powers >= 4:
+            d = raw[3] - a ** 4 - 6 * b * a * a - 4 * c * a
+            moments.append(d)
+        return tuple(moments)
+
+
+class _EwmMean(StreamingIndicator):
+    """
+    pandas ewm(span=...).mean() with adjust=True, NaN observations keep decaying the weights.
+    """
+
+    def __init__(self, span: int):
+        self.decay = 1 - 2 / (span + 1)
+        self.weighted_sum = 0.0
+        self.weight = 0.0
+
+    def update(self, value: float) -> float:
+        self.weighted_sum *= self.decay
+        self.weight *= self.decay
+        if not math.isnan(value):
+            self.weighted_sum += value
+            self.weight += 1.0
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.weighted_sum / self.weight if self.weight > 0 else math.nan
+
+
+class EmaState(StreamingIndicator):
+    """
+    Exponential Moving Average, as calculate_ema (adjust=False).
+    """
+
+    def __init__(self, window: int):
+        self.alpha = 2 / (window + 1)
+        self.value: Optional[float] = None
+
+    def update(self, close: float) -> float:
+        if self.value is None:
+            self.value = close
+        else:
+            self.value = self.alpha * close + (1 - self.alpha) * self.value
+        return self.value
+
+
+class RsiState(StreamingIndicator):
+    """
+    Relative Strength Index.
+
+    method="sma" averages gains/losses over a rolling window, as calculate_rsi.
+    method="wilder" uses Wilder's smoothing, seeded with the SMA of the first period values.
+    """
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"Invalid RSI method: {method}")
+        self.period = period
+        self.method = method
+        self.prev_close: Optional[float] = None
+        self.gains = _RollingSums(period, powers=1)
+        self.losses = _RollingSums(period, powers=1)
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self.count = 0
+
+    def update(self, close: float) -> float:
+        # The first candle has no change and counts as a zero gain/loss, as in calculate_rsi
+        delta = 0.0 if self.prev_close is None else close - self.prev_close
+        self.prev_close = close
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        self.count += 1
+
+        if self.method == "wilder" and self.count > self.period:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+        else:
+            self.gains.update(gain)
+            self.losses.update(loss)
+            if self.gains.full:
+                self.avg_gain = self.gains.mean
+                self.avg_loss = self.losses.mean
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.avg_gain is None:
+            return math.nan
+        if self.avg_loss == 0:
+            return 100.0 if self.avg_gain > 0 else math.nan
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+
+class AtrState(StreamingIndicator):
+    """
+    Average True Range over a rolling window, as calculate_atr.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.true_ranges = _RollingSums(period, powers=1)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.true_ranges.update(true_range)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.true_ranges.mean if self.true_ranges.full else math.nan
+
+
+class AdxState(StreamingIndicator):
+    """
+    Average Directional Index with +DI/-DI, as calculate_adx.
+    """
+
+    def __init__(self, period: int = 14):
+        self.prev_high: Optional[float] = None
+        self.prev_low: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.plus_dm = _EwmMean(period)
+        self.minus_dm = _EwmMean(period)
+        self.true_range = _EwmMean(period)
+        self.dx = _EwmMean(period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = high - low
+        plus_dm = minus_dm = 0.0
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+            up_move = high - self.prev_high
+            down_move = self.prev_low - low
+            if up_move > down_move and up_move > 0:
+                plus_dm = up_move
+            if down_move > up_move and down_move > 0:
+                minus_dm = down_move
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        self.true_range.update(true_range)
+        self.plus_dm.update(plus_dm)
+        self.minus_dm.update(minus_dm)
+        plus_di, minus_di = self.plus_di, self.minus_di
+        di_sum = plus_di + minus_di
+        self.dx.update(100 * abs(plus_di - minus_di) / di_sum if di_sum else math.nan)
+        return self.value
+
+    @property
+    def plus_di(self) -> float:
+        atr = self.true_range.value
+        return 100 * self.plus_dm.value / atr if atr else math.nan
+
+    @property
+    def minus_di(self) -> float:
+        atr = self.true_range.value
+        return 100 * self.minus_dm.value / atr if atr else math.nan
+
+    @property
+    def value(self) -> float:
+        return self.dx.value
+
+
+class BollingerState(StreamingIndicator):
+    """
+    Bollinger Bands over a rolling window, as calculate_bollinger_bands.
+    """
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.num_std = num_std
+        self.closes = _RollingSums(window, powers=2)
+
+    def update(self, close: float) -> tuple:
+        self.closes.update(close)
+        return self.value
+
+    @property
+    def value(self) -> tuple:
+        """(upper band, lower band)"""
+        if not self.closes.full:
+            return math.nan, math.nan
+        mean, std = _mean_std(self.closes)
+        return mean + std * self.num_std, mean - std * self.num_std
+
+
+class RollingZScoreState(StreamingIndicator):
+    """
+    Z-score of the last value against the rolling mean and standard deviation of its window.
+    """
+
+    def __init__(self, window: int = 50):
+        self.values = _RollingSums(window, powers=2)
+
+    def update(self, value: float) -> float:
+        self.values.update(value)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if not self.values.full:
+            return math.nan
+        mean, std = _mean_std(self.values)
+        return (self.values.values[-1] - mean) / std if std > 0 else math.nan
+
+
+class RollingMomentsState(StreamingIndicator):
+    """
+    Rolling skewness and excess kurtosis with pandas' bias corrections (rolling().skew/kurt).
+    """
+
+    def __init__(self, window: int = 63):
+        self.values = _RollingSums(window, powers=4)
+
+    def update(self, value: float) -> tuple:
+        if not math.isnan(value):
+            self.values.update(value)
+        return self.value
+
+    @property
+    def value(self) -> tuple:
+        """(skewness, kurtosis)"""
+        if not self.values.full:
+            return math.nan, math.nan
+        n = len(self.values.values)
+        _, b, c, d = self.values.central_moments()
+        if b <= 1e-14:
+            return math.nan, math.nan
+        skew = math.sqrt(n * (n - 1)) * c / ((n - 2) * b ** 1.5)
+        kurt = ((n * n - 1) * d / (b * b) - 3 * (n - 1) ** 2) / ((n - 2) * (n - 3))
+        return skew, kurt
+
+
+class HurstState(StreamingIndicator):
+    """
+    Hurst exponent of the last window prices, as calculate_rolling_hurst_exponent.
+
+    Each lag keeps the rolling sums of its lagged differences, an update costs O(max_lag).
+    """
+
+    def __init__(self, window: int = 500, max_lag: int = 20):
+        self.window = window
+        self.lags = [lag for lag in range(2, max_lag) if window - lag >= 1]
+        self.prices: Deque[float] = deque(maxlen=max(self.lags, default=0) + 1)
+        self.diffs = [_RollingSums(window - lag, powers=2) for lag in self.lags]
+        self.count = 0
+
+    def _restore(self) -> None:
+        self.prices = deque(self.prices, maxlen=max(self.lags, default=0) + 1)
+
+    def update(self, price: float) -> float:
+        self.prices.append(price)
+        self.count += 1
+        for lag, diffs in zip(self.lags, self.diffs):
+            if len(self.prices) > lag:
+                diffs.update(price - self.prices[-lag - 1])
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if self.count < self.window or not self.lags:
+            return math.nan
+        log_lags = [math.log(lag) for lag in self.lags]
+        mean_log_lag = sum(log_lags) / len(log_lags)
+        x = [log_lag - mean_log_lag for log_lag in log_lags]
+        log_tau = [_log_tau(diffs.central_moments()[1]) for diffs in self.diffs]
+        return sum(a * b for a, b in zip(log_tau, x)) / sum(a * a for a in x)
+
+
+def _log_tau(variance: float) -> float:
+    """log(max(1e-8, sqrt(std))) of a lagged difference variance, see calculate_rolling_hurst_exponent."""
+    return max(math.log(1e-8), 0.25 * math.log(variance)) if variance > 0 else math.log(1e-8)
+
+
+def _mean_std(sums: _RollingSums) -> tuple:
+    """Mean and sample standard deviation (ddof=1) of a rolling window."""
+    n = len(sums.values)
+    mean, variance = sums.central_moments()
+    return mean, math.sqrt(variance * n / (n - 1))
+
+
+_INDICATORS = {cls.__name__: cls for cls in (
+    EmaState, RsiState, AtrState, AdxState, BollingerState, RollingZScoreState, RollingMomentsState,
+    HurstState, _RollingSums, _EwmMean,
+)}
+
+
+def load_indicator(data: Dict[str, Any]) -> StreamingIndicator:
+    """
+    Rebuild a streaming indicator from the output of its to_dict().
+    """
+    try:
+        cls = _INDICATORS[data["type"]]
+    except KeyError:
+        raise ValueError(f"Unknown streaming indicator: {data.get('type')}")
+    return cls.from_dict(data)
@@ -3,13 +3,11 @@ import json
 import pandas as pd
 from langchain_core.messages import HumanMessage
 from src.graph import AgentState, BaseNode, show_agent_reasoning
-from indicators import (calculate_trend_signals,
-                        calculate_mean_reversion_signals,
-                        calculate_momentum_signals,
-                        calculate_volatility_signals,
-                        calculate_stat_arb_signals,
+from indicators import (calculate_signal_history,
                         weighted_signal_combination,
-                        normalize_pandas)
+                        signals_at,
+                        normalize_pandas,
+                        FeatureCache)
 
 
 class MacdStrategy(BaseNode):
@@ -29,6 +27,8 @@ class MacdStrategy(BaseNode):
         data = state.get("data", {})
         tickers = data.get("tickers", [])
         intervals = data.get("intervals", [])
+        kline_feed = data.get("kline_feed")
+        feature_cache = data.get("feature_cache") or FeatureCache()
 
         # Initialize analysis for each ticker
         technical_analysis = {}
@@ -48,12 +48,18 @@ class MacdStrategy(BaseNode):
             for interval in intervals:
                 df = data.get(f"{ticker}_{interval.value}", pd.DataFrame())
 
-                trend_signals = calculate_trend_signals(df)
-                mean_reversion_signals = calculate_mean_reversion_signals(df)
-                momentum_signals = calculate_momentum_signals(df)
-
-                volatility_signals = calculate_volatility_signals(df)
-                stat_arb_signals = calculate_stat_arb_signals(df)
+                if kline_feed is not None and not df.empty:
+                    # Backtests read the signals of the slice's last candle from the precomputed history
+                    signals = signals_at(kline_feed.signal_history(ticker, interval.value), df.index[-1])
+                else:
+                    # Intermediate series are shared with the other strategies of this run
+                    features = feature_cache.frame(ticker, interval.value, df)
+                    signals = signals_at(calculate_signal_history(df, hurst_window=len(df), features=features))
+                trend_signals = signals["trend"]
+                mean_reversion_signals = signals["mean_reversion"]
+                momentum_signals = signals["momentum"]
+                volatility_signals = signals["volatility"]
+                stat_arb_signals = signals["stat_arb"]
 
                 combined_signal = weighted_signal_combination(
                     {
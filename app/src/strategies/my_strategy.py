@@ -3,6 +3,7 @@ import json
 import pandas as pd
 from langchain_core.messages import HumanMessage
 from src.graph import AgentState, BaseNode
+from indicators import FeatureCache, calculate_ema
 
 
 class MyStrategy(BaseNode):
@@ -18,6 +19,10 @@ class MyStrategy(BaseNode):
         tickers = data.get("tickers", [])
         intervals = data.get("intervals", [])
 
+        # Features computed by the other strategies of this run are reused from the shared cache:
+        # the EMAs below are the ones of the MacdStrategy trend signals
+        feature_cache = data.get("feature_cache") or FeatureCache()
+
         # Initialize analysis dictionary to store results
         technical_analysis = {}
         for ticker in tickers:
@@ -33,18 +38,19 @@ class MyStrategy(BaseNode):
                     continue
 
                 # Implement your custom technical analysis here
-                # Example: Simple moving average crossover strategy
-                df['sma_fast'] = df['close'].rolling(window=10).mean()
-                df['sma_slow'] = df['close'].rolling(window=30).mean()
+                # Example: Exponential moving average crossover strategy
+                features = feature_cache.frame(ticker, interval.value, df)
+                ema_fast = features.get(("ema", 8), lambda: calculate_ema(df, 8))
+                ema_slow = features.get(("ema", 21), lambda: calculate_ema(df, 21))
 
                 # Generate signal based on your strategy logic
                 signal = "neutral"
                 confidence = 50
 
-                if df['sma_fast'].iloc[-1] > df['sma_slow'].iloc[-1]:
+                if ema_fast.iloc[-1] > ema_slow.iloc[-1]:
                     signal = "bullish"
                     confidence = 70
-                elif df['sma_fast'].iloc[-1] < df['sma_slow'].iloc[-1]:
+                elif ema_fast.iloc[-1] < ema_slow.iloc[-1]:
                     signal = "bearish"
                     confidence = 70
 
@@ -53,12 +59,12 @@ class MyStrategy(BaseNode):
                     "signal": signal,
                     "confidence": confidence,
                     "strategy_signals": {
-                        "simple_ma_crossover": {
+                        "ema_crossover": {
                             "signal": signal,
                             "confidence": confidence,
                             "metrics": {
-                                "sma_fast": float(df['sma_fast'].iloc[-1]),
-                                "sma_slow": float(df['sma_slow'].iloc[-1]),
+                                "ema_fast": float(ema_fast.iloc[-1]),
+                                "ema_slow": float(ema_slow.iloc[-1]),
                                 "price": float(df['close'].iloc[-1])
                             }
                         }
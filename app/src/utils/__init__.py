@@ -1,6 +1,9 @@
 from .settings import settings
-from .constants import Interval, COLUMNS, NUMERIC_COLUMNS, QUANTITY_DECIMALS
-from .binance_data_provider import BinanceDataProvider
+from .constants import Interval, COLUMNS, NUMERIC_COLUMNS, QUANTITY_DECIMALS, HISTORY_CANDLES
+from .binance_data_provider import BinanceDataProvider, get_data_provider
+from .binance_clients import client_registry
+from .kline_feed import HistoricalKlineFeed
+from .live_kline_feed import LiveKlineFeed
 from .util_func import (import_strategy_class,
                         save_graph_as_png,
                         deep_merge_dicts,
@@ -14,7 +17,12 @@ __all__ = ['settings',
            'COLUMNS',
            'NUMERIC_COLUMNS',
            'QUANTITY_DECIMALS',
+           'HISTORY_CANDLES',
            'BinanceDataProvider',
+           'get_data_provider',
+           'client_registry',
+           'HistoricalKlineFeed',
+           'LiveKlineFeed',
            'import_strategy_class',
            'save_graph_as_png',
            'deep_merge_dicts',
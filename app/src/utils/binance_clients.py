@@ -0,0 +1,151 @@
+"""
+Binance Client Registry
+
+This module hands out the Binance clients of the process: one lazily constructed sync client
+per credential set and one async client per credential set and event loop, all with pooled
+keep-alive connections. Setting BINANCE_BASE_URL sends their REST requests to a local stand-in.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+from requests.adapters import HTTPAdapter
+
+from src.gateway.binance.async_client import AsyncClient
+from src.gateway.binance.client import Client
+
+# Keep-alive connections kept per host by a sync client, sized for the parallel node executor
+POOL_MAXSIZE = 32
+# Connections opened at once by an async client, in total and per host
+CONNECTOR_LIMIT = 64
+CONNECTOR_LIMIT_PER_HOST = 32
+# Seconds DNS lookups and idle keep-alive connections of an async client are kept
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+# Base url the REST endpoints of new clients are sent to instead of Binance, e.g. the url of a
+# local_exchange.LocalExchangeServer
+BASE_URL_ENV = "BINANCE_BASE_URL"
+
+Credentials = Tuple[Optional[str], Optional[str]]
+
+
+class BinanceClientRegistry:
+    """
+    Shared Binance clients of the process.
+
+    Clients are built on first use, so importing a module never opens a connection, and are
+    reused by every caller with the same credentials so TLS sessions stay warm. Sync clients
+    are thread-safe to share; async clients are bound to the event loop they were created in.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[Credentials, Client] = {}
+        self._async_clients: Dict[Tuple[Credentials, int], AsyncClient] = {}
+
+    def get_client(self, api_key: Optional[str] = None, api_secret: Optional[str] = None) -> Client:
+        """
+        Get the sync client of a credential set.
+
+        Args:
+            api_key: Binance API key (optional for public data)
+            api_secret: Binance API secret (optional for public data)
+
+        Returns:
+            Client with a pooled requests session
+        """
+        credentials = (api_key, api_secret)
+        with self._lock:
+            client = self._clients.get(credentials)
+            if client is None:
+                client = self._clients[credentials] = self._create_client(api_key, api_secret)
+            return client
+
+    def get_async_client(self, api_key: Optional[str] = None, api_secret: Optional[str] = None) -> AsyncClient:
+        """
+        Get the async client of a credential set for the running event loop.
+
+        Args:
+            api_key: Binance API key (optional for public data)
+            api_secret: Binance API secret (optional for public data)
+
+        Returns:
+            AsyncClient with a pooled aiohttp session
+        """
+        loop = asyncio.get_running_loop()
+        key = ((api_key, api_secret), id(loop))
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None or client.loop is not loop or client.session.closed:
+                # clients of closed loops can never be used again
+                self._async_clients = {k: c for k, c in self._async_clients.items() if not c.loop.is_closed()}
+                client = self._async_clients[key] = self._create_async_client(api_key, api_secret, loop)
+            return client
+
+    async def aclose(self) -> None:
+        """
+        Close the async clients of the running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = [c for c in self._async_clients.values() if c.loop is loop]
+            self._async_clients = {k: c for k, c in self._async_clients.items() if c.loop is not loop}
+        for client in clients:
+            await client.close_connection()
+
+    def close(self) -> None:
+        """
+        Close the sessions of the sync clients.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close_connection()
+
+    @staticmethod
+    def _create_client(api_key: Optional[str], api_secret: Optional[str]) -> Client:
+        # no ping: the first request opens the connection, which the pool then keeps alive
+        client = Client(api_key=api_key, api_secret=api_secret, ping=False)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE)
+        client.session.mount("https://", adapter)
+        client.session.mount("http://", adapter)
+        if os.getenv(BASE_URL_ENV):
+            route_client(client, os.environ[BASE_URL_ENV])
+        return client
+
+    @staticmethod
+    def _create_async_client(api_key: Optional[str], api_secret: Optional[str],
+                             loop: asyncio.AbstractEventLoop) -> AsyncClient:
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTOR_LIMIT,
+            limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        client = AsyncClient(api_key=api_key, api_secret=api_secret, loop=loop,
+                             session_params={"connector": connector})
+        if os.getenv(BASE_URL_ENV):
+            route_client(client, os.environ[BASE_URL_ENV])
+        return client
+
+
+def route_client(client, base_url: str) -> None:
+    """
+    Send the spot, margin and futures requests of a client to another base url.
+
+    Args:
+        client: Client or AsyncClient
+        base_url: Scheme and host of the endpoints (e.g., 'http://127.0.0.1:8080')
+    """
+    base_url = base_url.rstrip("/")
+    client.API_URL = client.API_TESTNET_URL = f"{base_url}/api"
+    client.MARGIN_API_URL = f"{base_url}/sapi"
+    client.FUTURES_URL = client.FUTURES_TESTNET_URL = f"{base_url}/fapi"
+    client.FUTURES_DATA_URL = client.FUTURES_DATA_TESTNET_URL = f"{base_url}/futures/data"
+
+
+client_registry = BinanceClientRegistry()
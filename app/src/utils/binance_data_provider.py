@@ -4,18 +4,42 @@ Binance Data Provider Module
 This module handles retrieving data from Binance and preparing it for the trading system.
 """
 
-from typing import Dict, List, Optional
+import asyncio
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from src.gateway.binance.async_client import AsyncClient
 from src.gateway.binance.client import Client
-from src.utils.constants import COLUMNS, NUMERIC_COLUMNS
+from src.gateway.binance.enums import HistoricalKlinesType
+from src.gateway.binance.helpers import interval_to_milliseconds
+from src.utils.binance_clients import client_registry
+from src.utils.constants import BINANCE_INTERVALS
+from src.utils.kline_decoder import decode_klines
+from src.utils.kline_resampler import bucket_open_time, resample_klines
+from src.utils.kline_store import KlineStore, MARKET_FUTURES, MARKET_SPOT
 from src.utils.logger import setup_logger
 import os
+import time
 
 logger = setup_logger()
 
+# Maximum number of klines returned by one request
+KLINES_PER_REQUEST = 1000
+# Concurrent requests of a bulk download, the request scheduler still enforces the rate limits
+DOWNLOAD_CONCURRENCY = 8
+# Number of downloaded chunks written to the kline store at once
+DOWNLOAD_FLUSH_CHUNKS = 50
+# Missing ranges of at least this many candles are bulk downloaded by get_historical_klines
+BULK_DOWNLOAD_MIN_CANDLES = 3 * KLINES_PER_REQUEST
+# Source interval of the resampled intervals
+RESAMPLE_SOURCE_TIMEFRAME = '1m'
+# Klines endpoint of each kline store market
+KLINES_TYPES = {MARKET_SPOT: HistoricalKlinesType.SPOT, MARKET_FUTURES: HistoricalKlinesType.FUTURES}
+
+
 class BinanceDataProvider:
     """
     Class to handle data retrieval from Binance and prepare it for the trading system.
@@ -29,11 +53,20 @@ class BinanceDataProvider:
             api_key: Binance API key (optional for public data)
             api_secret: Binance API secret (optional for public data)
         """
-        self.client = Client(api_key=api_key, api_secret=api_secret)
+        self.api_key = api_key
+        self.api_secret = api_secret
 
         # Create cache directory if it doesn't exist
         self.cache_dir = Path(os.environ.get("CACHE_DIR", "/tmp/cache"))
         self.cache_dir.mkdir(exist_ok=True)
+        self.kline_store = KlineStore(self.cache_dir / "klines")
+
+    @property
+    def client(self) -> Client:
+        """
+        Shared sync client of the credentials, created on first use.
+        """
+        return client_registry.get_client(self.api_key, self.api_secret)
 
     def _format_timeframe(self, timeframe: str) -> str:
         """
@@ -54,7 +87,8 @@ class BinanceDataProvider:
             timeframe: str,
             start_date: Optional[datetime] = None,
             end_date: Optional[datetime] = None,
-            use_cache: bool = True
+            use_cache: bool = True,
+            market_type: str = MARKET_SPOT,
     ) -> pd.DataFrame:
         """
         Get historical klines (candlestick data) for a symbol and timeframe.
@@ -65,6 +99,7 @@ class BinanceDataProvider:
             start_date: Start date for historical data
             end_date: End date for historical data
             use_cache: Whether to use cached data if available
+            market_type: Market of the klines (MARKET_SPOT or MARKET_FUTURES)
 
         Returns:
             DataFrame with historical price data
@@ -79,48 +114,281 @@ class BinanceDataProvider:
         if end_date is None:
             end_date = datetime.now()
 
-        # Create cache file path
-        cache_file = self.cache_dir / f"{formatted_symbol}_{timeframe}_{start_date.strftime('%Y%m%dT%H%M%S')}_{end_date.strftime('%Y%m%dT%H%M%S')}.csv"
-
-        # Check if cache file exists and is fresh
-        if use_cache and cache_file.exists():
-            logger.debug(f"Loading cached data for {formatted_symbol} {timeframe}")
-            return pd.read_csv(cache_file, parse_dates=['open_time', 'close_time'])
-
-        logger.debug(f"Fetching historical data for {formatted_symbol} {timeframe}")
+        if timeframe not in BINANCE_INTERVALS:
+            return self.get_resampled_klines(symbol, timeframe, start_date, end_date, use_cache=use_cache,
+                                             market_type=market_type)
 
         # Convert datetime to milliseconds timestamp
         start_ts = int(start_date.timestamp() * 1000)
         end_ts = int(end_date.timestamp() * 1000)
 
         try:
-            # Use the client to get historical klines
-            klines = self.client.get_historical_klines(
-                symbol=formatted_symbol,
-                interval=self._format_timeframe(timeframe),
-                start_str=start_ts,
-                end_str=end_ts
-            )
-
-            df = pd.DataFrame(klines, columns=COLUMNS)
-            # Convert types
-            for col in NUMERIC_COLUMNS:
-                df[col] = pd.to_numeric(df[col])
+            if not use_cache:
+                logger.debug(f"Fetching historical data for {formatted_symbol} {timeframe}")
+                klines = self.client.get_historical_klines(
+                    symbol=formatted_symbol,
+                    interval=self._format_timeframe(timeframe),
+                    start_str=start_ts,
+                    end_str=end_ts,
+                    klines_type=KLINES_TYPES[market_type]
+                )
+                return self._convert_timestamps(self._klines_to_frame(klines))
+
+            # The candle that is still forming is returned but never persisted
+            interval_ms = interval_to_milliseconds(timeframe)
+            closed_end_ts = min(end_ts, int(time.time() * 1000) - interval_ms)
+
+            # Only request the parts of the range the kline store does not hold yet
+            open_frames = []
+            for gap_start, gap_end in self.kline_store.missing_ranges(market_type, formatted_symbol, timeframe,
+                                                                      start_ts, end_ts):
+                # Long gaps of closed candles are downloaded in concurrent chunks
+                bulk_end = min(gap_end, closed_end_ts)
+                if (bulk_end - gap_start) // interval_ms >= BULK_DOWNLOAD_MIN_CANDLES and not _in_event_loop():
+                    self._download_range(formatted_symbol, timeframe, gap_start, bulk_end, market_type)
+                    if bulk_end >= gap_end:
+                        continue
+                    gap_start = bulk_end + 1
+
+                logger.debug(f"Fetching historical data for {formatted_symbol} {timeframe} "
+                             f"from {gap_start} to {gap_end}")
+                klines = self.client._historical_klines(
+                    symbol=formatted_symbol,
+                    interval=self._format_timeframe(timeframe),
+                    start_str=gap_start,
+                    end_str=max(gap_end, gap_start + 1),
+                    klines_type=KLINES_TYPES[market_type]
+                )
+                df = self._klines_to_frame(klines)
+
+                self.kline_store.write(market_type, formatted_symbol, timeframe, df,
+                                       gap_start, min(gap_end, closed_end_ts))
+                self._log_holes(formatted_symbol, timeframe, gap_start, min(gap_end, closed_end_ts), market_type)
+
+                open_df = df[(df['open_time'] > closed_end_ts) & (df['open_time'] <= gap_end)]
+                if not open_df.empty:
+                    open_frames.append(open_df)
 
-            # Convert timestamps to datetime
-            df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
-            df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
-
-            # Cache the data
-            if use_cache:
-                df.to_csv(cache_file, index=False)
+            logger.debug(f"Loading cached data for {formatted_symbol} {timeframe}")
+            df = self.kline_store.read(market_type, formatted_symbol, timeframe, start_ts, end_ts)
+            if open_frames:
+                df = pd.concat([df] + open_frames, ignore_index=True)
 
-            return df
+            return self._convert_timestamps(df)
 
         except Exception as e:
             logger.error(f"Error fetching historical data for {formatted_symbol} {timeframe}: {e}")
             return pd.DataFrame()
 
+    def get_resampled_klines(
+            self,
+            symbol: str,
+            timeframe: str,
+            start_date: Optional[datetime] = None,
+            end_date: Optional[datetime] = None,
+            source_timeframe: str = RESAMPLE_SOURCE_TIMEFRAME,
+            use_cache: bool = True,
+            market_type: str = MARKET_SPOT,
+    ) -> pd.DataFrame:
+        """
+        Get historical klines of any interval (e.g., '2m', '10m', '7m') resampled from a finer series.
+
+        The source candles come from get_historical_klines, so they are shared through the kline
+        store by every interval derived from them. Like Binance, only candles opening at or after
+        start_date are returned and the last one may still be forming.
+
+        Args:
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            timeframe: Time interval to build
+            start_date: Start date for historical data
+            end_date: End date for historical data
+            source_timeframe: Interval of the source candles, must divide timeframe
+            use_cache: Whether to use cached data if available
+            market_type: Market of the klines (MARKET_SPOT or MARKET_FUTURES)
+
+        Returns:
+            DataFrame with historical price data
+        """
+        if start_date is None:
+            start_date = datetime.now() - timedelta(days=30)
+        source = self.get_historical_klines(symbol, source_timeframe, start_date, end_date, use_cache=use_cache,
+                                            market_type=market_type)
+        if source.empty:
+            return source
+        return self._resample_since(source, timeframe, start_date)
+
+    def download_klines(
+            self,
+            symbol: str,
+            timeframe: str,
+            start_date: datetime,
+            end_date: Optional[datetime] = None,
+            concurrency: int = DOWNLOAD_CONCURRENCY,
+            market_type: str = MARKET_SPOT,
+    ) -> int:
+        """
+        Bulk download the closed klines of a range into the kline store.
+
+        Blocking wrapper of adownload_klines, not to be called from a running event loop.
+
+        Returns:
+            Number of klines written to the store
+        """
+        async def download() -> int:
+            try:
+                return await self.adownload_klines(symbol, timeframe, start_date, end_date, concurrency,
+                                                   market_type)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(download())
+
+    async def adownload_klines(
+            self,
+            symbol: str,
+            timeframe: str,
+            start_date: datetime,
+            end_date: Optional[datetime] = None,
+            concurrency: int = DOWNLOAD_CONCURRENCY,
+            market_type: str = MARKET_SPOT,
+    ) -> int:
+        """
+        Bulk download the closed klines of a range into the kline store.
+
+        Open times are deterministic per interval, so the parts of the range missing from the store
+        are split ahead of time into chunks of KLINES_PER_REQUEST candles fetched concurrently with
+        the AsyncClient. Chunks are stitched in order and streamed to the store every
+        DOWNLOAD_FLUSH_CHUNKS chunks.
+
+        Args:
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            timeframe: Time interval (e.g., '1h', '5m', '1d')
+            start_date: Start date of the range
+            end_date: End date of the range, now if None
+            concurrency: Maximum number of requests in flight
+            market_type: Market of the klines (MARKET_SPOT or MARKET_FUTURES)
+
+        Returns:
+            Number of klines written to the store
+        """
+        formatted_symbol = symbol.replace("/", "")
+        interval_ms = interval_to_milliseconds(timeframe)
+        start_ts = int(start_date.timestamp() * 1000)
+        end_ts = int((end_date or datetime.now()).timestamp() * 1000)
+        closed_end_ts = min(end_ts, int(time.time() * 1000) - interval_ms)
+
+        written = 0
+        for gap_start, gap_end in self.kline_store.missing_ranges(market_type, formatted_symbol, timeframe,
+                                                                  start_ts, closed_end_ts):
+            written += await self._adownload_range(formatted_symbol, timeframe, gap_start, gap_end, concurrency,
+                                                   market_type)
+        return written
+
+    def _download_range(self, symbol: str, timeframe: str, start_ts: int, end_ts: int,
+                        market_type: str = MARKET_SPOT) -> int:
+        async def download() -> int:
+            try:
+                return await self._adownload_range(symbol, timeframe, start_ts, end_ts, DOWNLOAD_CONCURRENCY,
+                                                   market_type)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(download())
+
+    async def _adownload_range(self, symbol: str, timeframe: str, start_ts: int, end_ts: int,
+                               concurrency: int, market_type: str = MARKET_SPOT) -> int:
+        """
+        Download the closed klines of [start_ts, end_ts] in concurrent chunks into the kline store.
+        """
+        interval_ms = interval_to_milliseconds(timeframe)
+        chunk_ms = KLINES_PER_REQUEST * interval_ms
+        chunks = [(chunk_start, min(chunk_start + chunk_ms - 1, end_ts))
+                  for chunk_start in range(start_ts, end_ts + 1, chunk_ms)]
+        logger.debug(f"Downloading {symbol} {timeframe} from {start_ts} to {end_ts} in {len(chunks)} chunks")
+
+        client = self._get_async_client()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chunk_start: int, chunk_end: int) -> List[List]:
+            async with semaphore:
+                return await client._klines(klines_type=KLINES_TYPES[market_type], symbol=symbol,
+                                            interval=self._format_timeframe(timeframe),
+                                            limit=KLINES_PER_REQUEST, startTime=chunk_start, endTime=chunk_end)
+
+        tasks = [asyncio.ensure_future(fetch(*chunk)) for chunk in chunks]
+        written = 0
+        buffered: List[pd.DataFrame] = []
+        buffer_start = start_ts
+
+        def flush(buffer_end: int) -> None:
+            nonlocal written, buffered, buffer_start
+            if buffer_end < buffer_start:
+                return
+            df = pd.concat(buffered, ignore_index=True) if buffered else self._klines_to_frame([])
+            self.kline_store.write(market_type, symbol, timeframe, df, buffer_start, buffer_end)
+            self._log_holes(symbol, timeframe, buffer_start, buffer_end, market_type)
+            written += len(df)
+            buffered = []
+            buffer_start = buffer_end + 1
+
+        try:
+            # Chunks are awaited in order while the later ones are already in flight
+            for i, task in enumerate(tasks):
+                buffered.append(self._klines_to_frame(await task))
+                if (i + 1) % DOWNLOAD_FLUSH_CHUNKS == 0:
+                    flush(chunks[i][1])
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            # Keep the contiguous part downloaded so far
+            flush(buffer_start + len(buffered) * chunk_ms - 1)
+            raise
+        flush(end_ts)
+        return written
+
+    def _log_holes(self, symbol: str, timeframe: str, start_ts: int, end_ts: int,
+                   market_type: str = MARKET_SPOT) -> None:
+        for hole_start, hole_end in self.kline_store.holes(market_type, symbol, timeframe,
+                                                           interval_to_milliseconds(timeframe), start_ts, end_ts):
+            logger.warning(f"No candles for {symbol} {timeframe} between {hole_start} "
+                           f"and {hole_end}, recorded as a hole")
+
+    @staticmethod
+    def _resample_since(source: pd.DataFrame, timeframe: str, start_date: Optional[datetime]) -> pd.DataFrame:
+        """
+        Resample klines with datetime timestamps, dropping the partial bucket before start_date.
+        """
+        df = resample_klines(source, timeframe)
+        if start_date is None:
+            return df
+        start = pd.to_datetime(int(start_date.timestamp() * 1000), unit='ms')
+        return df[df['open_time'] >= start].reset_index(drop=True)
+
+    @staticmethod
+    def _resampled_source_range(timeframe: str, end_time: datetime, limit: int) -> Tuple[int, int]:
+        """
+        Get the (start, end) epoch ms range of the source candles of the last limit resampled candles.
+        """
+        end_ts = int(end_time.timestamp() * 1000)
+        start_ts = bucket_open_time(end_ts, timeframe) - (limit - 1) * interval_to_milliseconds(timeframe)
+        return start_ts, end_ts
+
+    @staticmethod
+    def _klines_to_frame(klines: List[List]) -> pd.DataFrame:
+        """
+        Build a typed DataFrame with epoch ms timestamps from raw klines.
+        """
+        return decode_klines(klines)
+
+    @staticmethod
+    def _convert_timestamps(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Convert the epoch ms open_time/close_time columns to datetimes.
+        """
+        df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
+        df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+        return df
+
     def get_multiple_timeframes_with_end_time(
             self,
             symbol: str,
@@ -202,6 +470,17 @@ class BinanceDataProvider:
         """
         formatted_symbol = symbol.replace("/", "")
         try:
+            if timeframe not in BINANCE_INTERVALS:
+                start_ts, end_ts = self._resampled_source_range(timeframe, end_time, limit)
+                klines = self.client.futures_historical_klines(
+                    symbol=formatted_symbol,
+                    interval=RESAMPLE_SOURCE_TIMEFRAME,
+                    start_str=start_ts,
+                    end_str=end_ts,
+                    limit=None
+                )
+                return resample_klines(self._convert_timestamps(self._klines_to_frame(klines)), timeframe)
+
             # Use the client to get klines
             klines = self.client.futures_historical_klines_with_end_time(
                 symbol=formatted_symbol,
@@ -210,21 +489,69 @@ class BinanceDataProvider:
                 limit=limit
             )
 
-            df = pd.DataFrame(klines, columns=COLUMNS)
+            return self._convert_timestamps(self._klines_to_frame(klines))
 
-            for col in NUMERIC_COLUMNS:
-                df[col] = pd.to_numeric(df[col])
+        except Exception as e:
+            logger.error(f"Error fetching latest data for {formatted_symbol} {timeframe}: {e}")
+            return pd.DataFrame()
 
-            # Convert timestamps to datetime
-            df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
-            df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+    async def aget_history_klines_with_end_time(
+            self,
+            symbol: str,
+            timeframe: str,
+            end_time: datetime,
+            limit: int = 500,
+    ) -> pd.DataFrame:
+        """
+        Async version of get_history_klines_with_end_time, requests of the same event loop share
+        one pooled aiohttp session.
 
-            return df
+        Args:
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            timeframe: time interval (e.g., '1h', '5m', '1d')
+            end_time: end time for timeframes data
+            limit: Maximum number of timeframes to fetch
+        Returns:
+            DataFrame of the klines, empty on error
+        """
+        formatted_symbol = symbol.replace("/", "")
+        try:
+            client = self._get_async_client()
+            if timeframe not in BINANCE_INTERVALS:
+                start_ts, end_ts = self._resampled_source_range(timeframe, end_time, limit)
+                klines = await client.futures_historical_klines(
+                    symbol=formatted_symbol,
+                    interval=RESAMPLE_SOURCE_TIMEFRAME,
+                    start_str=start_ts,
+                    end_str=end_ts,
+                    limit=None
+                )
+                return resample_klines(self._convert_timestamps(self._klines_to_frame(klines)), timeframe)
+
+            klines = await client.futures_historical_klines_with_end_time(
+                symbol=formatted_symbol,
+                interval=self._format_timeframe(timeframe),
+                end_str=end_time.strftime("%Y-%m-%d %H:%M:%S"),
+                limit=limit
+            )
+            return self._convert_timestamps(self._klines_to_frame(klines))
 
         except Exception as e:
             logger.error(f"Error fetching latest data for {formatted_symbol} {timeframe}: {e}")
             return pd.DataFrame()
 
+    def _get_async_client(self) -> AsyncClient:
+        """
+        Get the shared AsyncClient of the credentials for the running event loop.
+        """
+        return client_registry.get_async_client(self.api_key, self.api_secret)
+
+    async def aclose(self) -> None:
+        """
+        Close the aiohttp sessions opened in the running event loop.
+        """
+        await client_registry.aclose()
+
     def get_latest_multi_timeframe_data(
             self,
             symbol: str,
@@ -258,7 +585,8 @@ class BinanceDataProvider:
             symbol: str,
             timeframes: List[str],
             start_date: Optional[datetime] = None,
-            end_date: Optional[datetime] = None
+            end_date: Optional[datetime] = None,
+            resample: Optional[bool] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         Get data for multiple timeframes for a single symbol.
@@ -268,19 +596,34 @@ class BinanceDataProvider:
             timeframes: List of timeframes (e.g., ['5m', '15m', '1h'])
             start_date: Start date for historical data
             end_date: End date for historical data
+            resample: Whether to download 1m candles once and resample every timeframe from them,
+                by default when 1m or an interval Binance does not serve is requested
 
         Returns:
             Dictionary of DataFrames for each timeframe
         """
         result = {}
 
+        # the 1m candles feed every interval once they are downloaded anyway
+        if resample is None:
+            resample = (RESAMPLE_SOURCE_TIMEFRAME in timeframes
+                        or any(timeframe not in BINANCE_INTERVALS for timeframe in timeframes))
+        source = None
+        if resample:
+            source = self.get_historical_klines(symbol, RESAMPLE_SOURCE_TIMEFRAME, start_date, end_date)
+
         for timeframe in timeframes:
-            df = self.get_historical_klines(
-                symbol=symbol,
-                timeframe=timeframe,
-                start_date=start_date,
-                end_date=end_date
-            )
+            if source is None:
+                df = self.get_historical_klines(
+                    symbol=symbol,
+                    timeframe=timeframe,
+                    start_date=start_date,
+                    end_date=end_date
+                )
+            elif timeframe == RESAMPLE_SOURCE_TIMEFRAME or source.empty:
+                df = source
+            else:
+                df = self._resample_since(source, timeframe, start_date)
 
             if not df.empty:
                 result[timeframe] = df
@@ -312,24 +655,29 @@ class BinanceDataProvider:
                 limit=limit
             )
 
-            # Create a DataFrame from the klines data
-            df = pd.DataFrame(klines, columns=COLUMNS)
-
-            # Convert types
-            for col in NUMERIC_COLUMNS:
-                df[col] = pd.to_numeric(df[col])
-
-            # Convert timestamps to datetime
-            df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
-            df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
-
-            return df
+            return self._convert_timestamps(self._klines_to_frame(klines))
 
         except Exception as e:
             logger.error(f"Error fetching latest data for {formatted_symbol} {timeframe}: {e}")
             return pd.DataFrame()
 
 
+@lru_cache(maxsize=None)
+def get_data_provider() -> BinanceDataProvider:
+    """
+    Get the BinanceDataProvider of the process for public data, created on first use.
+    """
+    return BinanceDataProvider()
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
 # Simple test function
 def test_data_provider():
     provider = BinanceDataProvider()
@@ -1,26 +1,29 @@
 import os, math, time
 from decimal import Decimal, ROUND_DOWN
-from binance.client import Client
+from functools import lru_cache
 from dotenv import load_dotenv
+from src.gateway.binance.client import Client
+from src.utils.binance_clients import client_registry
 from src.utils.logger import setup_logger
 
 load_dotenv()
 logger = setup_logger()
 
 # === CLIENT ===
-bn_client = Client(
-    api_key=os.getenv("BINANCE_API_KEY"),
-    api_secret=os.getenv("BINANCE_API_SECRET"),
-    tld="com",
-)
+def _client() -> Client:
+    # shared pooled client, created on first use instead of at import
+    return client_registry.get_client(os.getenv("BINANCE_API_KEY"), os.getenv("BINANCE_API_SECRET"))
+
 
 # cache exchange-info to avoid extra calls
-_EX_INFO = {s["symbol"]: s for s in bn_client.get_exchange_info()["symbols"]}
+@lru_cache(maxsize=1)
+def _exchange_info() -> dict:
+    return {s["symbol"]: s for s in _client().get_exchange_info()["symbols"]}
 
 
 # === UTILS ===
 def _lot_step(symbol: str) -> tuple[Decimal, Decimal]:
-    info = _EX_INFO.get(symbol)
+    info = _exchange_info().get(symbol)
     if not info:
         raise ValueError(f"{symbol} not listed on Binance.")
     f = next(f for f in info["filters"] if f["filterType"] == "LOT_SIZE")
@@ -40,7 +43,7 @@ def to_binance_symbol(symbol: str) -> str:
     return symbol.replace("-", "").upper()
 
 def _price(symbol: str) -> float:
-    return float(bn_client.get_symbol_ticker(symbol=symbol)["price"])
+    return float(_client().get_symbol_ticker(symbol=symbol)["price"])
 
 # === EXECUTION ===
 def place_binance_order(
@@ -83,7 +86,7 @@ def place_binance_order(
 
     side, effect = op_map[operation]
     try:
-        res = bn_client.create_margin_order(
+        res = _client().create_margin_order(
             symbol=symbol,
             side=side,
             type="MARKET",
@@ -99,7 +102,7 @@ def place_binance_order(
 def _cost_basis(symbol: str, qty: float, is_long: bool) -> float:
     if qty == 0:
         return 0.0
-    trades = bn_client.get_margin_trades(symbol=symbol, limit=1000)
+    trades = _client().get_margin_trades(symbol=symbol, limit=1000)
     trades = [t for t in trades if t["isBuyer"] is is_long]
     trades.sort(key=lambda x: x["time"], reverse=True)
     q = c = 0.0
@@ -118,7 +121,7 @@ def get_binance_margin_positions():
     """Return live margin positions (filled and still open)."""
     pos = []
     try:
-        acc = bn_client.get_margin_account()
+        acc = _client().get_margin_account()
 
         for a in acc["userAssets"]:
             asset = a["asset"]
@@ -195,7 +198,7 @@ def build_portfolio_from_binance_assets(settings):
 
     # --- Cash USDC ------------------------------------------------------
     try:
-        acc = bn_client.get_margin_account()
+        acc = _client().get_margin_account()
         usdc = next((a for a in acc["userAssets"] if a["asset"] == "USDC"), {"free": "0"})
         port["available_USDC"] = float(usdc["free"])
     except Exception as e:
@@ -220,7 +223,7 @@ def build_portfolio_from_binance_assets(settings):
         }
 
     # --- Available margin -------------------------------
-    margin_summary = margin_summary_usdc(bn_client)
+    margin_summary = margin_summary_usdc(_client())
     logger.debug(f"[ℹ️] Margin summary: {margin_summary}")
     logger.debug(f"[ℹ️] Available USDC: {port['available_USDC']:.2f} USDC")
     
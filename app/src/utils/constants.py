@@ -12,8 +12,29 @@ COLUMNS = [
 NUMERIC_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'quote_volume',
                    'count', 'taker_buy_volume', 'taker_buy_quote_volume']
 
+# Typed columns persisted by the kline store (epoch ms timestamps, no 'ignore' field)
+KLINE_DTYPES = {
+    'open_time': 'int64',
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'float64',
+    'close_time': 'int64',
+    'quote_volume': 'float64',
+    'count': 'int64',
+    'taker_buy_volume': 'float64',
+    'taker_buy_quote_volume': 'float64',
+}
+
+# Kline intervals served by Binance, the others are resampled from 1m candles
+BINANCE_INTERVALS = {'1s', '1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w', '1M'}
+
 QUANTITY_DECIMALS = 3
 
+# Number of candles per interval handed to the strategies on each run
+HISTORY_CANDLES = 500
+
 class Interval(Enum):
     MIN_1 = "1m"
     MIN_2 = "2m"
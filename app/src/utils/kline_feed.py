@@ -0,0 +1,91 @@
+"""
+Kline Feed Module
+
+This module serves preloaded klines as point-in-time slices, so backtests can replay every
+configured interval without calling the exchange on each bar.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.indicators.general_indicators import calculate_signal_history
+from src.utils.constants import HISTORY_CANDLES
+
+
+class HistoricalKlineFeed:
+    """
+    Preloaded klines per (ticker, interval), sliced as of a point in time.
+
+    A candle is visible at time t only once it has closed (close_time <= t), so a slice never
+    contains data from the future of t.
+    """
+
+    def __init__(self):
+        self._frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self._close_times: Dict[Tuple[str, str], np.ndarray] = {}
+        self._signal_histories: Dict[Tuple[str, str], Dict[str, pd.DataFrame]] = {}
+
+    def add(self, ticker: str, interval: str, df: pd.DataFrame) -> None:
+        """
+        Register the klines of a ticker and interval.
+
+        Args:
+            ticker: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            df: Klines sorted by open_time, with a datetime close_time column
+        """
+        df = df.reset_index(drop=True)
+        self._frames[(ticker, interval)] = df
+        self._close_times[(ticker, interval)] = df["close_time"].to_numpy(dtype="datetime64[ns]").view("int64")
+        self._signal_histories.pop((ticker, interval), None)
+
+    def as_of(
+            self,
+            ticker: str,
+            interval: str,
+            end_time: datetime,
+            limit: int = HISTORY_CANDLES,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get the last closed candles at end_time.
+
+        The slice is located with a binary search on close_time and is a view of the
+        preloaded frame, nothing is copied.
+
+        Args:
+            ticker: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            end_time: Point in time of the slice
+            limit: Maximum number of candles to return
+
+        Returns:
+            DataFrame with at most limit candles, None if the ticker/interval was never added
+        """
+        key = (ticker, interval)
+        if key not in self._frames:
+            return None
+
+        end = np.searchsorted(self._close_times[key], pd.Timestamp(end_time).value, side="right")
+        return self._frames[key].iloc[max(0, end - limit):end]
+
+    def signal_history(self, ticker: str, interval: str) -> Dict[str, pd.DataFrame]:
+        """
+        Get the technical signals of every preloaded candle, computed once on first use.
+
+        Rows are positioned like the preloaded frame, so the last index label of an as_of slice
+        is the position of its signals.
+
+        Args:
+            ticker: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+
+        Returns:
+            Output of calculate_signal_history for the whole preloaded frame
+        """
+        key = (ticker, interval)
+        if key not in self._signal_histories:
+            self._signal_histories[key] = calculate_signal_history(self._frames[key], hurst_window=HISTORY_CANDLES)
+        return self._signal_histories[key]
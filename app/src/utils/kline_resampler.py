@@ -0,0 +1,190 @@
+"""
+Kline Resampler Module
+
+This module derives candles of any interval (including intervals Binance does not serve, e.g.
+'2m', '10m', '7m') from a finer series, typically the stored 1m candles, so one download can
+feed every configured interval.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.gateway.binance.helpers import interval_to_milliseconds
+
+# Binance weekly candles open on Monday 00:00 UTC, 4 days after the epoch (a Thursday)
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+# Aggregation of each kline column over a bucket, other columns are dropped
+_FIRST_COLUMNS = ('open',)
+_LAST_COLUMNS = ('close',)
+_MAX_COLUMNS = ('high',)
+_MIN_COLUMNS = ('low',)
+_SUM_COLUMNS = ('volume', 'quote_volume', 'count', 'taker_buy_volume', 'taker_buy_quote_volume')
+
+
+def interval_offset_ms(interval: str) -> int:
+    """
+    Get the offset from the epoch of the bucket boundaries of an interval.
+
+    Args:
+        interval: Time interval (e.g., '7m', '1h', '1w')
+
+    Returns:
+        Offset in milliseconds, buckets open at offset + k * interval
+    """
+    return WEEK_OFFSET_MS if interval.endswith('w') else 0
+
+
+def bucket_open_time(open_time_ms: int, interval: str) -> int:
+    """
+    Get the open time of the bucket of an interval holding a timestamp.
+
+    Args:
+        open_time_ms: Epoch ms timestamp
+        interval: Time interval (e.g., '7m', '1h', '1w')
+
+    Returns:
+        Epoch ms open time of the bucket
+    """
+    interval_ms = _interval_ms(interval)
+    offset = interval_offset_ms(interval)
+    return (open_time_ms - offset) // interval_ms * interval_ms + offset
+
+
+def resample_klines(df: pd.DataFrame, interval: str) -> pd.DataFrame:
+    """
+    Aggregate klines into candles of a coarser interval.
+
+    Every bucket holding at least one source candle yields a candle: first open, highest high,
+    lowest low, last close, summed volumes and trade counts, and the Binance close_time of the
+    bucket (open_time + interval - 1 ms). The last bucket may be partial.
+
+    Args:
+        df: Klines sorted by open_time, with epoch ms or datetime open_time
+        interval: Target interval (e.g., '2m', '10m', '7m', '1w')
+
+    Returns:
+        DataFrame of the resampled candles, with timestamps of the same type as df
+    """
+    interval_ms = _interval_ms(interval)
+    offset = interval_offset_ms(interval)
+    columns = [col for col in df.columns
+               if col in ('open_time', 'close_time') + _FIRST_COLUMNS + _LAST_COLUMNS + _MAX_COLUMNS
+               + _MIN_COLUMNS + _SUM_COLUMNS]
+    if df.empty:
+        return df[columns].iloc[0:0]
+
+    is_datetime = pd.api.types.is_datetime64_any_dtype(df['open_time'])
+    open_time = _to_epoch_ms(df['open_time'])
+    buckets = (open_time - offset) // interval_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(df)] - 1
+    bucket_open = buckets[starts] * interval_ms + offset
+
+    result = {}
+    for col in columns:
+        if col == 'open_time':
+            values = bucket_open
+        elif col == 'close_time':
+            values = bucket_open + interval_ms - 1
+        elif col in _FIRST_COLUMNS:
+            values = df[col].to_numpy()[starts]
+        elif col in _LAST_COLUMNS:
+            values = df[col].to_numpy()[ends]
+        elif col in _MAX_COLUMNS:
+            values = np.maximum.reduceat(df[col].to_numpy(), starts)
+        elif col in _MIN_COLUMNS:
+            values = np.minimum.reduceat(df[col].to_numpy(), starts)
+        else:
+            values = np.add.reduceat(df[col].to_numpy(), starts)
+        if is_datetime and col in ('open_time', 'close_time'):
+            values = pd.to_datetime(values, unit='ms')
+        result[col] = values
+    return pd.DataFrame(result)
+
+
+class KlineResampler:
+    """
+    Incremental resampling of a live kline series.
+
+    Source candles are fed with update(), including new versions of the candle that is still
+    forming. Only the source candles of the current bucket are kept, so each update costs
+    O(candles per bucket) whatever the length of the series. A bucket is closed once a source
+    candle of a later bucket arrives.
+    """
+
+    def __init__(self, interval: str, max_bars: Optional[int] = None):
+        """
+        Args:
+            interval: Target interval (e.g., '2m', '10m', '7m', '1w')
+            max_bars: Number of closed candles to keep, all if None
+        """
+        self.interval = interval
+        self.max_bars = max_bars
+        self._interval_ms = _interval_ms(interval)
+        self._closed: List[pd.DataFrame] = []
+        self._closed_rows = 0
+        self._pending: Optional[pd.DataFrame] = None
+        self._partial: Optional[pd.DataFrame] = None
+
+    def update(self, klines: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add source candles, newer than or replacing the candles of the current bucket.
+
+        Args:
+            klines: Source klines sorted by open_time
+
+        Returns:
+            The resampled candles changed by the update, the last one possibly partial
+        """
+        if klines.empty:
+            return self._partial if self._partial is not None else resample_klines(klines, self.interval)
+        source = klines if self._pending is None else pd.concat([self._pending, klines], ignore_index=True)
+        if self._pending is not None:
+            source = source.drop_duplicates('open_time', keep='last').sort_values('open_time', ignore_index=True)
+
+        bars = resample_klines(source, self.interval)
+        last_open = bars['open_time'].iloc[-1]
+        if len(bars) > 1:
+            self._add_closed(bars.iloc[:-1])
+        self._pending = source[source['open_time'] >= last_open].reset_index(drop=True)
+        self._partial = bars.iloc[-1:].reset_index(drop=True)
+        return bars
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Get the resampled series: closed candles followed by the current partial candle.
+        """
+        if len(self._closed) > 1 or (self._closed and self.max_bars is not None):
+            # keep the closed candles as one frame so later calls do not concatenate them again
+            closed = pd.concat(self._closed, ignore_index=True)
+            if self.max_bars is not None:
+                closed = closed.iloc[-self.max_bars:].reset_index(drop=True)
+            self._closed = [closed]
+            self._closed_rows = len(closed)
+        frames = self._closed + ([self._partial] if self._partial is not None else [])
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def _add_closed(self, bars: pd.DataFrame) -> None:
+        self._closed.append(bars)
+        self._closed_rows += len(bars)
+        if self.max_bars is not None and self._closed_rows > 2 * self.max_bars:
+            self._closed = [pd.concat(self._closed, ignore_index=True).iloc[-self.max_bars:].reset_index(drop=True)]
+            self._closed_rows = self.max_bars
+
+
+def _interval_ms(interval: str) -> int:
+    interval_ms = interval_to_milliseconds(interval)
+    if interval_ms is None:
+        raise ValueError(f"Unsupported resampling interval: {interval}")
+    return interval_ms
+
+
+def _to_epoch_ms(times: pd.Series) -> np.ndarray:
+    if pd.api.types.is_datetime64_any_dtype(times):
+        return times.to_numpy(dtype='datetime64[ms]').view('int64')
+    return times.to_numpy(dtype='int64')
@@ -0,0 +1,310 @@
+"""
+Kline Store Module
+
+This module persists klines in a columnar, append-only Parquet store, one dataset per
+(market_type, symbol, interval). Each dataset is a directory of fragments named after the
+open_time range they cover, so coverage lookups never touch the data itself.
+"""
+
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.utils.constants import KLINE_DTYPES
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+MARKET_SPOT = "spot"
+MARKET_FUTURES = "futures"
+
+KLINE_SCHEMA = pa.schema([(name, pa.int64() if dtype == "int64" else pa.float64())
+                          for name, dtype in KLINE_DTYPES.items()])
+
+# adjacent fragments are compacted once a dataset grows past this many files
+MAX_FRAGMENTS = 32
+ROW_GROUP_SIZE = 65_536
+
+
+class KlineStore:
+    """
+    Columnar kline store with typed columns and range-based fragments.
+
+    Every fragment file is named ``<start>_<end>.parquet`` where ``start``/``end`` are the
+    inclusive open_time bounds (epoch ms) the fragment is known to cover completely. A write
+    that does not overlap stored data is appended as a new fragment; overlapping fragments are
+    merged. Adjacent fragments form one covered range and are compacted in bulk.
+    """
+
+    def __init__(self, root: Path):
+        """
+        Initialize the store.
+
+        Args:
+            root: Directory under which the datasets are stored
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dataset_dir(self, market_type: str, symbol: str, interval: str) -> Path:
+        return self.root / market_type / symbol / interval
+
+    def _fragments(self, market_type: str, symbol: str, interval: str) -> List[Tuple[int, int, Path]]:
+        """
+        List the fragments of a dataset as sorted (start, end, path) tuples.
+        """
+        dataset_dir = self._dataset_dir(market_type, symbol, interval)
+        if not dataset_dir.exists():
+            return []
+
+        fragments = []
+        for path in dataset_dir.glob("*.parquet"):
+            try:
+                start, end = (int(part) for part in path.stem.split("_"))
+            except ValueError:
+                logger.warning(f"Ignoring unexpected file in kline store: {path}")
+                continue
+            fragments.append((start, end, path))
+        return sorted(fragments)
+
+    def covered_ranges(self, market_type: str, symbol: str, interval: str) -> List[Tuple[int, int]]:
+        """
+        Get the open_time ranges (inclusive, epoch ms) held by the store.
+
+        Args:
+            market_type: Market type (MARKET_SPOT or MARKET_FUTURES)
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+
+        Returns:
+            Sorted list of disjoint (start, end) tuples, adjacent fragments coalesced
+        """
+        ranges: List[Tuple[int, int]] = []
+        for start, end, _ in self._fragments(market_type, symbol, interval):
+            if ranges and start <= ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], end))
+            else:
+                ranges.append((start, end))
+        return ranges
+
+    def missing_ranges(
+            self,
+            market_type: str,
+            symbol: str,
+            interval: str,
+            start_ms: int,
+            end_ms: int,
+    ) -> List[Tuple[int, int]]:
+        """
+        Get the parts of [start_ms, end_ms] that are not held by the store.
+
+        Args:
+            market_type: Market type (MARKET_SPOT or MARKET_FUTURES)
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            start_ms: Inclusive lower open_time bound
+            end_ms: Inclusive upper open_time bound
+
+        Returns:
+            Sorted list of (start, end) gaps, empty if the range is fully held
+        """
+        missing = []
+        cursor = start_ms
+        for start, end in self.covered_ranges(market_type, symbol, interval):
+            if end < cursor:
+                continue
+            if start > end_ms:
+                break
+            if start > cursor:
+                missing.append((cursor, start - 1))
+            cursor = end + 1
+        if cursor <= end_ms:
+            missing.append((cursor, end_ms))
+        return missing
+
+    def covers(self, market_type: str, symbol: str, interval: str, start_ms: int, end_ms: int) -> bool:
+        """
+        Check whether the range [start_ms, end_ms] is fully held by the store.
+        """
+        return not self.missing_ranges(market_type, symbol, interval, start_ms, end_ms)
+
+    def holes(
+            self,
+            market_type: str,
+            symbol: str,
+            interval: str,
+            interval_ms: int,
+            start_ms: Optional[int] = None,
+            end_ms: Optional[int] = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        Get the ranges of at least one candle that are held by the store but have no candles,
+        e.g. exchange outages.
+
+        Holes are part of the covered ranges, so they are never requested again.
+
+        Args:
+            market_type: Market type (MARKET_SPOT or MARKET_FUTURES)
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            interval_ms: Length of one candle in milliseconds
+            start_ms: Inclusive lower open_time bound, unbounded if None
+            end_ms: Inclusive upper open_time bound, unbounded if None
+
+        Returns:
+            Sorted list of (start, end) open_time ranges without candles
+        """
+        lower = start_ms if start_ms is not None else -2 ** 63
+        upper = end_ms if end_ms is not None else 2 ** 63 - 1
+
+        holes = []
+        for start, end in self.covered_ranges(market_type, symbol, interval):
+            start, end = max(start, lower), min(end, upper)
+            if start > end:
+                continue
+
+            stored = self.read(market_type, symbol, interval, start, end, columns=["open_time"])
+            open_times = stored["open_time"].to_numpy()
+            if not len(open_times):
+                holes.append((start, end))
+                continue
+
+            if open_times[0] - start >= interval_ms:
+                holes.append((start, int(open_times[0]) - 1))
+            for i in np.flatnonzero(np.diff(open_times) > interval_ms):
+                holes.append((int(open_times[i]) + interval_ms, int(open_times[i + 1]) - 1))
+            if end - open_times[-1] >= interval_ms:
+                holes.append((int(open_times[-1]) + interval_ms, end))
+        return [(start, end) for start, end in holes if end - start + 1 >= interval_ms]
+
+    def read(
+            self,
+            market_type: str,
+            symbol: str,
+            interval: str,
+            start_ms: Optional[int] = None,
+            end_ms: Optional[int] = None,
+            columns: Optional[List[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Read the stored klines whose open_time falls in [start_ms, end_ms].
+
+        Only the fragments intersecting the range are opened, and the range is pushed down to
+        the Parquet reader so row groups outside of it are skipped.
+
+        Args:
+            market_type: Market type (MARKET_SPOT or MARKET_FUTURES)
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            start_ms: Inclusive lower open_time bound, unbounded if None
+            end_ms: Inclusive upper open_time bound, unbounded if None
+            columns: Columns to read, all of them if None
+
+        Returns:
+            DataFrame with typed columns, sorted by open_time
+        """
+        lower = start_ms if start_ms is not None else -2 ** 63
+        upper = end_ms if end_ms is not None else 2 ** 63 - 1
+
+        filters = [("open_time", ">=", lower), ("open_time", "<=", upper)]
+        tables = [pq.read_table(path, columns=columns, filters=filters, schema=KLINE_SCHEMA)
+                  for start, end, path in self._fragments(market_type, symbol, interval)
+                  if start <= upper and lower <= end]
+
+        if not tables:
+            empty = KLINE_SCHEMA.empty_table()
+            return (empty.select(columns) if columns else empty).to_pandas()
+        return pa.concat_tables(tables).to_pandas()
+
+    def write(
+            self,
+            market_type: str,
+            symbol: str,
+            interval: str,
+            df: pd.DataFrame,
+            start_ms: int,
+            end_ms: int,
+    ) -> None:
+        """
+        Persist klines fetched for the open_time range [start_ms, end_ms].
+
+        The rows are appended as a new fragment. Fragments overlapping the range are merged with
+        the new rows (new rows win on duplicate open_time) into that fragment instead.
+
+        Args:
+            market_type: Market type (MARKET_SPOT or MARKET_FUTURES)
+            symbol: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            df: Klines with the KLINE_DTYPES columns and epoch ms timestamps
+            start_ms: Inclusive lower open_time bound of the fetched range
+            end_ms: Inclusive upper open_time bound of the fetched range
+        """
+        if end_ms < start_ms:
+            return
+
+        df = df.loc[(df["open_time"] >= start_ms) & (df["open_time"] <= end_ms), list(KLINE_DTYPES)]
+        df = df.astype(KLINE_DTYPES)
+
+        fragments = self._fragments(market_type, symbol, interval)
+        overlapping = [(start, end, path) for start, end, path in fragments
+                       if start <= end_ms and start_ms <= end]
+        self._write_fragment(market_type, symbol, interval, overlapping, df, start_ms, end_ms)
+
+        if len(fragments) - len(overlapping) + 1 > MAX_FRAGMENTS:
+            self.compact(market_type, symbol, interval)
+
+    def compact(self, market_type: str, symbol: str, interval: str) -> None:
+        """
+        Merge every run of adjacent fragments of a dataset into a single fragment.
+        """
+        runs: List[List[Tuple[int, int, Path]]] = []
+        for fragment in self._fragments(market_type, symbol, interval):
+            if runs and fragment[0] <= runs[-1][-1][1] + 1:
+                runs[-1].append(fragment)
+            else:
+                runs.append([fragment])
+
+        for run in runs:
+            if len(run) > 1:
+                self._write_fragment(market_type, symbol, interval, run, None, run[0][0],
+                                     max(end for _, end, _ in run))
+
+    def _write_fragment(
+            self,
+            market_type: str,
+            symbol: str,
+            interval: str,
+            merged: List[Tuple[int, int, Path]],
+            df: Optional[pd.DataFrame],
+            start_ms: int,
+            end_ms: int,
+    ) -> None:
+        """
+        Replace the merged fragments by one fragment holding their rows plus df.
+        """
+        frames = [pq.read_table(path, schema=KLINE_SCHEMA).to_pandas() for _, _, path in merged]
+        if df is not None:
+            frames.append(df)
+        data = pd.concat(frames, ignore_index=True)
+        data = data.drop_duplicates(subset="open_time", keep="last").sort_values("open_time")
+
+        new_start = min([start_ms] + [start for start, _, _ in merged])
+        new_end = max([end_ms] + [end for _, end, _ in merged])
+
+        dataset_dir = self._dataset_dir(market_type, symbol, interval)
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        target = dataset_dir / f"{new_start}_{new_end}.parquet"
+        tmp = target.with_suffix(".tmp")
+
+        table = pa.Table.from_pandas(data, schema=KLINE_SCHEMA, preserve_index=False)
+        pq.write_table(table, tmp, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp, target)
+
+        for _, _, path in merged:
+            if path != target:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,471 @@
+"""
+Live Kline Feed Module
+
+This module keeps the recent klines of every (ticker, interval) of a live deployment in memory:
+backfilled once over REST, then updated from the Binance futures kline websocket streams, so the
+workflow reads its candles without any network call.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.gateway.binance.helpers import interval_to_milliseconds
+from src.indicators.streaming import AdxState, AtrState, BollingerState, EmaState, RsiState, StreamingIndicator
+from src.utils.binance_clients import client_registry
+from src.utils.binance_data_provider import get_data_provider, RESAMPLE_SOURCE_TIMEFRAME
+from src.utils.constants import BINANCE_INTERVALS, HISTORY_CANDLES, KLINE_DTYPES
+from src.utils.kline_resampler import KlineResampler, bucket_open_time
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+KLINE_FIELDS = list(KLINE_DTYPES)
+_OPEN_TIME = KLINE_FIELDS.index('open_time')
+# Fields of a websocket kline event, in KLINE_DTYPES order
+_EVENT_FIELDS = ('t', 'o', 'h', 'l', 'c', 'v', 'T', 'q', 'n', 'V', 'Q')
+_HIGH, _LOW, _CLOSE = (KLINE_FIELDS.index(field) for field in ('high', 'low', 'close'))
+
+# Streaming indicators kept per ticker and interval, with the windows of calculate_signal_history
+LIVE_INDICATORS: Dict[str, Callable[[], StreamingIndicator]] = {
+    'ema_8': lambda: EmaState(8),
+    'ema_21': lambda: EmaState(21),
+    'ema_55': lambda: EmaState(55),
+    'rsi_14': lambda: RsiState(14),
+    'rsi_28': lambda: RsiState(28),
+    'atr_14': lambda: AtrState(14),
+    'adx_14': lambda: AdxState(14),
+    'bollinger_bands_20': lambda: BollingerState(20),
+}
+# Indicators updated with the high, low and close of a kline, the others with its close
+_HLC_INDICATORS = (AtrState, AdxState)
+# Seconds before retrying a failed gap backfill, doubled on each failure up to the maximum
+BACKFILL_RETRY_DELAY = 1.0
+BACKFILL_MAX_RETRY_DELAY = 60.0
+# Fetches missing the last klines of a gap before they are taken as missing from the exchange
+BACKFILL_INCOMPLETE_ATTEMPTS = 3
+# Klines of a stream buffered while its gap is backfilled, the oldest are dropped beyond
+BACKLOG_KLINES = 500
+
+
+class KlineRingBuffer:
+    """
+    Fixed-capacity buffer of the last closed klines of one ticker and interval.
+
+    Rows are float64 arrays in KLINE_DTYPES order (epoch ms timestamps and trade counts are exact
+    below 2**53). Appending overwrites the oldest row once the buffer is full.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._values = np.empty((capacity, len(KLINE_FIELDS)), dtype=np.float64)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if not self._size:
+            return None
+        return int(self._values[(self._start + self._size - 1) % self.capacity, _OPEN_TIME])
+
+    def extend(self, rows: np.ndarray) -> None:
+        """
+        Add klines sorted by open_time. Rows older than the last kline are ignored, a row with the
+        same open_time replaces it.
+
+        Args:
+            rows: (n, len(KLINE_DTYPES)) array
+        """
+        last = self.last_open_time
+        if last is not None:
+            rows = rows[rows[:, _OPEN_TIME] >= last]
+            if len(rows) and rows[0, _OPEN_TIME] == last:
+                self._values[(self._start + self._size - 1) % self.capacity] = rows[0]
+                rows = rows[1:]
+        rows = rows[-self.capacity:]
+        if not len(rows):
+            return
+        positions = (self._start + self._size + np.arange(len(rows))) % self.capacity
+        self._values[positions] = rows
+        overflow = max(0, self._size + len(rows) - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._size = min(self.capacity, self._size + len(rows))
+
+    def values(self, end_ms: Optional[int] = None, limit: Optional[int] = None) -> np.ndarray:
+        """
+        Get a copy of the klines opened at or before end_ms, oldest first.
+
+        Args:
+            end_ms: Upper open_time bound, unbounded if None
+            limit: Maximum number of klines, the most recent ones are kept
+
+        Returns:
+            (n, len(KLINE_DTYPES)) array
+        """
+        ordered = np.roll(self._values, -self._start, axis=0)[:self._size] if self._start else self._values[:self._size]
+        end = self._size if end_ms is None else int(np.searchsorted(ordered[:, _OPEN_TIME], end_ms, side='right'))
+        start = 0 if limit is None else max(0, end - limit)
+        return ordered[start:end].copy()
+
+
+class _IndicatorSet:
+    """Streaming indicators of one ticker and interval, updated once per closed kline."""
+
+    def __init__(self, factories: Dict[str, Callable[[], StreamingIndicator]]):
+        self.states = {name: factory() for name, factory in factories.items()}
+        # open time of the last kline applied
+        self.last_open_time: Optional[int] = None
+
+    def update(self, rows: np.ndarray) -> None:
+        """Apply closed klines sorted by open_time, the ones already applied are skipped."""
+        if self.last_open_time is not None:
+            rows = rows[rows[:, _OPEN_TIME] > self.last_open_time]
+        for row in rows:
+            high, low, close = float(row[_HIGH]), float(row[_LOW]), float(row[_CLOSE])
+            for state in self.states.values():
+                if isinstance(state, _HLC_INDICATORS):
+                    state.update(high, low, close)
+                else:
+                    state.update(close)
+        if len(rows):
+            self.last_open_time = int(rows[-1, _OPEN_TIME])
+
+    def values(self) -> Dict[str, Any]:
+        return {name: state.value for name, state in self.states.items()}
+
+
+class _Stream:
+    """State of one websocket kline stream and the intervals it feeds."""
+
+    def __init__(self, ticker: str, interval: str):
+        self.ticker = ticker
+        self.interval = interval
+        self.interval_ms = interval_to_milliseconds(interval)
+        # open time of the last closed kline received
+        self.last_closed: Optional[int] = None
+        # target interval -> resampler, None when the stream interval is the target
+        self.targets: Dict[str, Optional[KlineResampler]] = {}
+        # open time -> last event of each kline received while a gap is being backfilled
+        self.backlog: Optional[Dict[int, dict]] = None
+
+
+class LiveKlineFeed:
+    """
+    In-memory klines of a live deployment, fed by the Binance futures kline websocket streams.
+
+    Every (ticker, interval) is backfilled once over REST, then kept up to date by the combined
+    websocket connections of a BinanceStreamMultiplexer: closed klines ('x': true) are appended to a KlineRingBuffer and the
+    candle still forming is kept aside, like the last candle of the REST endpoint. Intervals
+    Binance does not serve are resampled from the 1m stream. A jump in the open times of a stream
+    (missed events, reconnection) is backfilled over REST before the stream is updated further,
+    retried until the missed klines are fetched or known to be missing from the exchange (e.g. a
+    trading halt); meanwhile the intervals it feeds are stale
+    and as_of returns None, for the caller to fetch them over REST. The streaming indicators of every (ticker, interval) are updated with each closed kline, in
+    constant time, instead of being recomputed from the whole history on each run.
+
+    Usage:
+        feed = LiveKlineFeed(tickers, intervals)
+        await feed.start()
+        df = feed.as_of('BTCUSDT', '1h', datetime.now())
+        ema = feed.indicators('BTCUSDT', '1h')['ema_21']
+        await feed.stop()
+    """
+
+    def __init__(
+            self,
+            tickers: List[str],
+            intervals: List[str],
+            capacity: int = 2 * HISTORY_CANDLES,
+            indicators: Optional[Dict[str, Callable[[], StreamingIndicator]]] = None,
+    ):
+        """
+        Args:
+            tickers: Trading symbols (e.g., ['BTCUSDT'])
+            intervals: Time intervals (e.g., ['1h', '5m', '10m']) or Interval members
+            capacity: Number of closed klines kept per ticker and interval
+            indicators: Factories of the streaming indicators kept per ticker and interval, by
+                name, LIVE_INDICATORS if None
+        """
+        self.tickers = list(tickers)
+        self.intervals = [getattr(interval, 'value', interval) for interval in intervals]
+        self.capacity = capacity
+        self._buffers: Dict[Tuple[str, str], KlineRingBuffer] = {}
+        self._partials: Dict[Tuple[str, str], Optional[np.ndarray]] = {}
+        self._streams: Dict[Tuple[str, str], _Stream] = {}
+        self._indicators: Dict[Tuple[str, str], _IndicatorSet] = {}
+        # (ticker, interval) -> stream feeding it
+        self._sources: Dict[Tuple[str, str], _Stream] = {}
+        self._backfills: Set[asyncio.Task] = set()
+        self._closed = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+
+        for ticker in self.tickers:
+            for interval in self.intervals:
+                self._buffers[(ticker, interval)] = KlineRingBuffer(capacity)
+                self._partials[(ticker, interval)] = None
+                self._indicators[(ticker, interval)] = _IndicatorSet(
+                    LIVE_INDICATORS if indicators is None else indicators)
+                stream_interval = interval if interval in BINANCE_INTERVALS else RESAMPLE_SOURCE_TIMEFRAME
+                stream = self._streams.setdefault((ticker, stream_interval), _Stream(ticker, stream_interval))
+                # the closed candles are kept by the ring buffer, not by the resampler
+                stream.targets[interval] = None if interval == stream_interval else KlineResampler(interval, max_bars=1)
+                self._sources[(ticker, interval)] = stream
+
+    async def start(self) -> None:
+        """
+        Backfill every ticker and interval over REST, then start listening to the websocket streams.
+        """
+        await asyncio.gather(*(self._backfill_stream(stream) for stream in self._streams.values()))
+        for key, indicators in self._indicators.items():
+            indicators.update(self._buffers[key].values())
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """
+        Stop listening to the websocket streams.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._backfills):
+            task.cancel()
+        await asyncio.gather(*self._backfills, return_exceptions=True)
+
+    def as_of(
+            self,
+            ticker: str,
+            interval: str,
+            end_time: datetime,
+            limit: int = HISTORY_CANDLES,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Get the last klines opened at end_time, the last one possibly still forming.
+
+        Args:
+            ticker: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+            end_time: Point in time of the slice
+            limit: Maximum number of candles to return
+
+        Returns:
+            DataFrame shaped like BinanceDataProvider.get_history_klines_with_end_time, None if the
+            ticker/interval is not fed or stale
+        """
+        key = (ticker, interval)
+        if key not in self._buffers or self._stale(key):
+            return None
+        end_ms = int(end_time.timestamp() * 1000)
+        values = self._buffers[key].values(end_ms, limit)
+        partial = self._partials[key]
+        if partial is not None and partial[_OPEN_TIME] <= end_ms and (
+                not len(values) or partial[_OPEN_TIME] > values[-1, _OPEN_TIME]):
+            values = np.vstack([values, partial])[-limit:]
+        return _to_frame(values)
+
+    def indicators(self, ticker: str, interval: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the streaming indicator values as of the last closed kline.
+
+        Args:
+            ticker: Trading symbol (e.g., 'BTCUSDT')
+            interval: Time interval (e.g., '1h', '5m', '1d')
+
+        Returns:
+            Indicator values by name, NaN until their window is filled, None if the
+            ticker/interval is not fed or stale
+        """
+        key = (ticker, interval)
+        if key not in self._indicators or self._stale(key):
+            return None
+        return self._indicators[key].values()
+
+    def _stale(self, key: Tuple[str, str]) -> bool:
+        # klines are missing until the gap of the stream is backfilled
+        return self._sources[key].backlog is not None
+
+    async def wait_for_close(self, interval: str, timeout: Optional[float] = None) -> None:
+        """
+        Wait until every ticker received a new closed kline of an interval.
+
+        Args:
+            interval: Time interval (e.g., '1h', '5m', '10m')
+            timeout: Seconds to wait at most, raises asyncio.TimeoutError after that
+        """
+        last = {ticker: self._buffers[(ticker, interval)].last_open_time for ticker in self.tickers}
+
+        def closed() -> bool:
+            return all((self._buffers[(ticker, interval)].last_open_time or 0) > (last[ticker] or 0)
+                       for ticker in self.tickers)
+
+        async with self._closed:
+            await asyncio.wait_for(self._closed.wait_for(closed), timeout)
+
+    async def _listen(self) -> None:
+        # imported here: the websocket package imports the logger of src.utils, hence this module
+        from src.gateway.binance.ws.constants import WSQueuePolicy
+        from src.gateway.binance.ws.streams import BinanceSocketManager
+
+        streams = [f"{ticker.lower()}@kline_{interval}" for ticker, interval in self._streams]
+        socket_manager = BinanceSocketManager(client_registry.get_async_client())
+        # only the newest event of each kline matters, a burst never overflows the connection
+        socket_manager.ws_kwargs['queue_policy'] = WSQueuePolicy.CONFLATE
+        async with socket_manager.futures_stream_multiplexer() as multiplexer:
+            await multiplexer.subscribe(streams, callback=self._on_message)
+            # the multiplexer routes the messages until the task is cancelled
+            await asyncio.Event().wait()
+
+    async def _on_message(self, msg: dict) -> None:
+        if msg.get('e') == 'error':
+            logger.warning(f"Kline stream error {msg.get('type')}: {msg.get('m')}")
+            return
+        event = msg.get('data', msg)
+        if event.get('e') == 'kline':
+            await self._on_kline(event)
+
+    async def _on_kline(self, event: dict) -> None:
+        kline = event['k']
+        stream = self._streams.get((event['s'], kline['i']))
+        if stream is None:
+            return
+        if stream.backlog is not None:
+            stream.backlog[kline['t']] = event
+            if len(stream.backlog) > BACKLOG_KLINES:
+                # the klines dropped are backfilled once the backlog is replayed
+                del stream.backlog[next(iter(stream.backlog))]
+            return
+
+        open_time = kline['t']
+        if stream.last_closed is not None and open_time > stream.last_closed + stream.interval_ms:
+            # klines were missed, backfill them before applying this one
+            stream.backlog = {open_time: event}
+            task = asyncio.create_task(self._backfill_gap(stream, open_time))
+            self._backfills.add(task)
+            task.add_done_callback(self._backfills.discard)
+            return
+        await self._apply(stream, np.array([[float(kline[field]) for field in _EVENT_FIELDS]]), [kline['x']])
+
+    async def _apply(self, stream: _Stream, rows: np.ndarray, closed: List[bool]) -> None:
+        """Apply stream klines sorted by open_time, all closed except possibly the last one."""
+        for interval, resampler in stream.targets.items():
+            key = (stream.ticker, interval)
+            if resampler is None:
+                closed_rows = rows[:-1] if not closed[-1] else rows
+                self._partials[key] = None if closed[-1] else rows[-1]
+            else:
+                bars = resampler.update(pd.DataFrame(rows, columns=KLINE_FIELDS)).to_numpy(dtype=np.float64)
+                closed_rows = bars[:-1]
+                self._partials[key] = bars[-1]
+            self._buffers[key].extend(closed_rows)
+            self._indicators[key].update(closed_rows)
+        if closed[-1] or len(rows) > 1:
+            stream.last_closed = int(rows[-1 if closed[-1] else -2, _OPEN_TIME])
+            async with self._closed:
+                self._closed.notify_all()
+
+    async def _backfill_stream(self, stream: _Stream) -> None:
+        """Fill the buffers fed by a stream over REST."""
+        provider = get_data_provider()
+        now = datetime.now()
+        now_ms = int(time.time() * 1000)
+        resampled = {interval: resampler for interval, resampler in stream.targets.items() if resampler is not None}
+        for interval, resampler in stream.targets.items():
+            if resampler is not None:
+                continue
+            values = _frame_values(await provider.aget_history_klines_with_end_time(
+                symbol=stream.ticker, timeframe=interval, end_time=now, limit=self.capacity + 1))
+            closed = values[values[:, _OPEN_TIME] + stream.interval_ms <= now_ms]
+            self._buffers[(stream.ticker, interval)].extend(closed)
+            self._partials[(stream.ticker, interval)] = values[-1] if len(values) > len(closed) else None
+            if len(closed):
+                stream.last_closed = int(closed[-1, _OPEN_TIME])
+
+        if resampled:
+            for interval in resampled:
+                values = _frame_values(await provider.aget_history_klines_with_end_time(
+                    symbol=stream.ticker, timeframe=interval, end_time=now, limit=self.capacity + 1))
+                current = bucket_open_time(now_ms, interval)
+                self._buffers[(stream.ticker, interval)].extend(values[values[:, _OPEN_TIME] < current])
+            # the resamplers continue the current buckets from their source klines
+            bucket_ms = max(interval_to_milliseconds(interval) for interval in resampled)
+            source = _frame_values(await provider.aget_history_klines_with_end_time(
+                symbol=stream.ticker, timeframe=stream.interval, end_time=now,
+                limit=bucket_ms // stream.interval_ms + 1))
+            closed = source[source[:, _OPEN_TIME] + stream.interval_ms <= now_ms]
+            for interval, resampler in resampled.items():
+                rows = source[source[:, _OPEN_TIME] >= bucket_open_time(now_ms, interval)]
+                if len(rows):
+                    bars = resampler.update(pd.DataFrame(rows, columns=KLINE_FIELDS)).to_numpy(dtype=np.float64)
+                    self._partials[(stream.ticker, interval)] = bars[-1]
+            if len(closed):
+                stream.last_closed = int(closed[-1, _OPEN_TIME])
+
+    async def _backfill_gap(self, stream: _Stream, open_time: int) -> None:
+        """
+        Fetch the klines missed before open_time, then apply the events received meanwhile.
+
+        Failed fetches are retried with backoff, the stream stays stale and buffers its events
+        until then. Klines still missing from successful fetches, none at all or the last ones
+        after BACKFILL_INCOMPLETE_ATTEMPTS fetches, are taken as missing from the exchange.
+        """
+        missing = (open_time - stream.last_closed) // stream.interval_ms - 1
+        logger.warning(f"Backfilling {missing} {stream.interval} klines of {stream.ticker}")
+        delay = BACKFILL_RETRY_DELAY
+        incomplete = 0
+        while True:
+            try:
+                values = _frame_values(await get_data_provider().aget_history_klines_with_end_time(
+                    symbol=stream.ticker, timeframe=stream.interval,
+                    end_time=datetime.fromtimestamp((open_time - 1) / 1000), limit=min(missing, self.capacity)))
+                values = values[(values[:, _OPEN_TIME] > stream.last_closed) & (values[:, _OPEN_TIME] < open_time)]
+                if len(values) and values[-1, _OPEN_TIME] == open_time - stream.interval_ms:
+                    break
+                incomplete += 1
+                if not len(values) or incomplete >= BACKFILL_INCOMPLETE_ATTEMPTS:
+                    logger.warning(f"{stream.ticker} {stream.interval} klines before {open_time} are missing "
+                                   f"from the exchange, {len(values)} of {missing} backfilled")
+                    break
+                logger.warning(f"Incomplete backfill of {stream.ticker} {stream.interval}, retrying in {delay:.0f}s")
+            except Exception as e:
+                logger.error(f"Error backfilling {stream.ticker} {stream.interval}, retrying in {delay:.0f}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BACKFILL_MAX_RETRY_DELAY)
+
+        if len(values):
+            await self._apply(stream, values, [True] * len(values))
+        # the klines the exchange does not have are not waited for
+        stream.last_closed = open_time - stream.interval_ms
+        backlog, stream.backlog = stream.backlog, None
+        for event in backlog.values():
+            await self._on_kline(event)
+
+
+def _frame_values(df: pd.DataFrame) -> np.ndarray:
+    """Rows of a provider frame with datetime timestamps, as a (n, len(KLINE_DTYPES)) array."""
+    if df is None or df.empty:
+        return np.empty((0, len(KLINE_FIELDS)), dtype=np.float64)
+    values = np.empty((len(df), len(KLINE_FIELDS)), dtype=np.float64)
+    for i, col in enumerate(KLINE_FIELDS):
+        column = df[col]
+        if pd.api.types.is_datetime64_any_dtype(column):
+            column = column.to_numpy(dtype='datetime64[ms]').view('int64')
+        values[:, i] = column
+    return values
+
+
+def _to_frame(values: np.ndarray) -> pd.DataFrame:
+    """DataFrame with datetime timestamps of (n, len(KLINE_DTYPES)) rows."""
+    columns = {col: values[:, i].astype(dtype) for i, (col, dtype) in enumerate(KLINE_DTYPES.items())}
+    columns['open_time'] = pd.to_datetime(columns['open_time'], unit='ms')
+    columns['close_time'] = pd.to_datetime(columns['close_time'], unit='ms')
+    return pd.DataFrame(columns)
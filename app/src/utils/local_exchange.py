@@ -0,0 +1,568 @@
+"""
+Local Exchange Module
+
+This module serves the subset of the Binance REST API the project calls (spot and futures klines,
+ticker prices, exchange info and the cross margin account, trades and orders) from a KlineStore
+and a simulated margin account, so the agent, the portfolio builder and the backtester can be
+run and benchmarked end to end without exchange access, with injected network latency.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from decimal import Decimal
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from aiohttp import web
+
+from src.utils.binance_clients import route_client
+from src.utils.constants import BINANCE_INTERVALS, KLINE_DTYPES
+from src.utils.kline_resampler import resample_klines
+from src.utils.kline_store import KlineStore, MARKET_FUTURES, MARKET_SPOT
+from src.utils.logger import setup_logger
+
+logger = setup_logger()
+
+# Quote assets symbols are split on, longest first
+QUOTE_ASSETS = ('FDUSD', 'USDC', 'USDT', 'BTC', 'ETH', 'BNB')
+STABLE_ASSETS = {'FDUSD', 'USDC', 'USDT'}
+# Default and maximum number of klines of a klines request, as on Binance
+DEFAULT_KLINES_LIMIT = 500
+MAX_KLINES_LIMIT = 1000
+# Lowest margin level (total assets / total liabilities) an order may leave the account at
+MIN_MARGIN_LEVEL = Decimal('1.1')
+# Interval the missing intervals are resampled from, and the ticker prices are read from
+SOURCE_INTERVAL = '1m'
+
+# Binance error codes
+INVALID_INTERVAL = -1120
+INVALID_SYMBOL = -1121
+INVALID_PARAMETER = -1102
+INSUFFICIENT_BALANCE = -2010
+NO_SUCH_ORDER = -2013
+
+
+class ExchangeError(Exception):
+    """
+    Error returned to the client as a Binance error payload.
+    """
+
+    def __init__(self, code: int, msg: str, status: int = 400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+def split_symbol(symbol: str) -> Tuple[str, str]:
+    """
+    Split a symbol into its base and quote assets.
+
+    Args:
+        symbol: Trading symbol (e.g., 'ETHUSDC')
+
+    Returns:
+        (base, quote) assets, e.g. ('ETH', 'USDC')
+    """
+    for quote in QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)], quote
+    raise ExchangeError(INVALID_SYMBOL, 'Invalid symbol.')
+
+
+def _fmt(value) -> str:
+    return f"{value:.8f}"
+
+
+def _empty_balance() -> Dict[str, Decimal]:
+    return {'free': Decimal(0), 'locked': Decimal(0), 'borrowed': Decimal(0), 'interest': Decimal(0)}
+
+
+class SimulatedMarginAccount:
+    """
+    Cross margin account filling market orders at the prices of the local exchange.
+
+    Orders borrow the missing asset with the MARGIN_BUY side effect and repay the borrowed asset
+    with the AUTO_REPAY one, and are rejected when they would leave the margin level below
+    MIN_MARGIN_LEVEL.
+    """
+
+    def __init__(self, balances: Optional[Dict[str, float]] = None, commission: float = 0.0):
+        """
+        Initialize the account.
+
+        Args:
+            balances: Free amount of each asset (e.g., {'USDC': 1000})
+            commission: Commission rate of the orders, charged in the received asset
+        """
+        self.balances: Dict[str, Dict[str, Decimal]] = {}
+        for asset, amount in (balances or {}).items():
+            self.balances[asset] = {**_empty_balance(), 'free': Decimal(str(amount))}
+        self.commission = Decimal(str(commission))
+        self.orders: Dict[int, dict] = {}
+        self.trades: List[dict] = []
+        self._ids = count(1)
+        self._lock = threading.Lock()
+
+    def account(self, price_of) -> dict:
+        """
+        Get the margin account payload of /sapi/v1/margin/account.
+
+        Args:
+            price_of: Function returning the USD price of an asset
+
+        Returns:
+            Account with the BTC valuations and the assets
+        """
+        with self._lock:
+            assets, liabilities = self._valuation(self.balances, price_of)
+            btc_price = price_of('BTC')
+            user_assets = [{
+                'asset': asset,
+                'free': _fmt(b['free']),
+                'locked': _fmt(b['locked']),
+                'borrowed': _fmt(b['borrowed']),
+                'interest': _fmt(b['interest']),
+                'netAsset': _fmt(b['free'] + b['locked'] - b['borrowed'] - b['interest']),
+            } for asset, b in sorted(self.balances.items())]
+        return {
+            'borrowEnabled': True,
+            'marginLevel': _fmt(assets / liabilities) if liabilities else '999.00000000',
+            'totalAssetOfBtc': _fmt(assets / btc_price),
+            'totalLiabilityOfBtc': _fmt(liabilities / btc_price),
+            'totalNetAssetOfBtc': _fmt((assets - liabilities) / btc_price),
+            'tradeEnabled': True,
+            'transferEnabled': True,
+            'userAssets': user_assets,
+        }
+
+    @staticmethod
+    def _valuation(balances: Dict[str, Dict[str, Decimal]], price_of) -> Tuple[Decimal, Decimal]:
+        assets = liabilities = Decimal(0)
+        for asset, b in balances.items():
+            if not any(b.values()):
+                continue
+            price = price_of(asset)
+            assets += (b['free'] + b['locked']) * price
+            liabilities += (b['borrowed'] + b['interest']) * price
+        return assets, liabilities
+
+    def order(self, symbol: str, side: str, quantity: Decimal, price: Decimal, side_effect: str,
+              time_ms: int, price_of) -> dict:
+        """
+        Fill a market order.
+
+        Args:
+            symbol: Trading symbol (e.g., 'ETHUSDC')
+            side: BUY or SELL
+            quantity: Base asset quantity
+            price: Fill price
+            side_effect: NO_SIDE_EFFECT, MARGIN_BUY or AUTO_REPAY
+            time_ms: Transaction time
+            price_of: Function returning the USD price of an asset
+
+        Returns:
+            Order payload of /sapi/v1/margin/order
+        """
+        base, quote = split_symbol(symbol)
+        is_buy = side == 'BUY'
+        paid, received = (quote, base) if is_buy else (base, quote)
+        paid_amount = quantity * price if is_buy else quantity
+        received_amount = quantity if is_buy else quantity * price
+        commission = received_amount * self.commission
+
+        with self._lock:
+            balances = {asset: dict(b) for asset, b in self.balances.items()}
+            for asset in (base, quote):
+                balances.setdefault(asset, _empty_balance())
+            missing = paid_amount - balances[paid]['free']
+            if missing > 0:
+                if side_effect != 'MARGIN_BUY':
+                    raise ExchangeError(INSUFFICIENT_BALANCE, 'Account has insufficient balance for requested action.')
+                balances[paid]['borrowed'] += missing
+                balances[paid]['free'] += missing
+            balances[paid]['free'] -= paid_amount
+            balances[received]['free'] += received_amount - commission
+            if side_effect == 'AUTO_REPAY':
+                repaid = min(balances[received]['borrowed'], balances[received]['free'])
+                balances[received]['borrowed'] -= repaid
+                balances[received]['free'] -= repaid
+
+            assets, liabilities = self._valuation(balances, price_of)
+            if liabilities and assets / liabilities < MIN_MARGIN_LEVEL:
+                raise ExchangeError(INSUFFICIENT_BALANCE, 'Account has insufficient balance for requested action.')
+            self.balances = balances
+
+            order_id = next(self._ids)
+            quote_qty = quantity * price
+            order = {
+                'symbol': symbol,
+                'orderId': order_id,
+                'clientOrderId': f"local{order_id}",
+                'transactTime': time_ms,
+                'price': '0',
+                'origQty': _fmt(quantity),
+                'executedQty': _fmt(quantity),
+                'cummulativeQuoteQty': _fmt(quote_qty),
+                'status': 'FILLED',
+                'timeInForce': 'GTC',
+                'type': 'MARKET',
+                'side': side,
+                'isIsolated': False,
+                'fills': [{
+                    'price': _fmt(price),
+                    'qty': _fmt(quantity),
+                    'commission': _fmt(commission),
+                    'commissionAsset': received,
+                }],
+            }
+            self.orders[order_id] = order
+            self.trades.append({
+                'symbol': symbol,
+                'id': len(self.trades) + 1,
+                'orderId': order_id,
+                'price': _fmt(price),
+                'qty': _fmt(quantity),
+                'quoteQty': _fmt(quote_qty),
+                'commission': _fmt(commission),
+                'commissionAsset': received,
+                'time': time_ms,
+                'isBuyer': is_buy,
+                'isMaker': False,
+                'isBestMatch': True,
+                'isIsolated': False,
+            })
+        return order
+
+
+class LocalExchangeServer:
+    """
+    Local HTTP stand-in of the Binance REST API.
+
+    Klines are served from the spot and futures datasets of a KlineStore, intervals that are not
+    stored are resampled from the stored 1m candles, and a market without the dataset falls back
+    to the dataset of the other market. Ticker prices are the closes of the 1m candles at now_ms, the end of the stored data
+    by default, or the fixed prices given. Signatures are not checked, any API key and secret do.
+
+    Usage:
+        server = LocalExchangeServer(KlineStore(path), SimulatedMarginAccount({'USDC': 1000}), latency=0.05)
+        server.start_in_thread()
+        os.environ['BINANCE_BASE_URL'] = server.url  # before the first client is created
+        ...
+        server.stop()
+    """
+
+    def __init__(
+            self,
+            store: KlineStore,
+            account: Optional[SimulatedMarginAccount] = None,
+            host: str = '127.0.0.1',
+            port: int = 0,
+            latency: float = 0.0,
+            jitter: float = 0.0,
+            prices: Optional[Dict[str, float]] = None,
+            exchange_info: Optional[dict] = None,
+            now_ms: Optional[int] = None,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            store: Kline store the klines and prices are read from
+            account: Margin account of the signed endpoints, an empty one if None
+            host: Host to listen on
+            port: Port to listen on, a free one if 0
+            latency: Seconds every response is delayed by
+            jitter: Maximum seconds randomly added to the latency
+            prices: Fixed prices of symbols without stored klines (e.g., {'BTCUSDC': 65000})
+            exchange_info: Payload of /api/v3/exchangeInfo, generated from the stored symbols if None
+            now_ms: Time of the ticker prices and order fills, the end of the stored data if None
+        """
+        self.store = store
+        self.account = account or SimulatedMarginAccount()
+        self.latency = latency
+        self.jitter = jitter
+        self.prices = {symbol: Decimal(str(price)) for symbol, price in (prices or {}).items()}
+        self.now_ms = now_ms
+        self.requests = 0
+        self._host = host
+        self._port = port
+        self._exchange_info = exchange_info
+        self._klines: Dict[Tuple[str, str, str], Dict[str, np.ndarray]] = {}
+        self._klines_lock = threading.Lock()
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.app = web.Application(middlewares=[self._middleware])
+        self.app.router.add_get('/api/v3/ping', self._ping)
+        self.app.router.add_get('/api/v3/time', self._time)
+        self.app.router.add_get('/api/v3/klines', self._spot_klines)
+        self.app.router.add_get('/fapi/v1/klines', self._futures_klines)
+        self.app.router.add_get('/api/v3/ticker/price', self._ticker_price)
+        self.app.router.add_get('/api/v3/exchangeInfo', self._exchange_info_handler)
+        self.app.router.add_get('/sapi/v1/margin/account', self._margin_account)
+        self.app.router.add_get('/sapi/v1/margin/myTrades', self._margin_trades)
+        self.app.router.add_post('/sapi/v1/margin/order', self._create_margin_order)
+        self.app.router.add_get('/sapi/v1/margin/order', self._get_margin_order)
+
+    @property
+    def url(self) -> str:
+        """
+        Base url of the server, the value of BINANCE_BASE_URL.
+        """
+        return f"http://{self._host}:{self._port}"
+
+    def route(self, client) -> None:
+        """
+        Point the spot, margin and futures endpoints of a Client or AsyncClient at the server.
+        """
+        route_client(client, self.url)
+
+    async def start(self) -> None:
+        """
+        Start serving in the running event loop, for AsyncClient callers.
+        """
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self._host, self._port)
+        await site.start()
+        self._port = self._runner.addresses[0][1]
+        logger.debug(f"Local exchange listening on {self.url}")
+
+    async def close(self) -> None:
+        """
+        Stop serving.
+        """
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def start_in_thread(self) -> None:
+        """
+        Start serving in an event loop of a background thread, for sync Client callers.
+        """
+        started = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name='local-exchange', daemon=True)
+        self._thread.start()
+        started.wait()
+
+    def stop(self) -> None:
+        """
+        Stop the server started by start_in_thread.
+        """
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.requests += 1
+        delay = self.latency + random.random() * self.jitter
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            return await handler(request)
+        except ExchangeError as e:
+            return web.json_response({'code': e.code, 'msg': e.msg}, status=e.status)
+        except (KeyError, ValueError) as e:
+            return web.json_response({'code': INVALID_PARAMETER, 'msg': f"Invalid parameter: {e}"}, status=400)
+
+    # --- Market data ------------------------------------------------------
+
+    async def _ping(self, request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def _time(self, request: web.Request) -> web.Response:
+        return web.json_response({'serverTime': int(time.time() * 1000)})
+
+    async def _spot_klines(self, request: web.Request) -> web.Response:
+        return web.json_response(self.klines(MARKET_SPOT, request.query))
+
+    async def _futures_klines(self, request: web.Request) -> web.Response:
+        return web.json_response(self.klines(MARKET_FUTURES, request.query))
+
+    def klines(self, market_type: str, params) -> List[list]:
+        """
+        Get the klines of a klines request, as Binance selects them.
+
+        Args:
+            market_type: Market type (MARKET_SPOT or MARKET_FUTURES)
+            params: symbol, interval and the optional startTime, endTime and limit
+
+        Returns:
+            Raw klines, at most limit of them, from startTime on if set, else up to endTime
+        """
+        columns = self._dataset(market_type, params['symbol'], params['interval'])
+        limit = min(int(params.get('limit', DEFAULT_KLINES_LIMIT)), MAX_KLINES_LIMIT)
+        open_time = columns['open_time']
+        lo = np.searchsorted(open_time, int(params['startTime'])) if 'startTime' in params else 0
+        hi = np.searchsorted(open_time, int(params['endTime']), side='right') if 'endTime' in params \
+            else len(open_time)
+        if 'startTime' in params:
+            hi = min(hi, lo + limit)
+        else:
+            lo = max(lo, hi - limit)
+        return [[int(columns['open_time'][i]), _fmt(columns['open'][i]), _fmt(columns['high'][i]),
+                 _fmt(columns['low'][i]), _fmt(columns['close'][i]), _fmt(columns['volume'][i]),
+                 int(columns['close_time'][i]), _fmt(columns['quote_volume'][i]), int(columns['count'][i]),
+                 _fmt(columns['taker_buy_volume'][i]), _fmt(columns['taker_buy_quote_volume'][i]), '0']
+                for i in range(lo, hi)]
+
+    def _dataset(self, market_type: str, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+        """
+        Get the stored klines of a dataset as columns, loaded on first use.
+        """
+        key = (market_type, symbol, interval)
+        with self._klines_lock:
+            columns = self._klines.get(key)
+            if columns is None:
+                columns = self._klines[key] = self._load(market_type, symbol, interval)
+        return columns
+
+    def _load(self, market_type: str, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+        if interval not in BINANCE_INTERVALS:
+            raise ExchangeError(INVALID_INTERVAL, 'Invalid interval.')
+        other = MARKET_SPOT if market_type == MARKET_FUTURES else MARKET_FUTURES
+        for market in (market_type, other):
+            if self.store.covered_ranges(market, symbol, interval):
+                df = self.store.read(market, symbol, interval)
+            elif interval != SOURCE_INTERVAL and self.store.covered_ranges(market, symbol, SOURCE_INTERVAL):
+                df = resample_klines(self.store.read(market, symbol, SOURCE_INTERVAL), interval)
+            else:
+                continue
+            return {name: df[name].to_numpy() for name in KLINE_DTYPES}
+        if symbol not in self.prices:
+            raise ExchangeError(INVALID_SYMBOL, 'Invalid symbol.')
+        df = self.store.read(market_type, symbol, interval)
+        return {name: df[name].to_numpy() for name in KLINE_DTYPES}
+
+    def price(self, symbol: str) -> Decimal:
+        """
+        Get the price of a symbol at now_ms.
+
+        Args:
+            symbol: Trading symbol (e.g., 'ETHUSDC')
+
+        Returns:
+            Fixed price of the symbol, else close of the last 1m candle opened at now_ms
+        """
+        if symbol in self.prices:
+            return self.prices[symbol]
+        columns = self._dataset(MARKET_SPOT, symbol, SOURCE_INTERVAL)
+        open_time = columns['open_time']
+        i = len(open_time) if self.now_ms is None else np.searchsorted(open_time, self.now_ms, side='right')
+        if i == 0:
+            raise ExchangeError(INVALID_SYMBOL, 'Invalid symbol.')
+        return Decimal(str(columns['close'][i - 1]))
+
+    def asset_price(self, asset: str) -> Decimal:
+        """
+        Get the USD price of an asset, from its USDC or USDT symbol.
+        """
+        if asset in STABLE_ASSETS:
+            return Decimal(1)
+        for quote in ('USDC', 'USDT'):
+            try:
+                return self.price(f"{asset}{quote}")
+            except ExchangeError:
+                continue
+        raise ExchangeError(INVALID_SYMBOL, f"No price of {asset}.")
+
+    def _symbols(self) -> List[str]:
+        symbols = set(self.prices)
+        for market in (MARKET_SPOT, MARKET_FUTURES):
+            market_dir = self.store.root / market
+            if market_dir.is_dir():
+                symbols.update(path.name for path in market_dir.iterdir() if path.is_dir())
+        return sorted(symbols)
+
+    async def _ticker_price(self, request: web.Request) -> web.Response:
+        if 'symbol' in request.query:
+            symbol = request.query['symbol']
+            return web.json_response({'symbol': symbol, 'price': _fmt(self.price(symbol))})
+        prices = []
+        for symbol in self._symbols():
+            try:
+                prices.append({'symbol': symbol, 'price': _fmt(self.price(symbol))})
+            except ExchangeError:
+                continue
+        return web.json_response(prices)
+
+    async def _exchange_info_handler(self, request: web.Request) -> web.Response:
+        if self._exchange_info is None:
+            symbols = []
+            for symbol in self._symbols():
+                try:
+                    base, quote = split_symbol(symbol)
+                except ExchangeError:
+                    continue
+                symbols.append({
+                    'symbol': symbol,
+                    'status': 'TRADING',
+                    'baseAsset': base,
+                    'quoteAsset': quote,
+                    'isMarginTradingAllowed': True,
+                    'filters': [
+                        {'filterType': 'PRICE_FILTER', 'minPrice': '0.01000000', 'maxPrice': '1000000.00000000',
+                         'tickSize': '0.01000000'},
+                        {'filterType': 'LOT_SIZE', 'minQty': '0.00010000', 'maxQty': '9000.00000000',
+                         'stepSize': '0.00010000'},
+                    ],
+                })
+            self._exchange_info = {'timezone': 'UTC', 'serverTime': int(time.time() * 1000),
+                                   'rateLimits': [], 'symbols': symbols}
+        return web.json_response(self._exchange_info)
+
+    # --- Margin -----------------------------------------------------------
+
+    async def _margin_account(self, request: web.Request) -> web.Response:
+        return web.json_response(self.account.account(self.asset_price))
+
+    async def _margin_trades(self, request: web.Request) -> web.Response:
+        symbol = request.query['symbol']
+        limit = int(request.query.get('limit', DEFAULT_KLINES_LIMIT))
+        trades = [t for t in self.account.trades if t['symbol'] == symbol]
+        return web.json_response(trades[-limit:])
+
+    async def _create_margin_order(self, request: web.Request) -> web.Response:
+        params = {**request.query, **await request.post()}
+        if params.get('type', 'MARKET') != 'MARKET':
+            raise ExchangeError(INVALID_PARAMETER, 'Only MARKET orders are simulated.')
+        symbol = params['symbol']
+        side = params['side']
+        if side not in ('BUY', 'SELL'):
+            raise ExchangeError(INVALID_PARAMETER, f"Invalid side {side}.")
+        quantity = Decimal(params['quantity'])
+        if quantity <= 0:
+            raise ExchangeError(INVALID_PARAMETER, 'Invalid quantity.')
+        now_ms = self.now_ms if self.now_ms is not None else int(time.time() * 1000)
+        order = self.account.order(symbol, side, quantity, self.price(symbol),
+                                   params.get('sideEffectType', 'NO_SIDE_EFFECT'), now_ms, self.asset_price)
+        return web.json_response(order)
+
+    async def _get_margin_order(self, request: web.Request) -> web.Response:
+        order = self.account.orders.get(int(request.query['orderId']))
+        if order is None or order['symbol'] != request.query['symbol']:
+            raise ExchangeError(NO_SUCH_ORDER, 'Order does not exist.')
+        return web.json_response({k: v for k, v in order.items() if k != 'fills'})